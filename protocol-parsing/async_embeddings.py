@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+MIO Protocol Parser - Async Embedding Driver
+Keeps several embedding batches in flight at once, within the account's
+requests-per-minute and tokens-per-minute limits, and hands the results
+back in the order the batches were submitted.
+
+    RateLimiter      one token bucket per limit (RPM and TPM), refilled
+                     continuously; a request takes 1 request token and its
+                     predicted tokens (token_counter.py) before it is sent.
+                     A 429 pauses every request, not just the one that got
+                     it, until its Retry-After has passed.
+    EmbeddingDriver  runs one `create(texts)` coroutine per batch, at most
+                     max_in_flight at a time, retrying RetryableError with
+                     the server's Retry-After when it gives one and full-
+                     jitter exponential backoff when it does not.
+                     ordered() yields results in submission order whatever
+                     order they complete in, so the output file is the same
+                     from run to run.
+
+`create` is any coroutine function (texts) -> (embeddings, total_tokens)
+that raises RetryableError for responses worth retrying; openai_create()
+adapts an openai.AsyncOpenAI client (built with max_retries=0, so retries
+are counted and paced here), made on the first request so a run that
+sends none needs no API key.
+
+Usage:
+    driver = EmbeddingDriver(openai_create(get_client, model, dimensions),
+                             RateLimiter(requests_per_minute=3000, tokens_per_minute=1_000_000))
+    async for item, embeddings, tokens in driver.ordered(batches, texts_of):
+        ...
+"""
+
+import asyncio
+import email.utils
+import random
+import sys
+import time
+from collections import deque
+from pathlib import Path
+from typing import (Any, AsyncIterator, Awaitable, Callable, Deque, Iterable, List, Optional, Sequence, Tuple,
+                    TypeVar)
+
+PARSERS_DIR = Path(__file__).parent / 'parsers'
+if str(PARSERS_DIR) not in sys.path:
+    sys.path.insert(0, str(PARSERS_DIR))
+
+from token_counter import count_tokens  # noqa: E402
+
+try:
+    import openai
+except ImportError:
+    openai = None
+
+# text-embedding-3-small, usage tier 1
+DEFAULT_REQUESTS_PER_MINUTE = 3000
+DEFAULT_TOKENS_PER_MINUTE = 1_000_000
+DEFAULT_MAX_IN_FLIGHT = 4
+
+# Burst a bucket allows, as seconds of its per-minute rate
+BUCKET_BURST_SECONDS = 10
+
+MAX_RETRIES = 6
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 60.0
+# Spread added to a server-given Retry-After, so waiting requests do not return together
+RETRY_AFTER_JITTER_SECONDS = 0.5
+
+Embeddings = List[List[float]]
+Create = Callable[[Sequence[str]], Awaitable[Tuple[Embeddings, int]]]
+T = TypeVar('T')
+
+
+class RetryableError(Exception):
+    """A response worth retrying (429, 5xx, dropped connection); retry_after in seconds if the server gave one"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None, rate_limited: bool = False):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.rate_limited = rate_limited
+
+
+def parse_retry_after(headers: Any) -> Optional[float]:
+    """Seconds to wait from retry-after-ms or Retry-After (seconds or an HTTP date), None if absent"""
+    if headers is None:
+        return None
+    value = headers.get('retry-after-ms')
+    if value is not None:
+        try:
+            return max(0.0, float(value) / 1000)
+        except ValueError:
+            pass
+    value = headers.get('retry-after')
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None, rng: random.Random = random) -> float:
+    """Seconds before retry number attempt (0-based)"""
+    if retry_after is not None:
+        return retry_after + rng.uniform(0, RETRY_AFTER_JITTER_SECONDS)
+    return rng.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+
+class TokenBucket:
+    """capacity tokens, refilled at rate per second; take() may leave it in debt for requests over capacity"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.level = capacity
+        self.updated = time.monotonic()
+
+    def refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until amount (at most capacity) is available"""
+        self.refill()
+        missing = min(amount, self.capacity) - self.level
+        return max(0.0, missing / self.rate)
+
+    def take(self, amount: float) -> None:
+        self.level -= amount
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute buckets, plus a shared pause after 429s"""
+
+    def __init__(self, requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+                 tokens_per_minute: float = DEFAULT_TOKENS_PER_MINUTE):
+        self.requests = TokenBucket(requests_per_minute / 60, requests_per_minute / 60 * BUCKET_BURST_SECONDS)
+        self.tokens = TokenBucket(tokens_per_minute / 60, tokens_per_minute / 60 * BUCKET_BURST_SECONDS)
+        self.resume_at = 0.0
+        self.lock = None
+        self.waited = 0.0
+
+    async def acquire(self, tokens: int) -> None:
+        """Wait until one request of tokens tokens fits both limits, then take it"""
+        if self.lock is None:
+            self.lock = asyncio.Lock()  # Created here, inside the running loop
+        # One waiter at a time, so requests go out in the order they asked
+        async with self.lock:
+            while True:
+                delay = max(self.resume_at - time.monotonic(), self.requests.wait_time(1),
+                            self.tokens.wait_time(tokens))
+                if delay <= 0:
+                    break
+                self.waited += delay
+                await asyncio.sleep(delay)
+            self.requests.take(1)
+            self.tokens.take(tokens)
+
+    def pause(self, seconds: float) -> None:
+        """Hold every request for seconds (a 429 applies to the whole account)"""
+        self.resume_at = max(self.resume_at, time.monotonic() + seconds)
+
+
+class EmbeddingDriver:
+    """Concurrent, rate-limited, retrying calls to create(texts), results in submission order"""
+
+    def __init__(self, create: Create, limiter: Optional[RateLimiter] = None,
+                 max_in_flight: int = DEFAULT_MAX_IN_FLIGHT, max_retries: int = MAX_RETRIES,
+                 count_tokens: Callable[[str], int] = count_tokens, seed: Optional[int] = None):
+        self.create = create
+        self.limiter = limiter or RateLimiter()
+        self.max_in_flight = max_in_flight
+        self.max_retries = max_retries
+        self.count_tokens = count_tokens
+        self.rng = random.Random(seed)
+        self.requests = 0
+        self.retries = 0
+        self.rate_limited = 0
+        # Tokens count_tokens predicted and the API billed, over successful batches
+        self.predicted_tokens = 0
+        self.actual_tokens = 0
+
+    async def embed(self, texts: Sequence[str]) -> Tuple[Embeddings, int]:
+        """(embeddings, total_tokens) for one batch, retried until it succeeds or max_retries is spent"""
+        predicted = sum(self.count_tokens(text) for text in texts)
+        attempt = 0
+        while True:
+            await self.limiter.acquire(predicted)
+            self.requests += 1
+            try:
+                embeddings, tokens = await self.create(texts)
+            except RetryableError as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = backoff_delay(attempt, e.retry_after, self.rng)
+                if e.rate_limited:
+                    self.rate_limited += 1
+                    self.limiter.pause(delay)
+                else:
+                    await asyncio.sleep(delay)
+                attempt += 1
+                self.retries += 1
+                continue
+            self.predicted_tokens += predicted
+            self.actual_tokens += tokens
+            return embeddings, tokens
+
+    async def embed_item(self, item: T, texts: Sequence[str],
+                         on_done: Optional[Callable[[T, Embeddings, int], None]]) -> Tuple[Embeddings, int]:
+        embeddings, tokens = await self.embed(texts)
+        if on_done is not None:
+            on_done(item, embeddings, tokens)
+        return embeddings, tokens
+
+    async def ordered(self, items: Iterable[T], texts_of: Callable[[T], Sequence[str]],
+                      on_done: Optional[Callable[[T, Embeddings, int], None]] = None
+                      ) -> AsyncIterator[Tuple[T, Embeddings, int]]:
+        """
+        Embed texts_of(item) for each item, max_in_flight at a time, reading
+        items only as slots free up: at most max_in_flight items are held,
+        sent or waiting to pass through, so a run of items with no texts
+        (fully cached) does not read the input ahead. Yields (item,
+        embeddings, total_tokens) in item order; items with no texts pass
+        straight through.
+        on_done(item, embeddings, total_tokens) runs as soon as each request
+        returns, in completion order (to save results before earlier items
+        finish).
+        """
+        pending: Deque[Tuple[T, Optional[asyncio.Task]]] = deque()
+        items = iter(items)
+        exhausted = False
+
+        try:
+            while True:
+                # Fill the window
+                while not exhausted and len(pending) < self.max_in_flight:
+                    item = next(items, _END)
+                    if item is _END:
+                        exhausted = True
+                        break
+                    texts = texts_of(item)
+                    task = asyncio.ensure_future(self.embed_item(item, texts, on_done)) if texts else None
+                    pending.append((item, task))
+
+                if not pending:
+                    return
+
+                item, task = pending.popleft()
+                if task is None:
+                    yield item, [], 0
+                    continue
+                embeddings, tokens = await task
+                yield item, embeddings, tokens
+        finally:
+            # Stopped early (error or consumer gone): cancel what is still running
+            tasks = [task for _, task in pending if task is not None]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+_END = object()
+
+
+def openai_create(get_client: Callable[[], Any], model: str, dimensions: int) -> Create:
+    """
+    create() for the openai.AsyncOpenAI client get_client() returns (called
+    once, on the first request): 429, 5xx and connection errors are retryable
+    """
+    clients = []
+
+    async def create(texts: Sequence[str]) -> Tuple[Embeddings, int]:
+        if not clients:
+            clients.append(get_client())
+        try:
+            response = await clients[0].embeddings.create(model=model, input=list(texts), dimensions=dimensions)
+        except openai.RateLimitError as e:
+            raise RetryableError(str(e), parse_retry_after(e.response.headers), rate_limited=True) from e
+        except openai.InternalServerError as e:
+            raise RetryableError(str(e), parse_retry_after(e.response.headers)) from e
+        except openai.APIConnectionError as e:
+            raise RetryableError(str(e)) from e
+        return [item.embedding for item in response.data], response.usage.total_tokens
+
+    return create
+
+
+def run_ordered(driver: EmbeddingDriver, items: Iterable[T], texts_of: Callable[[T], Sequence[str]],
+                on_done: Optional[Callable[[T, Embeddings, int], None]] = None
+                ) -> Iterable[Tuple[T, Embeddings, int]]:
+    """driver.ordered() for synchronous callers: a generator that runs the event loop between results"""
+    loop = asyncio.new_event_loop()
+    results = driver.ordered(items, texts_of, on_done)
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(results.__anext__())
+            except StopAsyncIteration:
+                return
+    finally:
+        loop.run_until_complete(results.aclose())
+        loop.close()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+MIO Protocol Parser - Embedding Batch Planner
+Packs embedding inputs into as few requests as the provider's per-request
+limits allow, by token count instead of a fixed number of protocols.
+
+Batches are runs of consecutive items, filled greedily: an item joins the
+current batch unless that would pass max_inputs items or max_tokens
+tokens, in which case it starts the next one. Among plans that keep input
+order (which streaming output and resuming rely on) greedy filling gives
+the fewest batches. Items that need no request (cache hits, tokens None)
+ride along in the batch they fall in and count only toward max_inputs.
+
+Limits are OpenAI's for /v1/embeddings: 2048 inputs and 300,000 tokens
+summed over the inputs of one request (and 8192 tokens per input, which
+prepare_embedding_text keeps to by falling back to the summary).
+
+Usage:
+    for batch in pack_batches(items, tokens_of):
+        ...
+"""
+
+from typing import Callable, Iterable, Iterator, List, Optional, TypeVar
+
+MAX_INPUTS_PER_REQUEST = 2048
+MAX_TOKENS_PER_REQUEST = 300_000
+
+T = TypeVar('T')
+
+
+def pack_batches(items: Iterable[T], tokens_of: Callable[[T], Optional[int]],
+                 max_inputs: int = MAX_INPUTS_PER_REQUEST,
+                 max_tokens: int = MAX_TOKENS_PER_REQUEST) -> Iterator[List[T]]:
+    """
+    Consecutive runs of items, each at most max_inputs long and at most
+    max_tokens tokens (tokens_of(item), None for items sent nowhere). An
+    item over max_tokens on its own gets a batch to itself.
+    """
+    batch: List[T] = []
+    batch_tokens = 0
+    for item in items:
+        tokens = tokens_of(item) or 0
+        if batch and (len(batch) == max_inputs or batch_tokens + tokens > max_tokens):
+            yield batch
+            batch = []
+            batch_tokens = 0
+        batch.append(item)
+        batch_tokens += tokens
+    if batch:
+        yield batch
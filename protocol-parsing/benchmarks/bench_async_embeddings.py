@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Async Embedding Benchmark - MIO Protocol Parsing System
+Throughput of the concurrent embedding driver (async_embeddings.py)
+against the sequential loop it replaced, both talking HTTP to a local
+stub server (stub_embedding_server.py) that adds latency and answers a
+fraction of requests with 429 + Retry-After
+
+    sequential  one batch at a time, 0.5 s sleep between batches, 429s
+                retried after 2, 4, 8, ... s (the previous
+                generate_embeddings.py loop)
+    async       EmbeddingDriver with --max-in-flight batches in flight,
+                RPM/TPM buckets, Retry-After plus jittered backoff
+
+The texts are the chunk_text of every parsed protocol (staging/, or a
+synthetic corpus with --scale). The async run uses openai.AsyncOpenAI
+pointed at the stub when openai is installed, a urllib client on worker
+threads otherwise. Fails unless both runs return every text's stub
+embedding, in input order.
+
+Usage:
+    python3 benchmarks/bench_async_embeddings.py
+    python3 benchmarks/bench_async_embeddings.py --max-in-flight 8 --rate-limit-fraction 0.2
+    python3 benchmarks/bench_async_embeddings.py --scale 5 --latency-ms 400
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from async_embeddings import (  # noqa: E402
+    EmbeddingDriver,
+    RateLimiter,
+    RetryableError,
+    openai,
+    openai_create,
+    parse_retry_after,
+)
+from parse_targets import PARSE_TARGETS, STAGING_DIR  # noqa: E402
+from stub_embedding_server import StubEmbeddingServer, stub_embedding  # noqa: E402
+from synthetic_corpus import write_corpus  # noqa: E402
+
+MODEL = 'text-embedding-3-small'
+# Small vectors keep the stub's JSON cheap; the request pattern is what is measured
+DIMENSIONS = 64
+
+# The sequential loop's pacing
+SEQUENTIAL_BATCH_DELAY = 0.5
+SEQUENTIAL_BASE_DELAY = 2
+SEQUENTIAL_MAX_RETRIES = 5
+
+
+def chunk_texts(staging_dir: Path) -> list:
+    texts = []
+    for name, target in PARSE_TARGETS.items():
+        texts.extend(protocol['chunk_text'] for protocol in target.parse(staging_dir / name))
+    return texts
+
+
+def post_embeddings(url: str, texts: list) -> tuple:
+    """(embeddings, total_tokens) from the stub; RetryableError on 429"""
+    body = json.dumps({'model': MODEL, 'input': texts, 'dimensions': DIMENSIONS}).encode('utf-8')
+    request = urllib.request.Request(f"{url}/embeddings", body, {'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(request) as response:
+            payload = json.load(response)
+    except urllib.error.HTTPError as e:
+        if e.code == 429:
+            raise RetryableError(str(e), parse_retry_after(e.headers), rate_limited=True) from e
+        raise
+    return [item['embedding'] for item in payload['data']], payload['usage']['total_tokens']
+
+
+def run_sequential(url: str, batches: list) -> tuple:
+    """(embeddings, requests)"""
+    embeddings = []
+    requests = 0
+    for batch_num, texts in enumerate(batches):
+        for attempt in range(SEQUENTIAL_MAX_RETRIES):
+            requests += 1
+            try:
+                batch_embeddings, _ = post_embeddings(url, texts)
+                break
+            except RetryableError:
+                if attempt == SEQUENTIAL_MAX_RETRIES - 1:
+                    raise
+                time.sleep(SEQUENTIAL_BASE_DELAY * 2 ** attempt)
+        embeddings.extend(batch_embeddings)
+        if batch_num < len(batches) - 1:
+            time.sleep(SEQUENTIAL_BATCH_DELAY)
+    return embeddings, requests
+
+
+def thread_create(url: str):
+    """create() that runs post_embeddings on the default executor"""
+    async def create(texts):
+        return await asyncio.get_running_loop().run_in_executor(None, post_embeddings, url, list(texts))
+    return create
+
+
+def run_async(url: str, batches: list, args) -> tuple:
+    """(embeddings, driver)"""
+    if openai is not None:
+        create = openai_create(lambda: openai.AsyncOpenAI(api_key='stub', base_url=url, max_retries=0),
+                               MODEL, DIMENSIONS)
+    else:
+        create = thread_create(url)
+    driver = EmbeddingDriver(create, RateLimiter(args.requests_per_minute, args.tokens_per_minute),
+                             max_in_flight=args.max_in_flight, seed=args.seed)
+
+    async def collect():
+        embeddings = []
+        async for _, batch_embeddings, _ in driver.ordered(batches, lambda texts: texts):
+            embeddings.extend(batch_embeddings)
+        return embeddings
+
+    return asyncio.run(collect()), driver
+
+
+def report(label: str, seconds: float, texts: list, batches: list, requests: int, rate_limited: int) -> None:
+    print(f"{label:<12} {seconds:9.2f} {len(batches) / seconds:10.2f} {len(texts) / seconds:10.1f} "
+          f"{requests:>9} {rate_limited:>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark concurrent embedding requests against a stub server')
+    parser.add_argument('--scale', type=int, help='Embed a synthetic corpus of this scale instead of staging/')
+    parser.add_argument('--batch-size', type=int, default=20, help='Texts per request (default: 20)')
+    parser.add_argument('--max-in-flight', type=int, default=4, help='Concurrent batches (default: 4)')
+    parser.add_argument('--requests-per-minute', type=int, default=3000, help='RPM bucket (default: 3000)')
+    parser.add_argument('--tokens-per-minute', type=int, default=1_000_000, help='TPM bucket (default: 1000000)')
+    parser.add_argument('--latency-ms', type=float, default=200, help='Stub delay per request (default: 200)')
+    parser.add_argument('--rate-limit-fraction', type=float, default=0.1,
+                        help='Fraction of requests the stub answers 429 (default: 0.1)')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='Stub Retry-After seconds (default: 1)')
+    parser.add_argument('--seed', type=int, default=0, help='Stub and jitter seed (default: 0)')
+    args = parser.parse_args()
+
+    if args.scale:
+        with tempfile.TemporaryDirectory(prefix='mio-embed-') as tmp:
+            write_corpus(Path(tmp), args.scale, args.seed)
+            texts = chunk_texts(Path(tmp))
+        corpus = f"synthetic {args.scale}x"
+    else:
+        texts = chunk_texts(STAGING_DIR)
+        corpus = "staging"
+    batches = [texts[i:i + args.batch_size] for i in range(0, len(texts), args.batch_size)]
+    expected = [stub_embedding(text, DIMENSIONS) for text in texts]
+
+    print("=" * 70)
+    print(f"Async Embedding Benchmark - {corpus}: {len(texts):,} texts in {len(batches)} batches")
+    print(f"Stub: {args.latency_ms:g} ms latency, {args.rate_limit_fraction:.0%} answered 429 "
+          f"(Retry-After {args.retry_after:g}s); client: {'openai' if openai else 'urllib threads'}")
+    print("=" * 70)
+    print(f"{'Driver':<12} {'Seconds':>9} {'Batches/s':>10} {'Texts/s':>10} {'Requests':>9} {'429s':>6}")
+
+    results = {}
+    for label in ('sequential', 'async'):
+        server = StubEmbeddingServer(('127.0.0.1', 0), args.latency_ms / 1000, args.latency_ms / 4000,
+                                     args.rate_limit_fraction, args.retry_after, args.seed)
+        server.start()
+        start = time.perf_counter()
+        if label == 'sequential':
+            embeddings, requests = run_sequential(server.url, batches)
+        else:
+            embeddings, driver = run_async(server.url, batches, args)
+            requests = driver.requests
+        seconds = time.perf_counter() - start
+        server.shutdown()
+        server.server_close()
+
+        report(label, seconds, texts, batches, requests, server.rate_limited)
+        results[label] = (seconds, embeddings == expected)
+
+    speedup = results['sequential'][0] / results['async'][0]
+    print()
+    print(f"Throughput gain: {speedup:.1f}x ({args.max_in_flight} batches in flight)")
+    if not all(in_order for _, in_order in results.values()):
+        print("✗ Embeddings missing or out of order")
+        sys.exit(1)
+    print("✓ Both runs returned every embedding in input order")
+
+
+if __name__ == '__main__':
+    main()
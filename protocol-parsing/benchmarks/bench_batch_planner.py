@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Batch Planner Benchmark - MIO Protocol Parsing System
+Requests needed to embed the corpus with fixed 100-protocol batches (the
+previous BATCH_SIZE) against token-packed batches (batch_planner.py)
+
+For the chunk_text of every parsed protocol (staging/, or a synthetic
+corpus with --scale) it reports, per plan: requests, the largest request
+in tokens and inputs, the mean fill of the 300,000-token request limit,
+and requests over the provider's limits. Fails if a packed request is
+over a limit.
+
+Usage:
+    python3 benchmarks/bench_batch_planner.py
+    python3 benchmarks/bench_batch_planner.py --scale 100
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from batch_planner import MAX_INPUTS_PER_REQUEST, MAX_TOKENS_PER_REQUEST, pack_batches  # noqa: E402
+from parse_targets import PARSE_TARGETS, STAGING_DIR  # noqa: E402
+from synthetic_corpus import write_corpus  # noqa: E402
+from token_counter import count_tokens  # noqa: E402
+
+FIXED_BATCH_SIZE = 100
+
+
+def chunk_texts(staging_dir: Path) -> list:
+    texts = []
+    for name, target in PARSE_TARGETS.items():
+        texts.extend(protocol['chunk_text'] for protocol in target.parse(staging_dir / name))
+    return texts
+
+
+def over_limit(batch: list, tokens: list) -> bool:
+    return len(batch) > MAX_INPUTS_PER_REQUEST or sum(tokens[i] for i in batch) > MAX_TOKENS_PER_REQUEST
+
+
+def report(label: str, batches: list, tokens: list, seconds: float) -> int:
+    sizes = [sum(tokens[i] for i in batch) for batch in batches]
+    over = sum(over_limit(batch, tokens) for batch in batches)
+    print(f"{label:<10} {len(batches):>9,} {max(sizes):>11,} {max(map(len, batches)):>11,} "
+          f"{sum(sizes) / len(sizes) / MAX_TOKENS_PER_REQUEST:>10.1%} {over:>6} {seconds * 1000:>10.1f}")
+    return over
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare fixed-size and token-packed embedding batches')
+    parser.add_argument('--scale', type=int, help='Plan a synthetic corpus of this scale instead of staging/')
+    args = parser.parse_args()
+
+    if args.scale:
+        with tempfile.TemporaryDirectory(prefix='mio-batches-') as tmp:
+            write_corpus(Path(tmp), args.scale)
+            texts = chunk_texts(Path(tmp))
+        corpus = f"synthetic {args.scale}x"
+    else:
+        texts = chunk_texts(STAGING_DIR)
+        corpus = "staging"
+    tokens = [count_tokens(text) for text in texts]
+    indexes = list(range(len(texts)))
+
+    print("=" * 70)
+    print(f"Batch Planner Benchmark - {corpus}: {len(texts):,} texts, {sum(tokens):,} tokens")
+    print(f"Limits per request: {MAX_INPUTS_PER_REQUEST:,} inputs, {MAX_TOKENS_PER_REQUEST:,} tokens")
+    print("=" * 70)
+    print(f"{'Plan':<10} {'Requests':>9} {'Max tokens':>11} {'Max inputs':>11} {'Mean fill':>10} "
+          f"{'Over':>6} {'Plan ms':>10}")
+
+    start = time.perf_counter()
+    fixed = [indexes[i:i + FIXED_BATCH_SIZE] for i in range(0, len(indexes), FIXED_BATCH_SIZE)]
+    report(f"fixed {FIXED_BATCH_SIZE}", fixed, tokens, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    packed = list(pack_batches(indexes, tokens.__getitem__))
+    packed_over = report('packed', packed, tokens, time.perf_counter() - start)
+
+    print()
+    print(f"Requests: {len(fixed):,} -> {len(packed):,} ({len(fixed) / len(packed):.1f}x fewer)")
+    if packed_over or [i for batch in packed for i in batch] != indexes:
+        print("✗ Packed batches break a limit or the input order")
+        sys.exit(1)
+    print("✓ Packed batches keep input order and every limit")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Daily Deductible Parser Benchmark - MIO Protocol Parsing System
+Checks that DailyDeductibleParser scales linearly with library size
+
+Builds synthetic libraries of thousands of practices from the real staging
+file (one category section per few practices, so the section count grows
+with the library) and times the event-walk parser, which picks up each
+category as it passes the section heading, against the original reversed
+scan over every section.
+
+Usage:
+    python3 benchmarks/bench_daily_deductible.py
+    python3 benchmarks/bench_daily_deductible.py --sizes 1000 4000 16000
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR / 'parsers'))
+
+from parse_daily_deductible import DailyDeductibleParser  # noqa: E402
+
+STAGING_FILE = BASE_DIR / 'staging' / 'daily-deductible-normalized.md'
+
+PRACTICE_HEADER = re.compile(r'#### \*\*(\d+)\\\.\s+')
+
+
+class LegacyDailyDeductibleParser(DailyDeductibleParser):
+    """_parse_direct as it was: reversed scan + re.sub per practice"""
+
+    def _parse_direct(self, content):
+        practices = []
+        practice_matches = list(re.finditer(r'#### \*\*(\d+)\\\.\s+(.+?)\*\*', content))
+        section_matches = list(re.finditer(r'### \*\*(?!\d)(.+?)\*\*', content))
+        chunk_number = 1
+
+        for i, match in enumerate(practice_matches):
+            start = match.start()
+            current_category = "traditional-foundation"
+            for section_match in reversed(section_matches):
+                if section_match.start() < start:
+                    category_name = section_match.group(1).strip()
+                    category_name = re.sub(r'\s*\(.+?\)\s*$', '', category_name)
+                    category_name = category_name.replace('\\', '')
+                    current_category = self.CATEGORY_MAP.get(category_name, "traditional-foundation")
+                    break
+            self.current_category = current_category
+
+            if i + 1 < len(practice_matches):
+                end = practice_matches[i + 1].start()
+            else:
+                next_section = content.find('\n---\n', start)
+                end = next_section if next_section != -1 else len(content)
+
+            parsed = self.parse_practice(content[start:end].strip(), chunk_number)
+            if parsed:
+                practices.append(parsed)
+                chunk_number += 1
+
+        return practices
+
+
+def practice_templates(content: str) -> list:
+    """Every practice block in the real library, header included"""
+    starts = [m.start() for m in PRACTICE_HEADER.finditer(content)]
+    blocks = []
+    for i, start in enumerate(starts):
+        end = starts[i + 1] if i + 1 < len(starts) else len(content)
+        block = content[start:end].split('\n---\n')[0].split('\n### ')[0]
+        blocks.append(block.strip())
+    return blocks
+
+
+def build_library(templates: list, practice_count: int, per_section: int = 5) -> str:
+    """Synthetic library: a category section every per_section practices"""
+    categories = list(DailyDeductibleParser.CATEGORY_MAP)
+    parts = ["## **📚 Daily Deductible Library: Synthetic Benchmark**\n"]
+
+    for n in range(practice_count):
+        if n % per_section == 0:
+            category = categories[(n // per_section) % len(categories)]
+            parts.append(f"---\n\n### **{category} (Synthetic {n // per_section})**\n")
+        block = PRACTICE_HEADER.sub(f'#### **{n + 1}\\\\. ', templates[n % len(templates)], count=1)
+        parts.append(block + "\n")
+
+    return '\n'.join(parts)
+
+
+def time_parse(parser_class, content: str, repeat: int) -> tuple:
+    """Best-of-N seconds and practice count"""
+    best = float('inf')
+    count = 0
+    for _ in range(repeat):
+        parser = parser_class()
+        start = time.perf_counter()
+        count = len(parser._parse_direct(content))
+        best = min(best, time.perf_counter() - start)
+    return best, count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark DailyDeductibleParser scaling')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[500, 1000, 2000, 4000, 8000],
+                        help='Practice counts to benchmark (default: 500 1000 2000 4000 8000)')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing repetitions (default: 3)')
+    parser.add_argument('--skip-legacy-above', type=int, default=8000,
+                        help='Skip the quadratic legacy parser above this size (default: 8000)')
+    args = parser.parse_args()
+
+    templates = practice_templates(STAGING_FILE.read_text(encoding='utf-8'))
+
+    print("=" * 72)
+    print("DailyDeductibleParser Scaling Benchmark")
+    print("=" * 72)
+    print(f"Templates: {len(templates)} practices from {STAGING_FILE.name}")
+    print()
+    print(f"{'Practices':>10} {'Current ms':>12} {'µs/practice':>12} {'Legacy ms':>12} {'µs/practice':>12}")
+
+    for size in args.sizes:
+        content = build_library(templates, size)
+
+        current_time, count = time_parse(DailyDeductibleParser, content, args.repeat)
+        if count != size:
+            print(f"✗ Parsed {count} practices, expected {size}")
+            sys.exit(1)
+
+        if size <= args.skip_legacy_above:
+            legacy_time, _ = time_parse(LegacyDailyDeductibleParser, content, 1)
+            if DailyDeductibleParser()._parse_direct(content) != LegacyDailyDeductibleParser()._parse_direct(content):
+                print(f"✗ Output differs from legacy parser at {size} practices")
+                sys.exit(1)
+            legacy = f"{legacy_time * 1000:12.1f} {legacy_time / size * 1e6:12.1f}"
+        else:
+            legacy = f"{'-':>12} {'-':>12}"
+
+        print(f"{size:>10,} {current_time * 1000:12.1f} {current_time / size * 1e6:12.1f} {legacy}")
+
+    print()
+    print("Linear scaling shows as a flat µs/practice column.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Embedding Diagnostics Benchmark - MIO Protocol Parsing System
+Time to validate embeddings with the per-element Python check (the
+previous generate_embeddings.py validate_embeddings) against the NumPy
+diagnostics (embedding_diagnostics.py), which also compute norms and find
+near-duplicates
+
+Each run holds N protocols with random unit-length 1536-dimension float32
+embeddings (array('f'), as the pipeline holds them) and plants problems:
+--duplicates pairs at cosine ~0.9995, a degenerate cluster of --cluster
+identical rows (a bad batch that returned one vector over and over), one
+zero vector and one NaN. Fails unless the diagnostics report exactly the
+planted problems: each pair as a group of two, the cluster as one group.
+
+Usage:
+    python3 benchmarks/bench_embedding_diagnostics.py
+    python3 benchmarks/bench_embedding_diagnostics.py --vectors 205 10000 --duplicates 50 --cluster 5000
+"""
+
+import argparse
+import sys
+import time
+from array import array
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from embedding_diagnostics import EXACT_PAIRS_LIMIT, diagnose_embeddings, np  # noqa: E402
+
+EMBEDDING_DIMENSIONS = 1536
+# Rows generated at a time, so the NumPy source never holds the whole corpus
+GENERATE_BLOCK = 10_000
+# Noise norm added to a copy: cosine 1/sqrt(1 + 0.03^2) ~ 0.99955
+DUPLICATE_NOISE = 0.03
+
+
+def python_issues(protocols: list) -> list:
+    """The per-element check generate_embeddings.py ran before"""
+    issues = []
+    for i, protocol in enumerate(protocols):
+        embedding = protocol.get('embedding')
+        if not isinstance(embedding, (list, array)):
+            issues.append(f"Protocol {i}: Embedding is not a list")
+        elif len(embedding) != EMBEDDING_DIMENSIONS:
+            issues.append(f"Protocol {i}: Wrong dimension")
+        elif any(x is None or (isinstance(x, float) and x != x) for x in embedding):
+            issues.append(f"Protocol {i}: Contains null/NaN values")
+        elif not all(isinstance(x, (int, float)) for x in embedding):
+            issues.append(f"Protocol {i}: Contains non-numeric values")
+    return issues
+
+
+def unit_rows(rng, count: int):
+    rows = rng.standard_normal((count, EMBEDDING_DIMENSIONS), dtype=np.float32)
+    return rows / np.linalg.norm(rows, axis=1, keepdims=True)
+
+
+def make_protocols(count: int, duplicates: int, cluster: int, seed: int) -> tuple:
+    """(protocols, planted groups {representative: members}, zero index, NaN index)"""
+    rng = np.random.default_rng(seed)
+    protocols = []
+    for start in range(0, count, GENERATE_BLOCK):
+        for row in unit_rows(rng, min(GENERATE_BLOCK, count - start)):
+            protocols.append({'chunk_id': f"chunk-{len(protocols)}", 'embedding': array('f', row.tobytes())})
+
+    positions = rng.choice(count, 2 * duplicates + cluster + 2, replace=False).tolist()
+    groups = {}
+    for original, copy in zip(positions[0:2 * duplicates:2], positions[1:2 * duplicates:2]):
+        noise = rng.standard_normal(EMBEDDING_DIMENSIONS).astype(np.float32)
+        vector = np.frombuffer(protocols[original]['embedding'], dtype=np.float32)
+        vector = vector + noise * (DUPLICATE_NOISE / np.linalg.norm(noise))
+        protocols[copy]['embedding'] = array('f', (vector / np.linalg.norm(vector)).tobytes())
+        groups[min(original, copy)] = {max(original, copy)}
+
+    if cluster > 1:
+        rows = sorted(positions[2 * duplicates:2 * duplicates + cluster])
+        for row in rows[1:]:
+            protocols[row]['embedding'] = array('f', protocols[rows[0]]['embedding'])
+        groups[rows[0]] = set(rows[1:])
+
+    zero, nan = positions[-2:]
+    protocols[zero]['embedding'] = array('f', bytes(4 * EMBEDDING_DIMENSIONS))
+    protocols[nan]['embedding'][0] = float('nan')
+    return protocols, groups, zero, nan
+
+
+def run(count: int, duplicates: int, cluster: int, seed: int) -> bool:
+    protocols, groups, zero, nan = make_protocols(count, duplicates, cluster, seed)
+
+    start = time.perf_counter()
+    issues = python_issues(protocols)
+    python_seconds = time.perf_counter() - start
+
+    # The first call pays NumPy's one-time setup: time the second
+    diagnose_embeddings(protocols, EMBEDDING_DIMENSIONS, seed=seed)
+    diagnostics = diagnose_embeddings(protocols, EMBEDDING_DIMENSIONS, seed=seed)
+    found = {representative: {i for i, _ in members} for representative, members in diagnostics.duplicate_groups}
+    flagged = {i for i, _ in diagnostics.errors}
+    correct = found == groups and flagged == {zero, nan} and not diagnostics.off_unit
+
+    method = 'all pairs' if count <= EXACT_PAIRS_LIMIT else 'LSH'
+    print(f"{count:>9,} {python_seconds * 1000:12.1f} {diagnostics.seconds * 1000:11.1f} "
+          f"{python_seconds / diagnostics.seconds:8.1f}x {len(found):>5}/{len(groups):<5} {cluster:>7,} "
+          f"{method:<9} {'✓' if correct else '✗'} ({len(issues)} Python issues)")
+    return correct
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare Python and NumPy embedding validation')
+    parser.add_argument('--vectors', type=int, nargs='+', default=[205, 100_000],
+                        help='Protocols per run (default: 205 100000)')
+    parser.add_argument('--duplicates', type=int, default=20, help='Near-duplicate pairs planted (default: 20)')
+    parser.add_argument('--cluster', type=int, default=2000,
+                        help='Identical rows planted as one group, at most a third of a run (default: 2000)')
+    parser.add_argument('--seed', type=int, default=0, help='Vector seed (default: 0)')
+    args = parser.parse_args()
+
+    if np is None:
+        print("❌ Error: numpy not installed")
+        print("   Install with: pip install numpy")
+        sys.exit(1)
+
+    print("=" * 70)
+    print("Embedding Diagnostics Benchmark")
+    print("=" * 70)
+    print(f"{'Vectors':>9} {'Python ms':>12} {'NumPy ms':>11} {'Speedup':>9} {'Groups':>11} {'Cluster':>7} "
+          f"{'Method':<9} Result")
+
+    results = []
+    for count in args.vectors:
+        cluster = min(args.cluster, count // 3)
+        duplicates = min(args.duplicates, (count - cluster - 2) // 2)
+        results.append(run(count, duplicates, cluster, args.seed))
+
+    print()
+    if not all(results):
+        print("✗ Diagnostics missed or invented planted problems")
+        sys.exit(1)
+    print("✓ Every planted near-duplicate group, zero and NaN vector found, nothing else flagged")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Embedding Store Benchmark - MIO Protocol Parsing System
+Size and load time of embedded protocols saved as JSON (float lists,
+indent=2: the previous generate_embeddings.py output) against the
+embedding store (embedding_store.py: float32 .npy matrix + .meta.jsonl)
+
+For the real corpus (staging/, 231 protocols) and synthetic corpora
+(synthetic_corpus.py) it embeds the parsed protocols with 1536-dimension
+float32 vectors, saves them both ways and reports the bytes on disk, the
+time to write them and the time to load every protocol back with its
+embedding (json.load of the array file; iter_store over the mapped
+matrix). Fails unless both load the same protocols and float32 values.
+
+Usage:
+    python3 benchmarks/bench_embedding_store.py
+    python3 benchmarks/bench_embedding_store.py --scales 10 100 --no-corpus
+"""
+
+import argparse
+import gc
+import json
+import random
+import sys
+import tempfile
+import time
+from array import array
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from embedding_store import iter_store, store_size, write_store  # noqa: E402
+from parse_targets import PARSE_TARGETS, STAGING_DIR  # noqa: E402
+from protocol_record import Protocol, to_dicts  # noqa: E402
+from synthetic_corpus import write_corpus  # noqa: E402
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_DIMENSIONS = 1536
+DISTINCT_EMBEDDINGS = 64
+
+
+def embedding_pool(seed: int) -> list:
+    rng = random.Random(seed)
+    return [array('f', [rng.uniform(-0.1, 0.1) for _ in range(EMBEDDING_DIMENSIONS)])
+            for _ in range(DISTINCT_EMBEDDINGS)]
+
+
+def embedded_records(staging_dir: Path, pool: list) -> list:
+    """Every staging file's protocols as Protocol records with an embedding each"""
+    records = []
+    for name, target in PARSE_TARGETS.items():
+        records.extend(Protocol.from_dict(protocol) for protocol in target.parse(staging_dir / name))
+    for i, record in enumerate(records):
+        record.set_embedding(pool[i % len(pool)], EMBEDDING_MODEL)
+    return records
+
+
+def timed(function, *args) -> tuple:
+    gc.collect()
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def save_json(records: list, path: Path) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(to_dicts(records), f, indent=2, ensure_ascii=False)
+
+
+def load_json(path: Path) -> list:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def same_protocols(from_json: list, from_store: list) -> bool:
+    if len(from_json) != len(from_store):
+        return False
+    for old, new in zip(from_json, from_store):
+        if list(old) != list(new) or array('f', old['embedding']) != new['embedding']:
+            return False
+        if any(old[key] != new[key] for key in old if key != 'embedding'):
+            return False
+    return True
+
+
+def compare(label: str, records: list, tmp: Path) -> dict:
+    json_path = tmp / 'embedded.json'
+    _, json_write = timed(save_json, records, json_path)
+    _, store_write = timed(write_store, records, json_path, EMBEDDING_DIMENSIONS)
+    count = len(records)
+    json_bytes, store_bytes = json_path.stat().st_size, store_size(json_path)
+
+    from_json, json_load = timed(load_json, json_path)
+    from_store, store_load = timed(lambda: list(iter_store(json_path.with_suffix('.npy'))))
+    same = same_protocols(from_json, from_store)
+    del from_json, from_store
+
+    for layout, size, write, load in (('json', json_bytes, json_write, json_load),
+                                      ('store', store_bytes, store_write, store_load)):
+        print(f"{label:<14} {layout:<6} {count:>9,} {size / 1024 / 1024:10.1f} {write:9.2f} {load:9.3f}")
+    print(f"{'':<14} {'':<6} {'':>9} {json_bytes / store_bytes:9.1f}x smaller, "
+          f"{json_load / store_load:.0f}x faster to load{'' if same else '   ✗ loaded protocols differ'}")
+    return {'protocols': count, 'json_bytes': json_bytes, 'store_bytes': store_bytes, 'same': same}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare JSON and float32 store size and load time')
+    parser.add_argument('--scales', type=int, nargs='+', default=[100],
+                        help='Synthetic corpus sizes as multiples of the fixtures (default: 100)')
+    parser.add_argument('--no-corpus', action='store_true', help='Skip the real corpus in staging/')
+    parser.add_argument('--seed', type=int, default=0, help='Corpus and embedding seed (default: 0)')
+    args = parser.parse_args()
+
+    pool = embedding_pool(args.seed)
+
+    print("=" * 70)
+    print("Embedding Store Benchmark")
+    print("=" * 70)
+    print(f"{'Corpus':<14} {'Format':<6} {'Protocols':>9} {'MB':>10} {'Write s':>9} {'Load s':>9}")
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix='mio-store-') as tmp:
+        if not args.no_corpus:
+            results.append(compare('staging', embedded_records(STAGING_DIR, pool), Path(tmp)))
+
+        for scale in args.scales:
+            corpus = Path(tmp) / f"corpus-{scale}"
+            write_corpus(corpus, scale, args.seed)
+            results.append(compare(f"synthetic {scale}x", embedded_records(corpus, pool), Path(tmp)))
+
+    print()
+    if not all(result['same'] for result in results):
+        print("✗ The store does not load the same protocols as the JSON file")
+        sys.exit(1)
+    print("✓ The store loads the same protocols and float32 embeddings as the JSON file")
+
+
+if __name__ == '__main__':
+    main()
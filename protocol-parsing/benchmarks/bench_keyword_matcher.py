@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Keyword Matcher Benchmark - MIO Protocol Parsing System
+Times KeywordMatcher's single trie pass against per-keyword `keyword in text`
+scans for the parsers' pattern/temperament inference
+
+Chunks are the research protocol chunks from the combined staging file.
+Each keyword table is also timed scaled up (every keyword plus numbered
+variants) to show how both approaches grow with the number of keywords;
+the crossover is where SCAN_MAX_KEYWORDS should sit. Boolean results of
+both paths must match the original inference loop for every chunk.
+
+Usage:
+    python3 benchmarks/bench_keyword_matcher.py
+    python3 benchmarks/bench_keyword_matcher.py --scales 1 4 16 --repeat 10
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR / 'parsers'))
+
+from keyword_matcher import SCAN_MAX_KEYWORDS, KeywordMatcher  # noqa: E402
+from parse_daily_deductible import DailyDeductibleParser  # noqa: E402
+from parse_research_protocols import ResearchProtocolParser  # noqa: E402
+
+STAGING_FILE = BASE_DIR / 'staging' / 'research-protocols-combined.md'
+
+TABLES = {
+    'research patterns': ResearchProtocolParser.PATTERN_KEYWORDS,
+    'research temperaments': ResearchProtocolParser.TEMPERAMENT_KEYWORDS,
+    'daily deductible temperaments': DailyDeductibleParser.TEMPERAMENT_KEYWORDS,
+}
+
+
+def scan_labels(table: dict, text: str) -> list:
+    """The original inference loop"""
+    return [label for label, keywords in table.items() if any(keyword in text for keyword in keywords)]
+
+
+def scale_table(table: dict, scale: int) -> dict:
+    """Table with scale variants of every keyword ('fraud', 'fraud1', ...)"""
+    return {
+        label: [keyword + (str(n) if n else '') for keyword in keywords for n in range(scale)]
+        for label, keywords in table.items()
+    }
+
+
+def best_time(func, chunks: list, repeat: int) -> float:
+    """Best-of-N seconds for func over every chunk"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for chunk in chunks:
+            func(chunk)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark KeywordMatcher against per-keyword scans')
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 4, 16],
+                        help='Keyword table multipliers (default: 1 4 16)')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing repetitions (default: 5)')
+    args = parser.parse_args()
+
+    content = STAGING_FILE.read_text(encoding='utf-8')
+    chunks = [p['chunk_text'].lower() for p in ResearchProtocolParser().parse_file(content)]
+
+    print("=" * 80)
+    print("KeywordMatcher Benchmark")
+    print("=" * 80)
+    print(f"Chunks: {len(chunks)} from {STAGING_FILE.name} ({sum(map(len, chunks)):,} chars)")
+    print()
+    print(f"{'Table':<30} {'Keywords':>9} {'Scan ms':>9} {'Trie ms':>9} {'Speedup':>9} {'Uses':>6}")
+
+    for name, table in TABLES.items():
+        for scale in args.scales:
+            scaled = scale_table(table, scale)
+            matcher = KeywordMatcher(scaled)
+
+            for chunk in chunks:
+                expected = scan_labels(scaled, chunk)
+                if matcher.trie_labels(chunk) != expected or matcher.matched_labels(chunk) != expected:
+                    print(f"✗ {name} x{scale}: results differ from per-keyword scan")
+                    sys.exit(1)
+
+            scan_time = best_time(matcher.scan_labels, chunks, args.repeat)
+            trie_time = best_time(matcher.trie_labels, chunks, args.repeat)
+            uses = 'scan' if matcher.keyword_count <= SCAN_MAX_KEYWORDS else 'trie'
+
+            print(f"{name:<30} {matcher.keyword_count:>9} {scan_time * 1000:9.2f} {trie_time * 1000:9.2f} "
+                  f"{scan_time / trie_time:8.2f}x {uses:>6}")
+
+    print()
+    print(f"✓ Boolean results identical to per-keyword scans (scan used up to {SCAN_MAX_KEYWORDS} keywords)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Neural Rewiring Parser Benchmark - MIO Protocol Parsing System
+Times the single-pass parse_neural_rewiring state machine against the
+original nested re.split parser
+
+The legacy parser below is the pre-state-machine implementation: split by
+pattern header, re-split each pattern by a per-pattern temperament regex,
+split again by practice header and run one DOTALL search per field. It
+stamps chunk identities like the current parser, so both must produce
+identical protocols on the staging file and on libraries made of repeated
+copies of it.
+
+Usage:
+    python3 benchmarks/bench_neural_rewiring.py
+    python3 benchmarks/bench_neural_rewiring.py --copies 1 8 32 --repeat 10
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR / 'parsers'))
+
+from chunk_identity import stamp_identity  # noqa: E402
+from parse_neural_rewiring import (  # noqa: E402
+    determine_difficulty,
+    extract_time_and_frequency,
+    normalize_pattern_name,
+    parse_protocol_events,
+)
+
+STAGING_FILE = BASE_DIR / 'staging' / 'neural-rewiring-normalized.txt'
+
+
+def legacy_parse_practice_section(text, pattern_name, temperament, protocol_title, chunk_number):
+    practice_match = re.match(r'####\s*Practice\s+(\d+):\s*(.+)', text.split('\n')[0])
+    emergency_match = re.match(r'####\s*Emergency Protocol:\s*(.+)', text.split('\n')[0])
+
+    is_emergency = False
+    practice_number = None
+    practice_name = ""
+
+    if practice_match:
+        practice_number = int(practice_match.group(1))
+        practice_name = practice_match.group(2).strip()
+    elif emergency_match:
+        is_emergency = True
+        practice_name = emergency_match.group(1).strip()
+
+    time_min, time_max, frequency = extract_time_and_frequency(practice_name)
+
+    why_match = re.search(r'\*\*Why This Rewires the Pattern\*\*:\s*(.+?)(?=\*\*How to Do It\*\*:|$)', text, re.DOTALL)
+    why_rewires = why_match.group(1).strip() if why_match else ""
+
+    how_match = re.search(r'\*\*How to Do It\*\*:\s*(.+?)(?=\*\*(?:Expected Outcome|What to Do)\*\*:|$)', text, re.DOTALL)
+    how_to_do = how_match.group(1).strip() if how_match else ""
+
+    if is_emergency:
+        what_match = re.search(r'\*\*What to Do\*\*:\s*(.+?)(?=---|$)', text, re.DOTALL)
+        how_to_do = what_match.group(1).strip() if what_match else ""
+
+    outcome_match = re.search(r'\*\*Expected Outcome\*\*:\s*(.+?)(?=---|$)', text, re.DOTALL)
+    expected_outcome = outcome_match.group(1).strip() if outcome_match else ""
+
+    when_match = re.search(r'\*\*When to Use\*\*:\s*(.+?)(?=\*\*What to Do\*\*:|$)', text, re.DOTALL)
+    when_to_use = when_match.group(1).strip() if when_match else ""
+
+    difficulty = determine_difficulty(time_min, frequency, is_emergency)
+    clean_practice_name = re.sub(r'\s*\([^)]+\)', '', practice_name)
+
+    protocol = {
+        "source_file": "neural_rewiring_protocols.txt",
+        "file_number": 1,
+        "chunk_number": chunk_number,
+        "chunk_text": text.strip(),
+        "chunk_summary": f"{clean_practice_name} - {temperament.capitalize()}",
+        "category": "neural-rewiring",
+        "applicable_patterns": [normalize_pattern_name(pattern_name)],
+        "temperament_match": [temperament.lower()],
+        "time_commitment_min": time_min,
+        "time_commitment_max": time_max,
+        "difficulty_level": difficulty,
+        "is_emergency_protocol": is_emergency,
+        "practice_frequency": frequency,
+        "pattern_name": normalize_pattern_name(pattern_name),
+        "temperament_name": temperament.lower(),
+        "protocol_title": protocol_title.strip('*"'),
+        "practice_number": practice_number,
+        "practice_name": clean_practice_name,
+        "why_rewires": why_rewires,
+        "how_to_do": how_to_do,
+        "expected_outcome": expected_outcome,
+        "emergency_trigger": when_to_use if is_emergency else None
+    }
+
+    return stamp_identity(protocol, protocol["pattern_name"], protocol["temperament_name"],
+                          "emergency" if is_emergency else f"practice-{practice_number}")
+
+
+def legacy_parse(content):
+    """parse_neural_rewiring_file as it was, minus the file read"""
+    protocols = []
+    chunk_number = 1
+
+    for section in re.split(r'(?=^## \d+\. [A-Z\s]+PROTOCOLS)', content, flags=re.MULTILINE):
+        section = section.strip()
+        pattern_match = re.match(r'## \d+\.\s+([A-Z\s]+)\s+PROTOCOLS', section)
+        if not pattern_match:
+            continue
+        pattern_name = pattern_match.group(1).strip()
+
+        temperament_pattern = r'###\s+' + re.escape(pattern_name) + r'\s+\+\s+(WARRIOR|SAGE|CONNECTOR|BUILDER)\s+TEMPERAMENT'
+        for temp_section in re.split(f'(?={temperament_pattern})', section):
+            temp_section = temp_section.strip()
+            temp_match = re.search(temperament_pattern, temp_section)
+            if not temp_match:
+                continue
+            temperament = temp_match.group(1)
+
+            title_match = re.search(r'\*\*Your Protocol:\s*([^*]+)\*\*', temp_section)
+            protocol_title = title_match.group(1).strip() if title_match else f"{pattern_name} - {temperament}"
+
+            for practice in re.split(r'(?=####\s+(?:Practice\s+\d+:|Emergency Protocol:))', temp_section):
+                practice = practice.strip()
+                if not practice.startswith('####'):
+                    continue
+                protocols.append(legacy_parse_practice_section(practice, pattern_name, temperament,
+                                                               protocol_title, chunk_number))
+                chunk_number += 1
+
+    return protocols
+
+
+def best_time(parse, content: str, repeat: int) -> tuple:
+    """Best-of-N seconds and the protocols from the last run"""
+    best = float('inf')
+    protocols = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        protocols = parse(content)
+        best = min(best, time.perf_counter() - start)
+    return best, protocols
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the Neural Rewiring parser')
+    parser.add_argument('--copies', type=int, nargs='+', default=[1, 4, 16],
+                        help='Library sizes as copies of the staging file (default: 1 4 16)')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing repetitions (default: 5)')
+    args = parser.parse_args()
+
+    content = STAGING_FILE.read_text(encoding='utf-8')
+
+    print("=" * 72)
+    print("Neural Rewiring Parser Benchmark")
+    print("=" * 72)
+    print(f"Source: {STAGING_FILE.name} ({len(content):,} chars)")
+    print()
+    print(f"{'Copies':>8} {'Protocols':>10} {'Legacy ms':>11} {'Current ms':>11} {'Speedup':>9}")
+
+    for copies in args.copies:
+        library = '\n'.join([content] * copies)
+
+        legacy_time, legacy_protocols = best_time(legacy_parse, library, args.repeat)
+        current_time, current_protocols = best_time(parse_protocol_events, library, args.repeat)
+
+        if current_protocols != legacy_protocols:
+            print(f"✗ Output differs from legacy parser at {copies} copies")
+            sys.exit(1)
+
+        print(f"{copies:>8} {len(current_protocols):>10,} {legacy_time * 1000:11.2f} "
+              f"{current_time * 1000:11.2f} {legacy_time / current_time:8.2f}x")
+
+    print()
+    print("✓ Identical protocols from both parsers")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Normalizer Benchmark - MIO Protocol Parsing System
+Compares normalize_text() against the original regex/list implementation
+
+Checks byte-identical output on the staging files plus randomized inputs,
+then reports throughput (MB/s) for both implementations and the peak
+memory of the in-memory path versus --stream mode.
+
+Usage:
+    python3 benchmarks/bench_normalize.py
+    python3 benchmarks/bench_normalize.py --size-mb 16 --repeat 5
+"""
+
+import argparse
+import random
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from normalize_sources import normalize_text, stream_normalize, STAGING_DIR, BACKUP_DIR  # noqa: E402
+
+
+def legacy_normalize_text(text: str) -> str:
+    """Original multi-pass implementation, kept verbatim as the reference."""
+    if text.startswith('\ufeff'):
+        text = text[1:]
+
+    replacements = {
+        '\u2018': "'",
+        '\u2019': "'",
+        '\u201c': '"',
+        '\u201d': '"',
+        '\u2013': '-',
+        '\u2014': '--',
+        '\u2026': '...',
+    }
+
+    for old, new in replacements.items():
+        text = text.replace(old, new)
+
+    text = text.replace('\t', '    ')
+    text = re.sub(r' +', ' ', text)
+
+    text = text.replace('\r\n', '\n').replace('\r', '\n')
+
+    lines = text.split('\n')
+    lines = [line.rstrip() for line in lines]
+    text = '\n'.join(lines)
+
+    text = text.rstrip() + '\n'
+
+    return text
+
+
+# Characters that exercise every rule (and a few whitespace edge cases such
+# as NBSP, form feed and NEL that rstrip() treats as whitespace)
+FUZZ_ALPHABET = (
+    ['a', 'b', 'Z', '#', '*', '-', '.', '1'] * 4 +
+    [' '] * 8 +
+    ['\t', '\n', '\n', '\r', '\r\n', '\ufeff', '\xa0', '\x0c', '\x0b', '\x85', '\u2009'] +
+    ['\u2018', '\u2019', '\u201c', '\u201d', '\u2013', '\u2014', '\u2026']
+)
+
+
+def fuzz_equivalence(iterations: int, seed: int = 1234) -> int:
+    """Compare both implementations on random documents; return mismatches."""
+    rng = random.Random(seed)
+    mismatches = 0
+
+    for i in range(iterations):
+        length = rng.randint(0, 200)
+        text = ''.join(rng.choice(FUZZ_ALPHABET) for _ in range(length))
+        if rng.random() < 0.2:
+            text = '\ufeff' + text
+
+        if normalize_text(text) != legacy_normalize_text(text):
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"   ✗ Mismatch on input {i}: {text!r}")
+
+    return mismatches
+
+
+def load_corpus(size_mb: float) -> str:
+    """Build a corpus of roughly size_mb from the real source files."""
+    sources = sorted(BACKUP_DIR.glob('*')) + sorted(STAGING_DIR.glob('*'))
+    sample = ''.join(
+        path.read_text(encoding='utf-8', errors='replace')
+        for path in sources if path.is_file()
+    )
+    # Add back the characters the staging copies already lost
+    sample += '\u201cQuoted\u201d \u2014 it\u2019s\tfine\u2026  \r\n' * 20
+
+    target = int(size_mb * 1024 * 1024)
+    repeats = max(1, target // len(sample))
+    return sample * repeats
+
+
+def time_call(func, text: str, repeat: int) -> float:
+    """Best-of-N wall time in seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_memory(func) -> int:
+    """Peak traced allocation (bytes) while running func()."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def compare_stream_memory(corpus: str, block_size: int) -> None:
+    """Normalize a corpus file in memory and streamed; check output and peak memory."""
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / 'source.md'
+        source.write_text(corpus, encoding='utf-8')
+        in_memory_out = Path(tmp) / 'in-memory.md'
+        streamed_out = Path(tmp) / 'streamed.md'
+
+        def run_in_memory():
+            with open(source, 'r', encoding='utf-8', errors='replace') as f:
+                text = f.read()
+            with open(in_memory_out, 'w', encoding='utf-8') as f:
+                f.write(normalize_text(text))
+
+        def run_streamed():
+            with open(source, 'r', encoding='utf-8', errors='replace') as f, \
+                    open(streamed_out, 'w', encoding='utf-8') as out:
+                stream_normalize(f, out, block_size)
+
+        in_memory_peak = peak_memory(run_in_memory)
+        streamed_peak = peak_memory(run_streamed)
+        same = in_memory_out.read_bytes() == streamed_out.read_bytes()
+
+    print(f"   {'✓' if same else '✗'} Streamed output identical to in-memory output")
+    print(f"   In-memory peak:  {in_memory_peak / 1024 / 1024:8.1f} MB")
+    print(f"   Streamed peak:   {streamed_peak / 1024 / 1024:8.1f} MB (block size {block_size:,} chars)")
+    if not same:
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark normalize_text()')
+    parser.add_argument('--size-mb', type=float, default=8.0, help='Corpus size in MB (default: 8)')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing repetitions (default: 3)')
+    parser.add_argument('--fuzz', type=int, default=20000, help='Random equivalence cases (default: 20000)')
+    parser.add_argument('--block-size', type=int, default=256 * 1024, help='Stream block size in chars (default: 262144)')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("normalize_text() Benchmark")
+    print("=" * 60)
+    print()
+
+    # 1. Equivalence on real sources
+    print("1. Checking byte-identical output on source files...")
+    for path in sorted(BACKUP_DIR.glob('*')) + sorted(STAGING_DIR.glob('*')):
+        text = path.read_text(encoding='utf-8', errors='replace')
+        same = normalize_text(text).encode('utf-8') == legacy_normalize_text(text).encode('utf-8')
+        print(f"   {'✓' if same else '✗'} {path.name}")
+        if not same:
+            sys.exit(1)
+    print()
+
+    # 2. Randomized equivalence
+    print(f"2. Fuzzing {args.fuzz:,} random documents...")
+    mismatches = fuzz_equivalence(args.fuzz)
+    if mismatches:
+        print(f"   ✗ {mismatches} mismatches")
+        sys.exit(1)
+    print("   ✓ No mismatches")
+    print()
+
+    # 3. Throughput
+    corpus = load_corpus(args.size_mb)
+    size_mb = len(corpus.encode('utf-8')) / 1024 / 1024
+    print(f"3. Throughput on {size_mb:.1f} MB corpus (best of {args.repeat})...")
+
+    legacy_time = time_call(legacy_normalize_text, corpus, args.repeat)
+    fused_time = time_call(normalize_text, corpus, args.repeat)
+
+    print(f"   Legacy:              {legacy_time * 1000:8.1f} ms  {size_mb / legacy_time:8.1f} MB/s")
+    print(f"   Current:             {fused_time * 1000:8.1f} ms  {size_mb / fused_time:8.1f} MB/s")
+    print(f"   Speedup:             {legacy_time / fused_time:8.2f}x")
+    print()
+
+    # 4. Streaming memory
+    print("4. Peak memory, in-memory vs --stream (tracemalloc)...")
+    compare_stream_memory(corpus, args.block_size)
+    print()
+
+
+if __name__ == '__main__':
+    main()
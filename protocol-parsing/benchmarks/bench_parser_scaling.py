@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Parser Scaling Benchmark - MIO Protocol Parsing System
+Runs every registered parser over synthetic corpora (synthetic_corpus.py)
+up a size ladder and checks the results against a JSON baseline
+
+For each parser and scale it records chunks, best-of-N wall time, µs and
+chunks/s, and the peak traced Python memory of one parse (tracemalloc, in
+a separate untimed run). The run fails (exit 1) if:
+    - a scale-N corpus does not yield exactly N times the scale-1 chunks
+    - µs/chunk at the largest scale exceeds --max-growth times the smallest
+      (super-linear scaling, checked within the run so it is machine-free)
+    - against the baseline: chunk counts differ, µs/chunk is more than
+      --time-tolerance slower, or peak memory is more than
+      --memory-tolerance larger
+
+The baseline is written on the first run (or with --update-baseline);
+timings are machine specific, so record it on the machine that compares.
+
+Usage:
+    python3 benchmarks/bench_parser_scaling.py
+    python3 benchmarks/bench_parser_scaling.py --scales 1 10 100 1000 --repeat 1
+    python3 benchmarks/bench_parser_scaling.py --update-baseline
+"""
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from parse_targets import PARSE_TARGETS  # noqa: E402
+from synthetic_corpus import BUILDERS  # noqa: E402
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / 'parser_scaling_baseline.json'
+
+
+def measure(parse, path: Path, repeat: int) -> dict:
+    """Best-of-N parse time and the peak traced memory of one more parse"""
+    best = float('inf')
+    chunks = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        chunks = len(parse(path))
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    parse(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'chunks': chunks,
+        'input_mb': round(path.stat().st_size / 1024 / 1024, 3),
+        'seconds': round(best, 6),
+        'us_per_chunk': round(best / chunks * 1e6, 2) if chunks else None,
+        'chunks_per_sec': round(chunks / best, 1) if best else None,
+        'peak_mb': round(peak / 1024 / 1024, 3),
+    }
+
+
+def run(scales: list, seed: int, repeat: int) -> dict:
+    """Results by staging name, then by scale"""
+    results = {name: {} for name in BUILDERS}
+
+    with tempfile.TemporaryDirectory(prefix='mio-scaling-') as tmp:
+        for scale in scales:
+            for name, build in BUILDERS.items():
+                path = Path(tmp) / name
+                path.write_text(build(scale, seed), encoding='utf-8')
+                result = measure(PARSE_TARGETS[name].parse, path, repeat)
+                results[name][str(scale)] = result
+                path.unlink()
+
+                print(f"{name:<32} {scale:>6}x {result['input_mb']:9.2f} {result['chunks']:>9,} "
+                      f"{result['seconds'] * 1000:10.1f} {result['us_per_chunk']:9.1f} "
+                      f"{result['chunks_per_sec']:11,.0f} {result['peak_mb']:9.2f}")
+    return results
+
+
+def scaling_failures(results: dict, scales: list, max_growth: float) -> list:
+    """Chunk counts not linear in scale, or super-linear time per chunk"""
+    failures = []
+    smallest, largest = str(min(scales)), str(max(scales))
+
+    for name, by_scale in results.items():
+        unit = by_scale[smallest]['chunks'] / int(smallest)
+        for scale, result in by_scale.items():
+            if result['chunks'] != unit * int(scale):
+                failures.append(f"{name} {scale}x: {result['chunks']} chunks, expected {unit * int(scale):.0f}")
+
+        growth = by_scale[largest]['us_per_chunk'] / by_scale[smallest]['us_per_chunk']
+        if smallest != largest and growth > max_growth:
+            failures.append(f"{name}: µs/chunk grew {growth:.2f}x from {smallest}x to {largest}x "
+                            f"(limit {max_growth:g}x) - super-linear")
+    return failures
+
+
+def baseline_failures(results: dict, baseline: dict, time_tolerance: float, memory_tolerance: float) -> list:
+    """Regressions against the baseline for every (parser, scale) both have"""
+    failures = []
+    for name, by_scale in results.items():
+        for scale, result in by_scale.items():
+            expected = baseline.get('results', {}).get(name, {}).get(scale)
+            if expected is None:
+                continue
+            label = f"{name} {scale}x"
+            if result['chunks'] != expected['chunks']:
+                failures.append(f"{label}: {result['chunks']} chunks, baseline {expected['chunks']}")
+            if result['us_per_chunk'] > expected['us_per_chunk'] * (1 + time_tolerance):
+                failures.append(f"{label}: {result['us_per_chunk']:.1f} µs/chunk, "
+                                f"baseline {expected['us_per_chunk']:.1f} (+{time_tolerance:.0%} allowed)")
+            if result['peak_mb'] > expected['peak_mb'] * (1 + memory_tolerance):
+                failures.append(f"{label}: {result['peak_mb']:.2f} MB peak, "
+                                f"baseline {expected['peak_mb']:.2f} (+{memory_tolerance:.0%} allowed)")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark parser scaling on synthetic corpora')
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100],
+                        help='Corpus sizes as multiples of the fixtures (default: 1 10 100)')
+    parser.add_argument('--seed', type=int, default=0, help='Corpus shuffle seed (default: 0)')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing repetitions (default: 3)')
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE,
+                        help=f'Baseline JSON (default: benchmarks/{DEFAULT_BASELINE.name})')
+    parser.add_argument('--update-baseline', action='store_true', help='Overwrite the baseline with this run')
+    parser.add_argument('--time-tolerance', type=float, default=0.5,
+                        help='Allowed µs/chunk slowdown vs the baseline (default: 0.5 = 50%%)')
+    parser.add_argument('--memory-tolerance', type=float, default=0.2,
+                        help='Allowed peak memory growth vs the baseline (default: 0.2 = 20%%)')
+    parser.add_argument('--max-growth', type=float, default=2.0,
+                        help='Allowed µs/chunk ratio between the largest and smallest scale (default: 2.0)')
+    args = parser.parse_args()
+    scales = sorted(set(args.scales))
+
+    print("=" * 104)
+    print("Parser Scaling Benchmark")
+    print("=" * 104)
+    print(f"{'Parser':<32} {'Scale':>7} {'Input MB':>9} {'Chunks':>9} {'Best ms':>10} {'µs/chunk':>9} "
+          f"{'Chunks/s':>11} {'Peak MB':>9}")
+
+    results = run(scales, args.seed, args.repeat)
+    failures = scaling_failures(results, scales, args.max_growth)
+
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'repeat': args.repeat,
+        'scales': scales,
+        'results': results,
+    }
+
+    print()
+    if args.update_baseline or not args.baseline.exists():
+        args.baseline.write_text(json.dumps(report, indent=2) + '\n', encoding='utf-8')
+        print(f"✓ Baseline written to {args.baseline}")
+    else:
+        baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+        if baseline.get('seed') != args.seed:
+            print(f"⚠️  Baseline seed {baseline.get('seed')} differs from --seed {args.seed}; chunk counts may differ")
+        failures += baseline_failures(results, baseline, args.time_tolerance, args.memory_tolerance)
+        print(f"Compared with {args.baseline} ({baseline.get('platform')}, Python {baseline.get('python')})")
+
+    if failures:
+        print()
+        print(f"✗ {len(failures)} SCALING REGRESSION{'S' if len(failures) > 1 else ''}:")
+        for failure in failures:
+            print(f"   ✗ {failure}")
+        sys.exit(1)
+
+    print("✓ Linear scaling, no regressions")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Protocol Memory Benchmark - MIO Protocol Parsing System
+Compares the memory the embed stage holds with plain protocol dicts (the
+pipeline before protocol_record.py) against slotted Protocol records
+
+For the real corpus (staging/, 231 protocols) and synthetic corpora
+(synthetic_corpus.py) it loads the parsed protocols from JSON and attaches
+a 1536-dimension embedding to each, the two ways:
+    dicts     load_protocols() list kept alive, plus a protocol.copy() per
+              protocol holding the embedding as a list of floats
+    records   Protocol.from_dict() at load, set_embedding() in place
+              (float32 array)
+Embeddings are float64 values, as the API client returns them. It reports
+the traced Python memory the corpus holds afterwards (tracemalloc), bytes
+per protocol and the time each way takes, and checks both save the same
+JSON up to the float32 rounding of the embeddings, records no larger.
+
+Usage:
+    python3 benchmarks/bench_protocol_memory.py
+    python3 benchmarks/bench_protocol_memory.py --scales 1 10 100 --no-corpus
+"""
+
+import argparse
+import gc
+import json
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from array import array
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from parse_targets import PARSE_TARGETS, STAGING_DIR  # noqa: E402
+from protocol_record import Protocol, to_dicts  # noqa: E402
+from synthetic_corpus import write_corpus  # noqa: E402
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_DIMENSIONS = 1536
+DISTINCT_EMBEDDINGS = 64
+
+
+def parsed_json(staging_dir: Path) -> str:
+    """Every staging file's protocols as one JSON array, the embed stage's input"""
+    protocols = []
+    for name, target in PARSE_TARGETS.items():
+        protocols.extend(target.parse(staging_dir / name))
+    return json.dumps(protocols, ensure_ascii=False)
+
+
+def embedding_pool(seed: int) -> list:
+    """float64 vectors to hand out; tolist() makes fresh float objects each time"""
+    rng = random.Random(seed)
+    return [array('d', [round(rng.gauss(0, 0.025), 10) for _ in range(EMBEDDING_DIMENSIONS)])
+            for _ in range(DISTINCT_EMBEDDINGS)]
+
+
+def embed_dicts(source: str, pool: list) -> list:
+    """The old path: the loaded list stays alive next to embedded copies"""
+    protocols = json.loads(source)
+    embedded = []
+    for i, protocol in enumerate(protocols):
+        protocol_copy = protocol.copy()
+        protocol_copy['embedding'] = pool[i % len(pool)].tolist()
+        protocol_copy['embedding_model'] = EMBEDDING_MODEL
+        protocol_copy['embedding_dimensions'] = EMBEDDING_DIMENSIONS
+        embedded.append(protocol_copy)
+    return [protocols, embedded]
+
+
+def embed_records(source: str, pool: list) -> list:
+    """The record path: one Protocol per protocol, embedding set in place"""
+    records = [Protocol.from_dict(protocol) for protocol in json.loads(source)]
+    for i, record in enumerate(records):
+        record.set_embedding(pool[i % len(pool)].tolist(), EMBEDDING_MODEL)
+    return records
+
+
+def measure(embed, source: str, pool: list) -> tuple:
+    """(result, traced bytes it holds, seconds to build it untraced)"""
+    gc.collect()
+    start = time.perf_counter()
+    result = embed(source, pool)
+    seconds = time.perf_counter() - start
+    del result
+
+    gc.collect()
+    tracemalloc.start()
+    result = embed(source, pool)
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, held, seconds
+
+
+def same_json(dict_json: str, record_json: str) -> bool:
+    """Same protocols, embeddings equal once rounded to float32, and the record JSON no larger"""
+    dicts, records = json.loads(dict_json), json.loads(record_json)
+    for protocol in dicts + records:
+        protocol['embedding'] = array('f', protocol['embedding'])
+    return dicts == records and len(record_json) <= len(dict_json)
+
+
+def compare(label: str, source: str, pool: list) -> dict:
+    dicts, dict_bytes, dict_seconds = measure(embed_dicts, source, pool)
+    count = len(dicts[1])
+    saved = json.dumps(dicts[1])
+    del dicts
+
+    records, record_bytes, record_seconds = measure(embed_records, source, pool)
+    same_output = same_json(saved, json.dumps(to_dicts(records)))
+    del records, saved
+
+    for layout, held, seconds in (('dicts', dict_bytes, dict_seconds), ('records', record_bytes, record_seconds)):
+        print(f"{label:<14} {layout:<8} {count:>8,} {held / 1024 / 1024:10.1f} {held / count:12,.0f} "
+              f"{seconds * 1000:10.1f}")
+    print(f"{'':<14} {'':<8} {'':>8} {dict_bytes / record_bytes:9.1f}x smaller"
+          f"{'' if same_output else '   ✗ saved JSON differs'}")
+    return {'protocols': count, 'dict_bytes': dict_bytes, 'record_bytes': record_bytes, 'same_output': same_output}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare protocol dict and Protocol record memory')
+    parser.add_argument('--scales', type=int, nargs='+', default=[100],
+                        help='Synthetic corpus sizes as multiples of the fixtures (default: 100)')
+    parser.add_argument('--no-corpus', action='store_true', help='Skip the real corpus in staging/')
+    parser.add_argument('--seed', type=int, default=0, help='Corpus and embedding seed (default: 0)')
+    args = parser.parse_args()
+
+    pool = embedding_pool(args.seed)
+
+    print("=" * 70)
+    print("Protocol Memory Benchmark")
+    print("=" * 70)
+    print(f"{'Corpus':<14} {'Layout':<8} {'Protocols':>8} {'Held MB':>10} {'Bytes/proto':>12} {'Build ms':>10}")
+
+    results = []
+    if not args.no_corpus:
+        results.append(compare('staging', parsed_json(STAGING_DIR), pool))
+
+    for scale in args.scales:
+        with tempfile.TemporaryDirectory(prefix='mio-memory-') as tmp:
+            write_corpus(Path(tmp), scale, args.seed)
+            source = parsed_json(Path(tmp))
+        results.append(compare(f"synthetic {scale}x", source, pool))
+        del source
+
+    print()
+    if not all(result['same_output'] for result in results):
+        print("✗ Records do not save the same JSON as dicts (embeddings at float32)")
+        sys.exit(1)
+    print("✓ Records save the same JSON as dicts (embeddings at float32), no larger")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+"""
+Regex Backtracking Benchmark - MIO Protocol Parsing System
+Fuzzes every parser regex at its call site with adversarial and truncated
+inputs and fails if its match time grows super-linearly with input size
+
+Each pattern is driven the way its parser calls it (per heading or field
+line, per chunk, or per document) with:
+    adversarial   a crafted worst case: long whitespace or digit runs,
+                  openers with no closer, the pattern's prefix repeated
+    truncated     a real staging input cut at a seeded offset, then padded
+                  with whitespace, with digits, or repeated
+Each input is timed up a size ladder (doubling from --min-size) until
+--max-size or a call takes longer than --time-limit. The growth exponent
+is the slope of log(time) over log(n) across the ladder: ~1 linear,
+~2 quadratic. Any current pattern above --max-exponent fails the run.
+
+Patterns rewritten for linear time keep their old form here ("as the
+parsers had them"), so the table shows the growth they replaced, and
+each is fuzzed against its old form on mutated staging inputs (cuts,
+deletions, duplicated spans, inserted delimiters) to check they agree.
+The one intended difference: a NR header with no name at all
+("## 8.   PROTOCOLS") is no longer a pattern header.
+
+Usage:
+    python3 benchmarks/bench_regex_backtracking.py
+    python3 benchmarks/bench_regex_backtracking.py --max-size 32768 --fuzz 20000
+"""
+
+import argparse
+import math
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, List, NamedTuple, Optional
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+sys.path.insert(0, str(BASE_DIR / 'parsers'))
+
+from create_test_fixtures import find_practices  # noqa: E402
+from markdown_events import iter_events  # noqa: E402
+from parse_daily_deductible import DailyDeductibleParser  # noqa: E402
+from parse_neural_rewiring import (  # noqa: E402
+    extract_time_and_frequency,
+    parse_practice_section,
+    strip_parentheticals,
+)
+from parse_research_protocols import ResearchProtocolParser  # noqa: E402
+from regex_registry import (  # noqa: E402
+    DD_DURATION,
+    DD_PRACTICE_HEADER,
+    DD_PRACTICE_ID_TITLE,
+    DD_SECTION_HEADER,
+    DD_STATE_FIELD,
+    DD_TIME_FIELD,
+    NR_PATTERN_HEADER,
+    NR_PRACTICE_HEADER,
+    NR_PRACTICE_TITLE,
+    NR_PROTOCOL_TITLE,
+    NR_TEMPERAMENT_HEADER,
+    RP_CLINICAL_FRAMING,
+    RP_KB_FILE,
+    RP_NUMBERED_STEP,
+    RP_TIME_COMMITMENT,
+    RP_USER_FRAMING,
+)
+
+STAGING_DIR = BASE_DIR / 'staging'
+
+# Characters the fuzzer inserts: every delimiter the patterns look for
+FUZZ_ALPHABET = ' \t\n*()=-+:.,\\#"\'1A'
+
+
+class Case(NamedTuple):
+    name: str
+    scope: str                               # what one call sees: line, chunk, section, document
+    samples: List[str]                       # real inputs from the staging files
+    adversarial: Callable[[int], str]        # crafted worst case of about n characters
+    current: Callable[[str], Any]            # the call site as the parser has it now
+    legacy: Optional[Callable[[str], Any]] = None   # the pattern it replaced
+
+
+# ============================================================================
+# Legacy patterns, as the parsers had them
+# ============================================================================
+
+LEGACY_DD_TIME_FIELD = re.compile(r'\*\*Time:\*\*\s*([^*]+?)(?:\s*\*\*|$)')
+LEGACY_DD_STATE_FIELD = re.compile(r'\*\*The State It Creates:\*\*\s*(.+?)(?:\s*\*\*Instructions:\*\*|$)')
+LEGACY_DD_SECTION_NOTE = re.compile(r'\s*\(.+?\)\s*$')
+LEGACY_DD_DURATION = re.compile(r'(?P<low>\d+)\s*(?:-\s*(?P<high>\d+)\s*)?(?P<unit>min|hour)', re.IGNORECASE)
+LEGACY_NR_PATTERN_HEADER = re.compile(r'\d+\.\s+([A-Z\s]+)\s+PROTOCOLS')
+LEGACY_NR_TEMPERAMENT_HEADER = re.compile(r'([A-Z\s]+?)\s+\+\s+(WARRIOR|SAGE|CONNECTOR|BUILDER)\s+TEMPERAMENT')
+LEGACY_NR_PROTOCOL_TITLE = re.compile(r'\*\*Your Protocol:\s*([^*]+)\*\*')
+LEGACY_NR_TIME_FREQUENCY = re.compile(r'\((\d+|varies)\s*(?:minutes?)?,?\s*([^)]+)\)', re.IGNORECASE)
+LEGACY_NR_PARENTHETICAL = re.compile(r'\s*\([^)]+\)')
+LEGACY_RP_TIME_COMMITMENT = re.compile(r'(\d+)(?:-(\d+))?\s*(?:min|minute)')
+LEGACY_RP_NUMBERED_STEP = re.compile(r'\n\s*\d+\.')
+LEGACY_RP_PATTERN_HEADER = re.compile(r'===\s*(?:PATTERN:\s*)?([^=]+)===')
+
+# create_test_fixtures.py
+LEGACY_PRACTICE_PATTERN = re.compile(r'(####\s+\*\*\d+\\.+.+?\*\*.*?)(?=####\s+\*\*\d+\\.|---|\Z)', re.DOTALL)
+LEGACY_PRACTICE_PATTERN_ALT = re.compile(r'(####\s+\*\*\d+\.\s+.+?\*\*.*?)(?=####\s+\*\*\d+\.|---|\Z)', re.DOTALL)
+
+
+def legacy_time_and_frequency(title):
+    match = LEGACY_NR_TIME_FREQUENCY.search(title)
+    if not match:
+        return None, None, "as_needed"
+    frequency = match.group(2).strip()
+    if match.group(1).lower() == "varies":
+        return None, None, frequency
+    return int(match.group(1)), int(match.group(1)), frequency
+
+
+def legacy_pattern_names(header):
+    match = LEGACY_RP_PATTERN_HEADER.search(header)
+    return [match.group(1).strip().lower().replace(' ', '_')] if match else []
+
+
+def legacy_find_practices(content):
+    return LEGACY_PRACTICE_PATTERN.findall(content) or LEGACY_PRACTICE_PATTERN_ALT.findall(content)
+
+
+# ============================================================================
+# Call sites
+# ============================================================================
+
+def per_line(func):
+    """Apply func to every line, as parsers apply heading and field patterns"""
+    return lambda text: [func(line) for line in text.split('\n')]
+
+
+def stripped_group(pattern, method='search'):
+    """group(1).strip() of the match, as the callers use it"""
+    def call(text):
+        match = getattr(pattern, method)(text)
+        return match.group(1).strip() if match else None
+    return call
+
+
+def header_groups(pattern, strip_name=False):
+    """Groups of a header match as the parser uses them; a name-less match counts as none"""
+    def call(text):
+        match = pattern.match(text)
+        if not match or not match.group(1).strip():
+            return None
+        name = match.group(1).strip() if strip_name else match.group(1)
+        return (name,) + match.groups()[1:]
+    return call
+
+
+def all_groups(pattern):
+    return lambda text: [match.groups() for match in pattern.finditer(text)]
+
+
+def findall_lower(pattern):
+    return lambda text: pattern.findall(text.lower())
+
+
+def count_all(pattern):
+    return lambda text: len(pattern.findall(text))
+
+
+def matches(pattern, method='search'):
+    return lambda text: getattr(pattern, method)(text) is not None
+
+
+def practice_fields(text):
+    protocol = parse_practice_section(text, 'SYNTHETIC', 'WARRIOR', 'Synthetic Protocol', 1)
+    return protocol['why_rewires'], protocol['how_to_do'], protocol['expected_outcome']
+
+
+# ============================================================================
+# Inputs
+# ============================================================================
+
+def load_cases() -> List[Case]:
+    daily = (STAGING_DIR / 'daily-deductible-normalized.md').read_text(encoding='utf-8')
+    neural = (STAGING_DIR / 'neural-rewiring-normalized.txt').read_text(encoding='utf-8')
+    research = (STAGING_DIR / 'research-protocols-combined.md').read_text(encoding='utf-8')
+
+    daily_lines = daily.split('\n')
+    neural_lines = neural.split('\n')
+    research_lines = research.split('\n')
+
+    time_lines = [line for line in daily_lines if '**Time:**' in line]
+    durations = [stripped_group(DD_TIME_FIELD)(line) for line in time_lines]
+    section_titles = [line[6:].rstrip('*') for line in daily_lines if line.startswith('### **')]
+    practice_headers = [line for line in daily_lines if line.startswith('#### **')]
+    # Header patterns are matched from a HEADING event's text, after the #s
+    heading_texts = [line.lstrip('#').strip() for line in daily_lines if line.startswith('###')]
+    pattern_headings = [line[3:] for line in neural_lines if line.startswith('## ')]
+    temperament_headings = [line[4:] for line in neural_lines if line.startswith('### ')]
+    practice_titles = [line for line in neural_lines if line.startswith('#### ')]
+    practice_names = [NR_PRACTICE_TITLE.match(line).group('name') for line in practice_titles
+                      if NR_PRACTICE_TITLE.match(line)]
+    practices = ['#### ' + block for block in neural.split('\n#### ')[1:]]
+    sections = ['### ' + block for block in neural.split('\n### ')[1:]]
+    markers = [line for line in research_lines if line.startswith('===')]
+    kb_files = [line for line in research_lines if line.startswith('# SOURCE FILE:')]
+    chunks = [p['chunk_text'] for p in ResearchProtocolParser().parse_file(research)]
+    daily_windows = [daily[start:start + 4000] for start in range(0, len(daily), 4000)]
+
+    research_parser = ResearchProtocolParser()
+
+    return [
+        # Rewritten for linear time
+        Case('DD_TIME_FIELD', 'line', time_lines,
+             lambda n: '**Time:** 5' + ' ' * n + '*x',
+             per_line(stripped_group(DD_TIME_FIELD)), per_line(stripped_group(LEGACY_DD_TIME_FIELD))),
+        Case('DD_STATE_FIELD', 'line', time_lines,
+             lambda n: '**The State It Creates:** calm' + ' ' * n + 'x',
+             per_line(stripped_group(DD_STATE_FIELD)), per_line(stripped_group(LEGACY_DD_STATE_FIELD))),
+        Case('DD_SECTION_NOTE', 'line', section_titles,
+             lambda n: 'Practices ' + '(a) ' * (n // 4) + 'x',
+             per_line(DailyDeductibleParser.category_name),
+             per_line(lambda title: LEGACY_DD_SECTION_NOTE.sub('', title.strip()).replace('\\', ''))),
+        Case('DD_DURATION', 'line', durations,
+             lambda n: '1' * n,
+             per_line(all_groups(DD_DURATION)), per_line(all_groups(LEGACY_DD_DURATION))),
+        Case('NR_PATTERN_HEADER', 'line', pattern_headings,
+             lambda n: '8. A' + ' ' * n + 'x',
+             per_line(header_groups(NR_PATTERN_HEADER, strip_name=True)),
+             per_line(header_groups(LEGACY_NR_PATTERN_HEADER, strip_name=True))),
+        Case('NR_TEMPERAMENT_HEADER', 'line', temperament_headings,
+             lambda n: 'A' + ' ' * n + 'x',
+             per_line(header_groups(NR_TEMPERAMENT_HEADER)), per_line(header_groups(LEGACY_NR_TEMPERAMENT_HEADER))),
+        Case('NR_PROTOCOL_TITLE', 'section', sections,
+             lambda n: '**Your Protocol:' + ' ' * n + 'x',
+             stripped_group(NR_PROTOCOL_TITLE), stripped_group(LEGACY_NR_PROTOCOL_TITLE)),
+        Case('NR_TIME_FREQUENCY', 'line', practice_names,
+             lambda n: 'Practice (10' + ' ' * n,
+             per_line(extract_time_and_frequency), per_line(legacy_time_and_frequency)),
+        Case('NR_PARENTHETICAL', 'line', practice_names,
+             lambda n: 'Practice' + ' (' * (n // 2),
+             per_line(strip_parentheticals), per_line(lambda name: LEGACY_NR_PARENTHETICAL.sub('', name))),
+        Case('RP_TIME_COMMITMENT', 'chunk', chunks,
+             lambda n: '1' * n,
+             findall_lower(RP_TIME_COMMITMENT), findall_lower(LEGACY_RP_TIME_COMMITMENT)),
+        Case('RP_NUMBERED_STEP', 'chunk', chunks,
+             lambda n: '\n' * n,
+             count_all(RP_NUMBERED_STEP), count_all(LEGACY_RP_NUMBERED_STEP)),
+        Case('RP_PATTERN_HEADER', 'line', markers,
+             lambda n: '===' + ' ' * n + '=x',
+             per_line(research_parser.extract_pattern_names), per_line(legacy_pattern_names)),
+        Case('fixture practice blocks', 'document', daily_windows,
+             lambda n: '#### **1\\. T' + 'x' * n,
+             find_practices, legacy_find_practices),
+
+        # Unchanged, checked for growth only
+        Case('MARKDOWN_EVENT', 'document', daily_windows,
+             lambda n: '  **' + 'a:' * (n // 2),
+             lambda text: list(iter_events(text))),
+        Case('DD_PRACTICE_HEADER', 'line', heading_texts,
+             lambda n: '**1\\. ' + ' ' * n,
+             per_line(matches(DD_PRACTICE_HEADER, 'match'))),
+        Case('DD_PRACTICE_ID_TITLE', 'line', practice_headers,
+             lambda n: '#### **1\\. ' + 'a' * n,
+             per_line(matches(DD_PRACTICE_ID_TITLE))),
+        Case('DD_SECTION_HEADER', 'line', heading_texts,
+             lambda n: '**' + 'a*' * (n // 2),
+             per_line(matches(DD_SECTION_HEADER, 'match'))),
+        Case('NR_PRACTICE_HEADER', 'line', practice_titles,
+             lambda n: 'Practice' + ' ' * n,
+             per_line(matches(NR_PRACTICE_HEADER, 'match'))),
+        Case('NR_PRACTICE_TITLE', 'line', practice_titles,
+             lambda n: '####' + ' ' * n + 'Practice 1:',
+             per_line(matches(NR_PRACTICE_TITLE, 'match'))),
+        Case('NR practice fields', 'section', practices,
+             lambda n: '**Why This Rewires the Pattern**: ' + 'word ' * (n // 5),
+             practice_fields),
+        Case('RP_KB_FILE', 'line', kb_files,
+             lambda n: 'mio-kb-' * (n // 7),
+             per_line(matches(RP_KB_FILE))),
+        Case('RP_CLINICAL_FRAMING', 'chunk', chunks,
+             lambda n: '**Internal (Clinical)**: "' + 'a' * n,
+             matches(RP_CLINICAL_FRAMING)),
+        Case('RP_USER_FRAMING', 'chunk', chunks,
+             lambda n: '**External (User-facing)**: "' + 'a' * n,
+             matches(RP_USER_FRAMING)),
+    ]
+
+
+def growth_inputs(case: Case, rng: random.Random) -> List[tuple]:
+    """(label, builder of an input with n adversarial characters) for every input family"""
+    sample = rng.choice([s for s in case.samples if len(s) > 1] or ['x'])
+    head = sample[:rng.randrange(1, len(sample))]
+    if case.scope == 'line':
+        head = head.replace('\n', ' ')
+    return [
+        ('adversarial', case.adversarial),
+        ('truncated + spaces', lambda n: head + ' ' * n),
+        ('truncated + digits', lambda n: head + '1' * n),
+        ('truncated, repeated', lambda n: (head * (n // len(head) + 1))[:n]),
+    ]
+
+
+def mutate(text: str, rng: random.Random) -> str:
+    """One to three cuts, deletions, duplications or delimiter insertions"""
+    for _ in range(rng.randint(1, 3)):
+        i = rng.randrange(len(text) + 1)
+        j = rng.randrange(i, min(len(text), i + 40) + 1)
+        op = rng.randrange(4)
+        if op == 0:
+            text = text[:i]
+        elif op == 1:
+            text = text[:i] + text[j:]
+        elif op == 2:
+            text = text[:j] + text[i:j] * rng.randint(1, 4) + text[j:]
+        else:
+            insert = ''.join(rng.choice(FUZZ_ALPHABET) for _ in range(rng.randint(1, 3)))
+            text = text[:i] + insert * rng.randint(1, 8) + text[i:]
+    return text
+
+
+# ============================================================================
+# Benchmark
+# ============================================================================
+
+def best_time(func, text, repeat):
+    """Best-of-N seconds per call, looping fast calls until a run takes 2 ms"""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func(text)
+        elapsed = time.perf_counter() - start
+        if elapsed >= 0.002:
+            break
+        number *= 10
+
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func(text)
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def growth(func, build, sizes, repeat, time_limit):
+    """(exponent, seconds per call at the largest size reached) up the ladder"""
+    points = []
+    for n in sizes:
+        seconds = best_time(func, build(n), repeat)
+        points.append((n, seconds))
+        if seconds > time_limit:
+            break
+
+    # Sizes are the adversarial part alone: a truncated input's fixed head
+    # would flatten the size ratio and overstate the exponent
+    (first_size, first_time), (last_size, last_time) = points[0], points[-1]
+    if len(points) < 2:
+        return 0.0, last_time
+    return math.log(last_time / first_time) / math.log(last_size / first_size), last_time
+
+
+def worst_growth(func, inputs, sizes, repeat, time_limit):
+    """(exponent, seconds, label) of the input with the steepest growth"""
+    worst = None
+    for label, build in inputs:
+        exponent, seconds = growth(func, build, sizes, repeat, time_limit)
+        if worst is None or exponent > worst[0]:
+            worst = (exponent, seconds, label)
+    return worst
+
+
+def fuzz_mismatch(case: Case, count: int, rng: random.Random) -> Optional[str]:
+    """First fuzzed input the current and legacy call sites disagree on"""
+    inputs = case.samples + [mutate(rng.choice(case.samples), rng) for _ in range(count)]
+    for text in inputs:
+        if case.current(text) != case.legacy(text):
+            return text
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fuzz parser regexes for catastrophic backtracking')
+    parser.add_argument('--min-size', type=int, default=256, help='Smallest input (default: 256 chars)')
+    parser.add_argument('--max-size', type=int, default=8192, help='Largest input (default: 8192 chars)')
+    parser.add_argument('--time-limit', type=float, default=0.25,
+                        help='Stop growing an input once a call takes this long (default: 0.25 s)')
+    parser.add_argument('--max-exponent', type=float, default=1.5,
+                        help='Highest allowed growth exponent (default: 1.5; 1 = linear, 2 = quadratic)')
+    parser.add_argument('--fuzz', type=int, default=3000,
+                        help='Mutated inputs per rewritten pattern for the equivalence check (default: 3000)')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing repetitions (default: 3)')
+    parser.add_argument('--seed', type=int, default=0, help='Fuzzer seed (default: 0)')
+    args = parser.parse_args()
+
+    sizes = []
+    size = args.min_size
+    while size <= args.max_size:
+        sizes.append(size)
+        size *= 2
+
+    print("=" * 104)
+    print("Regex Backtracking Benchmark")
+    print("=" * 104)
+    print(f"Sizes {sizes[0]:,}..{sizes[-1]:,} chars, growth exponent limit {args.max_exponent:g}")
+    print()
+    print(f"{'Pattern':<26} {'Scope':<9} {'Legacy exp':>10} {'Now exp':>8} {'Now µs':>10}  "
+          f"{'Worst input':<20} {'Fuzzed':>7}")
+
+    failures = []
+    for case in load_cases():
+        rng = random.Random(f"{args.seed}:{case.name}")
+        inputs = growth_inputs(case, rng)
+
+        exponent, seconds, label = worst_growth(case.current, inputs, sizes, args.repeat, args.time_limit)
+        legacy_column = fuzzed_column = "-"
+        if case.legacy is not None:
+            legacy_exponent, _, _ = worst_growth(case.legacy, inputs, sizes, args.repeat, args.time_limit)
+            legacy_column = f"{legacy_exponent:.2f}"
+            mismatch = fuzz_mismatch(case, args.fuzz, rng)
+            fuzzed_column = "✗" if mismatch is not None else f"{len(case.samples) + args.fuzz:,}"
+            if mismatch is not None:
+                failures.append(f"{case.name}: current and legacy results differ for {mismatch[:80]!r}")
+
+        status = "✗" if exponent > args.max_exponent else "✓"
+        if exponent > args.max_exponent:
+            failures.append(f"{case.name}: grows with exponent {exponent:.2f} on {label} input")
+        print(f"{case.name:<26} {case.scope:<9} {legacy_column:>10} {exponent:8.2f} {seconds * 1e6:10.1f}  "
+              f"{label:<20} {fuzzed_column:>7} {status}")
+
+    print()
+    if failures:
+        print(f"✗ {len(failures)} FAILURE{'S' if len(failures) > 1 else ''}:")
+        for failure in failures:
+            print(f"   ✗ {failure}")
+        sys.exit(1)
+
+    print("✓ Every pattern is linear at its call site; rewritten patterns match their old results")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Regex Registry Benchmark - MIO Protocol Parsing System
+Micro-benchmarks each pattern family in parsers/regex_registry.py against
+the inline re.search/re.match calls it replaced
+
+Inputs come from the staging files: research lines, Daily Deductible time
+strings and practice headers, Neural Rewiring practice headers, KB file
+names and research chunks. Every family checks that both versions return
+the same result for every input before timing them.
+
+Usage:
+    python3 benchmarks/bench_regex_registry.py
+    python3 benchmarks/bench_regex_registry.py --repeat 20
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR / 'parsers'))
+
+from markdown_events import MARKER, iter_events  # noqa: E402
+from parse_daily_deductible import DailyDeductibleParser  # noqa: E402
+from parse_research_protocols import ResearchProtocolParser  # noqa: E402
+from regex_registry import (  # noqa: E402
+    DD_PRACTICE_ID_TITLE,
+    NR_PRACTICE_TITLE,
+    RP_CLINICAL_FRAMING,
+    RP_KB_FILE,
+    RP_NUMBERED_STEP,
+    RP_TIME_COMMITMENT,
+    RP_USER_FRAMING,
+)
+
+STAGING_DIR = BASE_DIR / 'staging'
+
+
+# ============================================================================
+# Inline versions, as the parsers had them
+# ============================================================================
+
+def legacy_marker_lines(content):
+    """ResearchProtocolParser.parse_file's five re.match calls per line"""
+    offsets = []
+    offset = 0
+    for line in content.split('\n'):
+        if (re.match(r'^PRACTICE\s+\d+:', line) or
+                re.match(r'^TOOL\s+\d+:', line) or
+                re.match(r'^AVATAR\s+\d+:', line) or
+                re.match(r'^EMERGENCY TOOL\s+\d+:', line) or
+                re.match(r'^===\s+[A-Z]', line)):
+            offsets.append(offset)
+        offset += len(line) + 1
+    return offsets
+
+
+def legacy_parse_time(time_str):
+    if not time_str or "varies" in time_str.lower() or "throughout" in time_str.lower():
+        return None, None
+    range_match = re.search(r'(\d+)\s*-\s*(\d+)\s*min', time_str, re.IGNORECASE)
+    if range_match:
+        return int(range_match.group(1)), int(range_match.group(2))
+    single_match = re.search(r'(\d+)\s*min', time_str, re.IGNORECASE)
+    if single_match:
+        return int(single_match.group(1)), int(single_match.group(1))
+    hour_range_match = re.search(r'(\d+)\s*-\s*(\d+)\s*hour', time_str, re.IGNORECASE)
+    if hour_range_match:
+        return int(hour_range_match.group(1)) * 60, int(hour_range_match.group(2)) * 60
+    hour_match = re.search(r'(\d+)\s*hour', time_str, re.IGNORECASE)
+    if hour_match:
+        return int(hour_match.group(1)) * 60, int(hour_match.group(1)) * 60
+    return None, None
+
+
+def legacy_practice_header(header):
+    id_match = re.search(r'####\s+\*\*(\d+)\\?\.\s+(.+?)\*\*', header)
+    title_match = re.search(r'####\s+\*\*\d+\\?\.\s+(.+?)\*\*', header)
+    return (int(id_match.group(1)) if id_match else None,
+            title_match.group(1).strip() if title_match else None)
+
+
+def legacy_practice_title(line):
+    practice_match = re.match(r'####\s*Practice\s+(\d+):\s*(.+)', line)
+    emergency_match = re.match(r'####\s*Emergency Protocol:\s*(.+)', line)
+    if practice_match:
+        return int(practice_match.group(1)), practice_match.group(2).strip(), False
+    if emergency_match:
+        return None, emergency_match.group(1).strip(), True
+    return None, "", False
+
+
+def legacy_kb_file(filename):
+    number = re.search(r'mio-kb-(\d+)', filename)
+    prefix = re.search(r'(mio-kb-\d+)', filename)
+    return (int(number.group(1)) if number else None, prefix.group(1) if prefix else None)
+
+
+def legacy_chunk_metadata(text):
+    times = re.findall(r'(\d+)(?:-(\d+))?\s*(?:min|minute)', text.lower())
+    steps = len(re.findall(r'\n\s*\d+\.', text))
+    clinical = re.search(r'\*\*Internal\s*\(Clinical\)\*\*:\s*["\']([^"\']+)["\']', text)
+    user = re.search(r'\*\*External\s*\(User-facing\)\*\*:\s*["\']([^"\']+)["\']', text)
+    return times, steps, clinical and clinical.group(1), user and user.group(1)
+
+
+# ============================================================================
+# Registry versions
+# ============================================================================
+
+def registry_marker_lines(content):
+    return [event.start for event in iter_events(content, kinds=(MARKER,))]
+
+
+def registry_practice_header(header):
+    match = DD_PRACTICE_ID_TITLE.search(header)
+    return (int(match.group('id')), match.group('title').strip()) if match else (None, None)
+
+
+def registry_practice_title(line):
+    match = NR_PRACTICE_TITLE.match(line)
+    if not match:
+        return None, "", False
+    is_emergency = match.group('emergency') is not None
+    return (None if is_emergency else int(match.group('number'))), match.group('name').strip(), is_emergency
+
+
+def registry_kb_file(filename):
+    match = RP_KB_FILE.search(filename)
+    return (int(match.group('number')), match.group('prefix')) if match else (None, None)
+
+
+def registry_chunk_metadata(text):
+    times = RP_TIME_COMMITMENT.findall(text.lower())
+    steps = len(RP_NUMBERED_STEP.findall(text))
+    clinical = RP_CLINICAL_FRAMING.search(text)
+    user = RP_USER_FRAMING.search(text)
+    return times, steps, clinical and clinical.group(1), user and user.group(1)
+
+
+# ============================================================================
+# Benchmark
+# ============================================================================
+
+def best_time(func, inputs, repeat):
+    """Best-of-N seconds for func over every input"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for value in inputs:
+            func(value)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def load_families():
+    """(family, inputs, legacy function, registry function)"""
+    research = (STAGING_DIR / 'research-protocols-combined.md').read_text(encoding='utf-8')
+    daily = (STAGING_DIR / 'daily-deductible-normalized.md').read_text(encoding='utf-8')
+    neural = (STAGING_DIR / 'neural-rewiring-normalized.txt').read_text(encoding='utf-8')
+
+    time_strings = re.findall(r'\*\*Time:\*\*\s*([^*]+?)\s*\*\*', daily)
+    practice_headers = [line for line in daily.split('\n') if line.startswith('#### **')]
+    practice_titles = [line for line in neural.split('\n') if line.startswith('#### ')]
+    kb_files = re.findall(r'# SOURCE FILE:\s*(.+)', research)
+    chunks = [p['chunk_text'] for p in ResearchProtocolParser().parse_file(research)]
+
+    return [
+        ('Research chunk markers', [research], legacy_marker_lines, registry_marker_lines),
+        ('Daily Deductible durations', time_strings, legacy_parse_time, DailyDeductibleParser().parse_time),
+        ('Daily Deductible headers', practice_headers, legacy_practice_header, registry_practice_header),
+        ('Neural Rewiring practice titles', practice_titles, legacy_practice_title, registry_practice_title),
+        ('Research KB file names', kb_files, legacy_kb_file, registry_kb_file),
+        ('Research chunk metadata', chunks, legacy_chunk_metadata, registry_chunk_metadata),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the precompiled regex registry')
+    parser.add_argument('--repeat', type=int, default=10, help='Timing repetitions (default: 10)')
+    args = parser.parse_args()
+
+    print("=" * 84)
+    print("Regex Registry Benchmark")
+    print("=" * 84)
+    print(f"{'Family':<34} {'Inputs':>7} {'Inline µs':>11} {'Registry µs':>12} {'Speedup':>9}")
+
+    for family, inputs, legacy, registry in load_families():
+        for value in inputs:
+            if legacy(value) != registry(value):
+                print(f"✗ {family}: results differ for {value[:60]!r}")
+                sys.exit(1)
+
+        legacy_time = best_time(legacy, inputs, args.repeat)
+        registry_time = best_time(registry, inputs, args.repeat)
+
+        print(f"{family:<34} {len(inputs):>7} {legacy_time / len(inputs) * 1e6:11.2f} "
+              f"{registry_time / len(inputs) * 1e6:12.2f} {legacy_time / registry_time:8.2f}x")
+
+    print()
+    print("✓ Identical results for every family (µs per input)")
+
+
+if __name__ == '__main__':
+    main()
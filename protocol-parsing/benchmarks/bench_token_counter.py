@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Token Counter Benchmark - MIO Protocol Parsing System
+Throughput and accuracy of parsers/token_counter.py against the len // 4
+character estimate it replaced
+
+Counts the chunk_text of every parsed protocol (staging/, or a synthetic
+corpus with --scale) with:
+    chars/4        len(text) // 4
+    python cold    pure-Python BPE, empty caches
+    python warm    the same counter again (text-digest cache hits)
+    tiktoken       tiktoken on the bundled ranks, if installed
+and reports chunks/s and MB/s for each, plus how far the estimate is from
+the real count (per-chunk error and chunks the estimate puts on the wrong
+side of the chunker's budget). Fails if tiktoken is installed and its
+counts differ from the pure-Python counts.
+
+Usage:
+    python3 benchmarks/bench_token_counter.py
+    python3 benchmarks/bench_token_counter.py --scale 20
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from parse_targets import PARSE_TARGETS, STAGING_DIR  # noqa: E402
+from synthetic_corpus import write_corpus  # noqa: E402
+from token_chunker import CHUNK_TOKEN_BUDGET  # noqa: E402
+from token_counter import TokenCounter, tiktoken  # noqa: E402
+
+
+def chunk_texts(staging_dir: Path) -> list:
+    texts = []
+    for name, target in PARSE_TARGETS.items():
+        texts.extend(protocol['chunk_text'] for protocol in target.parse(staging_dir / name))
+    return texts
+
+
+def timed(count, texts: list) -> tuple:
+    """(counts, seconds)"""
+    start = time.perf_counter()
+    counts = [count(text) for text in texts]
+    return counts, time.perf_counter() - start
+
+
+def report(label: str, seconds: float, texts: list, megabytes: float) -> None:
+    print(f"{label:<14} {seconds * 1000:10.1f} {len(texts) / seconds:12,.0f} {megabytes / seconds:8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the offline token counter')
+    parser.add_argument('--scale', type=int, help='Count a synthetic corpus of this scale instead of staging/')
+    args = parser.parse_args()
+
+    if args.scale:
+        with tempfile.TemporaryDirectory(prefix='mio-tokens-') as tmp:
+            write_corpus(Path(tmp), args.scale)
+            texts = chunk_texts(Path(tmp))
+        corpus = f"synthetic {args.scale}x"
+    else:
+        texts = chunk_texts(STAGING_DIR)
+        corpus = "staging"
+    megabytes = sum(len(text.encode('utf-8')) for text in texts) / 1024 / 1024
+
+    print("=" * 70)
+    print(f"Token Counter Benchmark - {corpus}: {len(texts):,} chunks, {megabytes:.2f} MB")
+    print("=" * 70)
+
+    start = time.perf_counter()
+    counter = TokenCounter(use_tiktoken=False)
+    print(f"Rank file load: {(time.perf_counter() - start) * 1000:.1f} ms")
+    print()
+    print(f"{'Counter':<14} {'Total ms':>10} {'Chunks/s':>12} {'MB/s':>8}")
+
+    estimates, seconds = timed(lambda text: len(text) // 4, texts)
+    report('chars/4', seconds, texts, megabytes)
+
+    counts, seconds = timed(counter.count, texts)
+    report('python cold', seconds, texts, megabytes)
+
+    _, seconds = timed(counter.count, texts)
+    report('python warm', seconds, texts, megabytes)
+
+    mismatches = 0
+    if tiktoken is not None:
+        fast = TokenCounter()
+        tiktoken_counts, seconds = timed(fast.count_uncached, texts)
+        report('tiktoken', seconds, texts, megabytes)
+        mismatches = sum(a != b for a, b in zip(counts, tiktoken_counts))
+    else:
+        print(f"{'tiktoken':<14} {'not installed':>10}")
+
+    errors = sorted(abs(estimate - count) / count for estimate, count in zip(estimates, counts) if count)
+    wrong_side = sum((estimate > CHUNK_TOKEN_BUDGET) != (count > CHUNK_TOKEN_BUDGET)
+                     for estimate, count in zip(estimates, counts))
+
+    print()
+    print(f"Tokens (BPE):         {sum(counts):,}")
+    print(f"Tokens (chars/4):     {sum(estimates):,} ({sum(estimates) / sum(counts) - 1:+.1%})")
+    print(f"Chars/4 error:        median {errors[len(errors) // 2]:.1%}, "
+          f"p95 {errors[int(len(errors) * 0.95)]:.1%}, max {errors[-1]:.1%}")
+    print(f"Wrong side of the {CHUNK_TOKEN_BUDGET}-token budget: {wrong_side} chunks")
+    print(f"Cache: {counter.hits:,} hits, {counter.misses:,} misses")
+
+    print()
+    if mismatches:
+        print(f"✗ tiktoken and the pure-Python counter differ on {mismatches} chunks")
+        sys.exit(1)
+    print("✓ Token counts agree" if tiktoken is not None else "✓ Done (install tiktoken to cross-check counts)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Stub Embedding Server - MIO Protocol Parsing System
+A local stand-in for the OpenAI embeddings endpoint, for exercising the
+embedding driver (async_embeddings.py) without an API key or spend
+
+POST /v1/embeddings takes the OpenAI request body and answers in the
+OpenAI response format. Each embedding is derived from the SHA-256 of its
+text, so the same text always gets the same vector and callers can check
+results came back in order, and usage.total_tokens is the cl100k_base
+count (token_counter.py), as the API bills it. Every response is delayed by --latency-ms
+(plus up to --jitter-ms), and a --rate-limit-fraction of requests get a
+429 with a Retry-After header and an OpenAI-style error body instead.
+
+Point the openai client at it with OPENAI_BASE_URL:
+    python3 benchmarks/stub_embedding_server.py --port 8765 --rate-limit-fraction 0.1
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=stub python3 generate_embeddings.py --no-cache
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import struct
+import threading
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+PARSERS_DIR = Path(__file__).resolve().parent.parent / 'parsers'
+if str(PARSERS_DIR) not in sys.path:
+    sys.path.insert(0, str(PARSERS_DIR))
+
+from token_counter import count_tokens  # noqa: E402
+
+
+def stub_embedding(text: str, dimensions: int) -> List[float]:
+    """Deterministic unit-scale vector for text"""
+    values = []
+    counter = 0
+    while len(values) < dimensions:
+        digest = hashlib.sha256(f"{counter}:{text}".encode('utf-8')).digest()
+        values.extend(value / 2 ** 32 - 0.5 for value in struct.unpack('<8I', digest))
+        counter += 1
+    return values[:dimensions]
+
+
+class StubEmbeddingServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], latency: float = 0.2, jitter: float = 0.05,
+                 rate_limit_fraction: float = 0.0, retry_after: float = 1.0, seed: int = 0):
+        super().__init__(address, StubEmbeddingHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit_fraction = rate_limit_fraction
+        self.retry_after = retry_after
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.rate_limited = 0
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def next_request(self) -> Tuple[float, bool]:
+        """(delay, whether to answer 429) for the next request"""
+        with self.lock:
+            self.requests += 1
+            limited = self.rng.random() < self.rate_limit_fraction
+            self.rate_limited += limited
+            return self.latency + self.rng.uniform(0, self.jitter), limited
+
+    def start(self) -> threading.Thread:
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+
+class StubEmbeddingHandler(BaseHTTPRequestHandler):
+    server: StubEmbeddingServer
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        if self.path.rstrip('/') not in ('/v1/embeddings', '/embeddings'):
+            self.reply(404, {'error': {'message': f"Unknown path {self.path}", 'type': 'invalid_request_error'}})
+            return
+
+        delay, limited = self.server.next_request()
+        time.sleep(delay)
+        if limited:
+            self.reply(429, {'error': {'message': 'Rate limit reached (stub)', 'type': 'requests',
+                                       'code': 'rate_limit_exceeded'}},
+                       {'Retry-After': f"{self.server.retry_after:g}"})
+            return
+
+        texts = body.get('input', [])
+        if isinstance(texts, str):
+            texts = [texts]
+        dimensions = body.get('dimensions', 1536)
+        tokens = sum(count_tokens(text) for text in texts)
+        self.reply(200, {
+            'object': 'list',
+            'data': [{'object': 'embedding', 'index': i, 'embedding': stub_embedding(text, dimensions)}
+                     for i, text in enumerate(texts)],
+            'model': body.get('model', ''),
+            'usage': {'prompt_tokens': tokens, 'total_tokens': tokens},
+        })
+
+    def reply(self, status: int, payload: dict, headers: Optional[dict] = None) -> None:
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve stub OpenAI embeddings locally')
+    parser.add_argument('--port', type=int, default=8765, help='Port (default: 8765)')
+    parser.add_argument('--latency-ms', type=float, default=200, help='Delay per request (default: 200)')
+    parser.add_argument('--jitter-ms', type=float, default=50, help='Extra random delay, up to (default: 50)')
+    parser.add_argument('--rate-limit-fraction', type=float, default=0.0,
+                        help='Fraction of requests answered with 429 (default: 0)')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='Retry-After seconds on 429s (default: 1)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for jitter and 429s (default: 0)')
+    args = parser.parse_args()
+
+    server = StubEmbeddingServer(('127.0.0.1', args.port), args.latency_ms / 1000, args.jitter_ms / 1000,
+                                 args.rate_limit_fraction, args.retry_after, args.seed)
+    print(f"Stub embeddings at {server.url} (Ctrl-C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"\n{server.requests} requests, {server.rate_limited} answered 429")
+
+
+if __name__ == '__main__':
+    main()
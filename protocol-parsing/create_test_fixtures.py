@@ -10,6 +10,55 @@ from pathlib import Path
 STAGING_DIR = Path(__file__).parent / 'staging'
 FIXTURES_DIR = Path(__file__).parent / 'fixtures'
 
+# Practice headers - note the escaped period: #### **1\. Practice Name**
+ESCAPED_PRACTICE_HEADER = re.compile(r'####\s+\*\*\d+\\')
+ESCAPED_PRACTICE_END = re.compile(r'####\s+\*\*\d+\\.|---', re.DOTALL)
+# Alternative without escaped period: #### **1. Practice Name**
+PRACTICE_HEADER = re.compile(r'####\s+\*\*\d+\.(\s+)')
+PRACTICE_END = re.compile(r'####\s+\*\*\d+\.|---')
+
+
+def block_end(content: str, end_pattern: re.Pattern, position: int) -> int:
+    """Start of the next practice header or '---' from position, else the end"""
+    match = end_pattern.search(content, position)
+    return match.start() if match else len(content)
+
+
+def find_practices(content: str) -> list:
+    r"""
+    Practice blocks: "#### **<number>\. <title>**" through the next practice
+    header or '---' after the title, or the end. Blocks are found with
+    forward searches only, so a header missing its closing ** costs one
+    scan instead of a lazy DOTALL span retried from every offset.
+
+    With escaped periods the original pattern's greedy `\\.+` ran its only
+    block from the first header to the last ** in the file (then on to the
+    next header, '---' or the end); fixtures/test-daily-deductible.md was
+    cut that way, so it still is.
+    """
+    header = ESCAPED_PRACTICE_HEADER.search(content)
+    last_bold = content.rfind('**')
+    if header and last_bold >= header.end() + 2:
+        return [content[header.start():block_end(content, ESCAPED_PRACTICE_END, last_bold + 2)]]
+
+    # Try alternative pattern without escaped period
+    practices = []
+    position = 0
+    while True:
+        header = PRACTICE_HEADER.search(content, position)
+        if not header:
+            break
+        # A title of at least one character, else one made of whitespace
+        title_end = content.find('**', header.end() + 1)
+        if title_end == -1 and len(header.group(1)) > 1 and content.startswith('**', header.end()):
+            title_end = header.end()
+        if title_end == -1:
+            break
+        position = block_end(content, PRACTICE_END, title_end + 2)
+        practices.append(content[header.start():position])
+    return practices
+
+
 def extract_daily_deductible_fixtures():
     """Extract first 5 practices from Daily Deductible"""
     source = STAGING_DIR / 'daily-deductible-normalized.md'
@@ -18,15 +67,7 @@ def extract_daily_deductible_fixtures():
     with open(source, 'r', encoding='utf-8') as f:
         content = f.read()
 
-    # Split by practice headers - note the escaped period: #### **1\. Practice Name**
-    # The pattern matches: #### **<number>\. <title>** through the next #### or end
-    practice_pattern = r'(####\s+\*\*\d+\\.+.+?\*\*.*?)(?=####\s+\*\*\d+\\.|---|\Z)'
-    practices = re.findall(practice_pattern, content, re.DOTALL)
-
-    if not practices:
-        # Try alternative pattern without escaped period
-        practice_pattern = r'(####\s+\*\*\d+\.\s+.+?\*\*.*?)(?=####\s+\*\*\d+\.|---|\Z)'
-        practices = re.findall(practice_pattern, content, re.DOTALL)
+    practices = find_practices(content)
 
     # Take first 5 practices
     test_content = "## Daily Deductible Library - Test Fixtures (First 5 Practices)\n\n"
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+MIO Protocol Parser - Embedding Cache
+Content-addressed, on-disk cache of embeddings, so a run only sends the
+API the texts it has not embedded before.
+
+Entries live in one SQLite file (output/embedding-cache.sqlite3), keyed by
+the SHA-256 of the model, the dimensions and the exact embedding text
+(generate_embeddings.prepare_embedding_text), so an edited protocol, a
+changed prompt header or another model is a miss and never a stale hit.
+Vectors are stored as little-endian float32 blobs (6 KB for 1536
+dimensions), the precision Protocol records keep them in.
+
+The file is opened in WAL mode with a busy timeout, so parallel shard runs
+can share it. Each entry records when it was last used and how often, in
+a small usage table next to the vectors (an embeddings row's last_used and
+hits are as stored), so a hit rewrites a few bytes, not the 6 KB vector
+row. Entries no run needs any more are removed with `evict` (by age) or
+`generate_embeddings.py --prune-cache` (everything the current inputs do
+not produce), and `compact` returns the freed pages to the filesystem.
+
+Usage:
+    cache = EmbeddingCache(CACHE_FILE, EMBEDDING_MODEL, EMBEDDING_DIMENSIONS)
+    vectors = cache.get_many(texts)          # None for each miss
+    cache.put_many(missed_texts, embeddings)
+
+    python3 embedding_cache.py stats
+    python3 embedding_cache.py evict --unused-days 30
+    python3 embedding_cache.py compact
+"""
+
+import argparse
+import hashlib
+import sqlite3
+import sys
+import time
+from array import array
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence
+
+CACHE_FILE = Path(__file__).parent / 'output' / 'embedding-cache.sqlite3'
+
+# Keys per SELECT ... IN (...), well under SQLite's variable limit
+LOOKUP_BATCH_SIZE = 500
+BUSY_TIMEOUT_SECONDS = 30
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    key         TEXT PRIMARY KEY,
+    model       TEXT NOT NULL,
+    dimensions  INTEGER NOT NULL,
+    vector      BLOB NOT NULL,
+    created_at  REAL NOT NULL,
+    last_used   REAL NOT NULL,
+    hits        INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS usage (
+    key         TEXT PRIMARY KEY,
+    last_used   REAL NOT NULL,
+    hits        INTEGER NOT NULL
+)
+"""
+
+# When an entry was last used: its usage row once a run has hit it, else when it was stored
+LAST_USED = "COALESCE((SELECT last_used FROM usage WHERE usage.key = embeddings.key), embeddings.last_used)"
+
+
+def cache_key(text: str, model: str, dimensions: int) -> str:
+    """SHA-256 (hex) of model, dimensions and text"""
+    digest = hashlib.sha256(f"{model}\n{dimensions}\n".encode('utf-8'))
+    digest.update(text.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def pack_vector(values: Iterable[float]) -> bytes:
+    vector = array('f', values)
+    if sys.byteorder == 'big':
+        vector.byteswap()
+    return vector.tobytes()
+
+
+def unpack_vector(blob: bytes) -> array:
+    vector = array('f')
+    vector.frombytes(blob)
+    if sys.byteorder == 'big':
+        vector.byteswap()
+    return vector
+
+
+class EmbeddingCache:
+    """Embeddings of one model and dimension count, looked up by text"""
+
+    def __init__(self, path: Path = CACHE_FILE, model: str = '', dimensions: int = 0):
+        self.path = Path(path)
+        self.model = model
+        self.dimensions = dimensions
+        self.hits = 0
+        self.misses = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(self.path), timeout=BUSY_TIMEOUT_SECONDS)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.executescript(SCHEMA)
+        self.connection.commit()
+
+    def key(self, text: str) -> str:
+        return cache_key(text, self.model, self.dimensions)
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[array]]:
+        """The cached vector of each text, None where there is none"""
+        keys = [self.key(text) for text in texts]
+        found = {}
+        for i in range(0, len(keys), LOOKUP_BATCH_SIZE):
+            chunk = keys[i:i + LOOKUP_BATCH_SIZE]
+            rows = self.connection.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})", chunk
+            )
+            for key, blob in rows:
+                vector = unpack_vector(blob)
+                if len(vector) == self.dimensions:
+                    found[key] = vector
+
+        if found:
+            now = time.time()
+            self.connection.executemany(
+                "INSERT INTO usage (key, last_used, hits) VALUES (?, ?, 1)"
+                " ON CONFLICT (key) DO UPDATE SET last_used = excluded.last_used, hits = hits + 1",
+                [(key, now) for key in found]
+            )
+            self.connection.commit()
+
+        vectors = [found.get(key) for key in keys]
+        hits = sum(vector is not None for vector in vectors)
+        self.hits += hits
+        self.misses += len(vectors) - hits
+        return vectors
+
+    def put_many(self, texts: Sequence[str], embeddings: Sequence[Sequence[float]]) -> None:
+        """Store the embedding of each text (one transaction)"""
+        now = time.time()
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO embeddings (key, model, dimensions, vector, created_at, last_used)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            [(self.key(text), self.model, len(embedding), pack_vector(embedding), now, now)
+             for text, embedding in zip(texts, embeddings)]
+        )
+        self.connection.commit()
+
+    def retain(self, texts: Iterable[str]) -> int:
+        """Delete every entry of this model and dimensions except texts'; returns how many"""
+        self.connection.execute("CREATE TEMP TABLE IF NOT EXISTS keep (key TEXT PRIMARY KEY)")
+        self.connection.execute("DELETE FROM keep")
+        self.connection.executemany("INSERT OR IGNORE INTO keep VALUES (?)", ((self.key(text),) for text in texts))
+        deleted = self.connection.execute(
+            "DELETE FROM embeddings WHERE model = ? AND dimensions = ? AND key NOT IN (SELECT key FROM keep)",
+            (self.model, self.dimensions)
+        ).rowcount
+        self.delete_orphan_usage()
+        self.connection.commit()
+        return deleted
+
+    def evict_unused(self, days: float) -> int:
+        """Delete entries no run has used for days; returns how many"""
+        deleted = self.connection.execute(
+            f"DELETE FROM embeddings WHERE {LAST_USED} < ?", (time.time() - days * 86400,)
+        ).rowcount
+        self.delete_orphan_usage()
+        self.connection.commit()
+        return deleted
+
+    def delete_orphan_usage(self) -> None:
+        self.connection.execute("DELETE FROM usage WHERE key NOT IN (SELECT key FROM embeddings)")
+
+    def compact(self) -> None:
+        """Rewrite the file without free pages and fold the WAL back into it"""
+        self.connection.execute('VACUUM')
+        self.connection.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def file_size(self) -> int:
+        """Bytes on disk, WAL included"""
+        return sum(path.stat().st_size for path in (self.path, Path(f"{self.path}-wal")) if path.exists())
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+def print_stats(cache: EmbeddingCache) -> None:
+    rows = cache.connection.execute(
+        "SELECT model, dimensions, COUNT(*), SUM(embeddings.hits + COALESCE(usage.hits, 0)),"
+        " MIN(COALESCE(usage.last_used, embeddings.last_used))"
+        " FROM embeddings LEFT JOIN usage USING (key)"
+        " GROUP BY model, dimensions ORDER BY model, dimensions"
+    ).fetchall()
+
+    print(f"Cache file: {cache.path} ({cache.file_size() / 1024 / 1024:.2f} MB)")
+    if not rows:
+        print("  (empty)")
+    for model, dimensions, entries, hits, oldest in rows:
+        idle_days = (time.time() - oldest) / 86400
+        print(f"  {model} ({dimensions} dims): {entries:,} entries, {hits:,} hits, "
+              f"least recently used {idle_days:.1f} days ago")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect and trim the embedding cache')
+    parser.add_argument('--cache', type=Path, default=CACHE_FILE, help=f'Cache file (default: {CACHE_FILE})')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('stats', help='Entries and hits per model')
+    evict = subparsers.add_parser('evict', help='Delete entries not used recently')
+    evict.add_argument('--unused-days', type=float, required=True, help='Delete entries unused for this many days')
+    subparsers.add_parser('compact', help='Reclaim the space of deleted entries')
+    args = parser.parse_args()
+
+    if not args.cache.exists():
+        print(f"ERROR: No cache at {args.cache}")
+        sys.exit(1)
+
+    cache = EmbeddingCache(args.cache)
+    if args.command == 'stats':
+        print_stats(cache)
+    elif args.command == 'evict':
+        deleted = cache.evict_unused(args.unused_days)
+        print(f"✓ Evicted {deleted:,} entries unused for {args.unused_days:g} days")
+        print("  Run 'compact' to shrink the file")
+    else:
+        before = cache.file_size()
+        cache.compact()
+        print(f"✓ Compacted {before / 1024 / 1024:.2f} MB -> {cache.file_size() / 1024 / 1024:.2f} MB")
+    cache.close()
+
+
+if __name__ == '__main__':
+    main()
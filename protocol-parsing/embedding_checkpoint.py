@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+MIO Protocol Parser - Embedding Checkpoint
+Every embedding the API returns during a generate_embeddings.py run,
+appended to disk as soon as its batch comes back, so a run that dies
+keeps what it has paid for and --resume embeds only the rest.
+
+The checkpoint is JSON Lines next to the output file
+(output/all-protocols-with-embeddings.checkpoint.jsonl), one line per
+protocol, written in the order batches complete:
+    {"chunk_id": ..., "input_key": ..., "embedding": [...]}
+chunk_id is the protocol's identity (parsers/chunk_identity.py) and
+input_key the embedding cache key of its text (SHA-256 of model,
+dimensions and prepare_embedding_text output), so a protocol edited since
+the checkpoint was written is embedded again instead of restored. Each
+batch is flushed and fsynced before the run moves on; a line cut short by
+a kill is dropped on resume, so at most the batches still in flight are
+lost. The final file is assembled from the restored and new embeddings,
+and the checkpoint is removed once it is saved.
+
+Usage:
+    checkpoint = EmbeddingCheckpoint(path, resume=True)
+    restored = checkpoint.load()                  # {(chunk_id, input_key): embedding}
+    checkpoint.append([(chunk_id, input_key, embedding), ...])
+    checkpoint.remove()
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from protocol_jsonl import drop_partial_line, iter_jsonl
+
+CHECKPOINT_SUFFIX = '.checkpoint.jsonl'
+
+Entry = Tuple[str, str, Sequence[float]]
+
+
+def checkpoint_path(output_file: Path) -> Path:
+    """output/x.json -> output/x.checkpoint.jsonl"""
+    return Path(output_file).with_suffix(CHECKPOINT_SUFFIX)
+
+
+class EmbeddingCheckpoint:
+    """Append-only embedding log for one output file"""
+
+    def __init__(self, path: Path, resume: bool = False):
+        self.path = Path(path)
+        self.written = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if resume and self.path.exists():
+            drop_partial_line(self.path)
+        else:
+            self.path.write_text('', encoding='utf-8')
+
+    def load(self) -> Dict[Tuple[str, str], List[float]]:
+        """{(chunk_id, input_key): embedding} of every complete line (last one wins)"""
+        return {(entry['chunk_id'], entry['input_key']): entry['embedding'] for entry in iter_jsonl(self.path)}
+
+    def append(self, entries: Iterable[Entry]) -> None:
+        """Write one batch's entries and wait until they are on disk"""
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for chunk_id, input_key, embedding in entries:
+                record = {'chunk_id': chunk_id, 'input_key': input_key, 'embedding': list(embedding)}
+                f.write(json.dumps(record) + '\n')
+                self.written += 1
+            f.flush()
+            os.fsync(f.fileno())
+
+    def remove(self) -> None:
+        self.path.unlink(missing_ok=True)
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+MIO Protocol Parser - Embedding Diagnostics
+Validates every protocol's embedding in bulk with NumPy and reports on
+their quality, instead of checking 1536 floats per protocol in Python.
+
+The embeddings are copied once into one float32 matrix (float32 arrays
+and store rows byte for byte, lists converted), then checked and
+measured a matrix at a time:
+    errors      missing, not a vector, wrong dimension, non-numeric
+                (dtype), NaN/inf, or zero (norm < ZERO_NORM, which
+                cosine search cannot rank)
+    warnings    L2 norm more than NORM_TOLERANCE away from 1 (OpenAI
+                embeddings are unit length), and near-duplicates: groups of
+                protocols joined by cosines > NEAR_DUPLICATE_COSINE
+    summaries   the norm distribution, and the cosine distribution over
+                all pairs (over the pairs of SAMPLE_ROWS random rows
+                when there are more)
+
+Near-duplicates are found over all pairs up to EXACT_PAIRS_LIMIT vectors.
+Above that, random-hyperplane LSH is used: LSH_TABLES tables, each
+LSH_BITS sign bits. A cosine-0.999 pair misses every table with
+probability ~1e-5. Rows sharing a bucket are checked exactly against one
+row of each group already in it, so no false positives are reported and
+a bucket of k copies costs k cosines, not k^2/2.
+
+Each near-duplicate is reported once, as (protocol, representative,
+cosine to it): the representative is the lowest protocol of its group.
+Groups are transitive, so a row can sit slightly under the threshold from
+its representative while over it from another row of the group.
+
+NumPy is optional for the pipeline: without it, generate_embeddings.py
+keeps its per-element check and skips these diagnostics.
+
+Usage:
+    diagnostics = diagnose_embeddings(protocols, 1536)
+    print_diagnostics(diagnostics, [chunk_key(p) for p in protocols])
+
+    python3 embedding_diagnostics.py output/all-protocols-with-embeddings.npy
+"""
+
+import argparse
+import sys
+import time
+from array import array
+from pathlib import Path
+from typing import Any, List, NamedTuple, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+NEAR_DUPLICATE_COSINE = 0.999
+ZERO_NORM = 1e-6
+NORM_TOLERANCE = 0.01
+
+EXACT_PAIRS_LIMIT = 2048
+SAMPLE_ROWS = 512
+LSH_TABLES = 8
+LSH_BITS = 20
+# Rows per block of a pairwise similarity product, and LSH candidate pairs
+# checked at a time, to bound their memory
+PAIR_BLOCK = 512
+CANDIDATE_BLOCK = 8192
+
+SHOWN = 10
+
+
+class Distribution(NamedTuple):
+    count: int
+    minimum: float
+    mean: float
+    p05: float
+    p50: float
+    p95: float
+    maximum: float
+
+    @classmethod
+    def of(cls, values: Any) -> Optional['Distribution']:
+        if len(values) == 0:
+            return None
+        p05, p50, p95 = np.percentile(values, [5, 50, 95])
+        return cls(len(values), float(values.min()), float(values.mean()),
+                   float(p05), float(p50), float(p95), float(values.max()))
+
+    def __str__(self) -> str:
+        return (f"min {self.minimum:.4f}, p5 {self.p05:.4f}, median {self.p50:.4f}, "
+                f"mean {self.mean:.4f}, p95 {self.p95:.4f}, max {self.maximum:.4f}")
+
+
+class EmbeddingDiagnostics(NamedTuple):
+    protocols: int
+    errors: List[Tuple[int, str]]                  # (protocol index, problem)
+    off_unit: List[Tuple[int, float]]              # (protocol index, norm)
+    near_duplicates: List[Tuple[int, int, float]]  # (protocol index, representative, cosine to it)
+    norms: Optional[Distribution]
+    similarities: Optional[Distribution]
+    seconds: float
+
+    @property
+    def valid(self) -> bool:
+        return not self.errors
+
+    @property
+    def duplicate_groups(self) -> List[Tuple[int, List[Tuple[int, float]]]]:
+        """(representative, [(protocol index, cosine), ...]) per near-duplicate group, largest first"""
+        groups = {}
+        for i, representative, cosine in self.near_duplicates:
+            groups.setdefault(representative, []).append((i, cosine))
+        return sorted(groups.items(), key=lambda group: (-len(group[1]), group[0]))
+
+
+def embedding_rows(protocols: Sequence[Any], dimensions: int) -> Tuple[Any, List[int], List[Tuple[int, str]]]:
+    """
+    (float32 matrix, protocol index of each row, errors) for the protocols
+    whose embedding is a numeric vector of the right dimension
+    """
+    vectors = []
+    rows = []
+    errors = []
+    for i, protocol in enumerate(protocols):
+        if 'embedding' not in protocol:
+            errors.append((i, "Missing embedding field"))
+            continue
+        embedding = protocol['embedding']
+        if (isinstance(embedding, array) and embedding.typecode == 'f'
+                or isinstance(embedding, memoryview) and embedding.format == 'f'):
+            if len(embedding) == dimensions:
+                # Already float32 bytes: joined below without conversion
+                vectors.append(embedding)
+                rows.append(i)
+            else:
+                errors.append((i, f"Wrong dimension ({len(embedding)} != {dimensions})"))
+            continue
+        if not isinstance(embedding, (list, array, memoryview, np.ndarray)):
+            errors.append((i, f"Embedding is not a list ({type(embedding).__name__})"))
+            continue
+        try:
+            values = np.asarray(embedding)
+        except ValueError:  # Ragged nested lists
+            values = np.asarray(embedding, dtype=object)
+        if values.dtype.kind not in 'fiu':
+            problem = "null/NaN" if any(value is None for value in embedding) else "non-numeric"
+            errors.append((i, f"Contains {problem} values ({values.dtype})"))
+        elif values.ndim != 1 or len(values) != dimensions:
+            errors.append((i, f"Wrong dimension ({'x'.join(map(str, values.shape))} != {dimensions})"))
+        else:
+            vectors.append(np.ascontiguousarray(values, dtype=np.float32))
+            rows.append(i)
+
+    # One copy of every row into a writable buffer
+    matrix = np.frombuffer(bytearray().join(vectors), dtype=np.float32).reshape(len(vectors), dimensions)
+    return matrix, rows, errors
+
+
+def row_cosines(unit: Any, first: Any, second: Any) -> Any:
+    """Cosines of unit-length rows first[k] and second[k], CANDIDATE_BLOCK at a time"""
+    cosines = np.empty(len(first), dtype=np.float32)
+    for start in range(0, len(first), CANDIDATE_BLOCK):
+        block = slice(start, start + CANDIDATE_BLOCK)
+        cosines[block] = np.einsum('ij,ij->i', unit[first[block]], unit[second[block]])
+    return cosines
+
+
+def merge_groups(representative: Any, first: Any, second: Any) -> None:
+    """
+    Join the groups of rows first[k] and second[k] in place; every row's
+    representative stays the lowest row of its group
+    """
+    first, second = representative[first], representative[second]
+    while True:
+        differ = first != second
+        if not differ.any():
+            return
+        first, second = first[differ], second[differ]
+        # Point each higher representative at the lowest one it meets, then
+        # follow the pointers to the end (they only ever go down)
+        target = np.arange(len(representative))
+        np.minimum.at(target, np.maximum(first, second), np.minimum(first, second))
+        while (target[target] != target).any():
+            target = target[target]
+        representative[:] = target[representative]
+        first, second = target[first], target[second]
+
+
+def shared(bucket: Any) -> Any:
+    """Mask of the entries of a sorted array whose value another entry repeats"""
+    same = bucket[1:] == bucket[:-1]
+    return np.r_[same, False] | np.r_[False, same]
+
+
+def near_duplicates(unit: Any, threshold: float = NEAR_DUPLICATE_COSINE,
+                    seed: int = 0) -> List[Tuple[int, int, float]]:
+    """(row, representative row, cosine) for every unit-length row in a near-duplicate group but its lowest"""
+    count = len(unit)
+    representative = np.arange(count)
+
+    if count <= EXACT_PAIRS_LIMIT:
+        for start in range(0, count, PAIR_BLOCK):
+            similarities = unit[start:start + PAIR_BLOCK] @ unit[start:].T
+            # Column c is row start + c: keep c > r, each pair once
+            block_rows, columns = np.nonzero(np.triu(similarities > threshold, k=1))
+            merge_groups(representative, start + block_rows, start + columns)
+    else:
+        planes = np.random.default_rng(seed).standard_normal((unit.shape[1], LSH_TABLES * LSH_BITS))
+        signs = (unit @ planes.astype(np.float32)) > 0
+        weights = 1 << np.arange(LSH_BITS, dtype=np.int64)
+        for table in range(LSH_TABLES):
+            codes = signs[:, table * LSH_BITS:(table + 1) * LSH_BITS] @ weights
+            order = np.argsort(codes, kind='stable')
+            buckets = codes[order]
+            keep = shared(buckets)
+            rows, buckets = order[keep], buckets[keep]
+            while len(rows):
+                # One row per group per bucket: rows already grouped need no check
+                _, firsts = np.unique(buckets * count + representative[rows], return_index=True)
+                firsts.sort()
+                rows, buckets = rows[firsts], buckets[firsts]
+                keep = shared(buckets)
+                rows, buckets = rows[keep], buckets[keep]
+                if not len(rows):
+                    break
+                # Check every row against the first of its bucket; the rows
+                # not close to it try the next first in the following round
+                heads = np.r_[True, buckets[1:] != buckets[:-1]]
+                others = ~heads
+                first = rows[heads][np.cumsum(heads) - 1][others]
+                rows, buckets = rows[others], buckets[others]
+                close = row_cosines(unit, first, rows) > threshold
+                merge_groups(representative, first[close], rows[close])
+                rows, buckets = rows[~close], buckets[~close]
+
+    members = np.flatnonzero(representative != np.arange(count))
+    cosines = row_cosines(unit, members, representative[members])
+    return list(zip(members.tolist(), representative[members].tolist(), cosines.tolist()))
+
+
+def similarity_distribution(unit: Any, seed: int = 0) -> Optional[Distribution]:
+    """Cosines of all pairs of rows, or of all pairs among SAMPLE_ROWS random rows"""
+    if len(unit) > SAMPLE_ROWS:
+        unit = unit[np.sort(np.random.default_rng(seed).choice(len(unit), SAMPLE_ROWS, replace=False))]
+    upper = np.triu_indices(len(unit), k=1)
+    return Distribution.of((unit @ unit.T)[upper])
+
+
+def diagnose_matrix(matrix: Any, rows: Optional[Sequence[int]] = None, protocols: Optional[int] = None,
+                    errors: Optional[List[Tuple[int, str]]] = None, threshold: float = NEAR_DUPLICATE_COSINE,
+                    seed: int = 0, overwrite: bool = False) -> EmbeddingDiagnostics:
+    """
+    Diagnostics for a float32 (rows, dimensions) matrix; rows maps each row
+    to its protocol index. overwrite normalizes the matrix in place instead
+    of in a copy.
+    """
+    start = time.perf_counter()
+    rows = np.arange(len(matrix)) if rows is None else np.asarray(rows, dtype=np.int64)
+    errors = list(errors or [])
+
+    norms = np.sqrt(np.einsum('ij,ij->i', matrix, matrix).astype(np.float64))
+    # NaN and inf carry into the norm: only those rows need an element-wise look
+    finite = np.isfinite(norms)
+    for i in np.flatnonzero(~finite).tolist():
+        overflow = np.isfinite(matrix[i]).all()
+        errors.append((int(rows[i]), "Norm overflows float32" if overflow else "Contains NaN/inf values"))
+    zero = finite & (norms < ZERO_NORM)
+    errors.extend((int(i), f"Zero vector (norm {norm:.2e})") for i, norm in zip(rows[zero], norms[zero]))
+    errors.sort()
+
+    usable = finite & ~zero
+    usable_norms = norms[usable]
+    off = np.abs(usable_norms - 1) > NORM_TOLERANCE
+    off_unit = list(zip(rows[usable][off].tolist(), usable_norms[off].tolist()))
+
+    if usable.all():
+        unit = matrix if overwrite else matrix.copy()
+    else:
+        unit = matrix[usable]
+    unit /= usable_norms[:, None].astype(np.float32)
+    usable_rows = rows[usable]
+    duplicates = [(int(usable_rows[i]), int(usable_rows[j]), cosine)
+                  for i, j, cosine in near_duplicates(unit, threshold, seed)]
+
+    return EmbeddingDiagnostics(
+        protocols=len(matrix) if protocols is None else protocols,
+        errors=errors,
+        off_unit=off_unit,
+        near_duplicates=duplicates,
+        norms=Distribution.of(usable_norms),
+        similarities=similarity_distribution(unit, seed),
+        seconds=time.perf_counter() - start,
+    )
+
+
+def diagnose_embeddings(protocols: Sequence[Any], dimensions: int, threshold: float = NEAR_DUPLICATE_COSINE,
+                        seed: int = 0) -> EmbeddingDiagnostics:
+    """Validate and measure the embeddings of protocols (records or dicts)"""
+    start = time.perf_counter()
+    matrix, rows, errors = embedding_rows(protocols, dimensions)
+    diagnostics = diagnose_matrix(matrix, rows, len(protocols), errors, threshold, seed, overwrite=True)
+    return diagnostics._replace(seconds=time.perf_counter() - start)
+
+
+def print_diagnostics(diagnostics: EmbeddingDiagnostics, names: Optional[Sequence[str]] = None) -> None:
+    """Errors, warnings and distributions; names label protocols (default: their index)"""
+    def name(i: int) -> str:
+        return names[i] if names is not None else f"Protocol {i}"
+
+    if diagnostics.errors:
+        print(f"✗ {len(diagnostics.errors)} invalid embeddings:")
+        for i, problem in diagnostics.errors[:SHOWN]:
+            print(f"  - {name(i)}: {problem}")
+        if len(diagnostics.errors) > SHOWN:
+            print(f"  ... and {len(diagnostics.errors) - SHOWN} more")
+    else:
+        print(f"✓ All {diagnostics.protocols} protocols have valid embeddings "
+              f"({diagnostics.seconds * 1000:.1f} ms)")
+
+    if diagnostics.off_unit:
+        print(f"⚠️  {len(diagnostics.off_unit)} embeddings are not unit length:")
+        for i, norm in diagnostics.off_unit[:SHOWN]:
+            print(f"  - {name(i)}: norm {norm:.4f}")
+    groups = diagnostics.duplicate_groups
+    if groups:
+        print(f"⚠️  {len(diagnostics.near_duplicates)} near-duplicates in {len(groups)} groups "
+              f"(cosine > {NEAR_DUPLICATE_COSINE}):")
+        for representative, members in groups[:SHOWN]:
+            if len(members) == 1:
+                print(f"  - {name(members[0][0])} ~ {name(representative)} ({members[0][1]:.5f})")
+            else:
+                print(f"  - {name(representative)} ~ {len(members)} others, e.g. {name(members[0][0])} "
+                      f"(min {min(cosine for _, cosine in members):.5f})")
+    if len(diagnostics.off_unit) > SHOWN or len(groups) > SHOWN:
+        print(f"  (first {SHOWN} of each shown)")
+
+    if diagnostics.norms is not None:
+        print(f"  L2 norms:  {diagnostics.norms}")
+    if diagnostics.similarities is not None:
+        print(f"  Cosines:   {diagnostics.similarities} ({diagnostics.similarities.count:,} pairs)")
+
+
+def main():
+    from protocol_jsonl import iter_protocol_file
+
+    sys.path.insert(0, str(Path(__file__).parent / 'parsers'))
+    from chunk_identity import chunk_key
+
+    parser = argparse.ArgumentParser(description='Validate embeddings and report norms and near-duplicates')
+    parser.add_argument('file', type=Path, help='Embedded protocols: JSON, JSON Lines or embedding store (.npy)')
+    parser.add_argument('--dimensions', type=int, default=1536, help='Expected dimensions (default: 1536)')
+    parser.add_argument('--threshold', type=float, default=NEAR_DUPLICATE_COSINE,
+                        help=f'Near-duplicate cosine (default: {NEAR_DUPLICATE_COSINE})')
+    args = parser.parse_args()
+
+    if np is None:
+        print("❌ Error: numpy not installed")
+        print("   Install with: pip install numpy")
+        sys.exit(1)
+
+    protocols = list(iter_protocol_file(args.file))
+    names = [chunk_key(protocol) for protocol in protocols]
+    diagnostics = diagnose_embeddings(protocols, args.dimensions, args.threshold)
+    print_diagnostics(diagnostics, names)
+    sys.exit(0 if diagnostics.valid else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+MIO Protocol Parser - Embedding Store
+Embedded protocols as a binary float32 matrix plus a JSON Lines sidecar,
+instead of one JSON file with every embedding spelled out as text.
+
+For output/all-protocols-with-embeddings.json the store is:
+    all-protocols-with-embeddings.npy         float32 matrix, one row per
+                                              protocol (NumPy .npy v1.0,
+                                              little-endian, C order)
+    all-protocols-with-embeddings.meta.jsonl  one protocol per line, its
+                                              embedding replaced by
+                                              "embedding_row": <row index>
+
+Both are written with the stdlib. Readers map the matrix (mmap) and hand
+out each row as a float32 memoryview into the mapping, so loading copies
+no vector data and pages are read only when a row is used; Protocol
+records keep such rows as they are. With NumPy installed, load_matrix()
+gives the whole matrix as a read-only memmap (np.load(mmap_mode='r')).
+
+Protocols come back with the keys, key order and values they were saved
+with, embedding included (as a memoryview; tolist() gives the floats).
+
+Usage:
+    write_store(protocols, Path('output/all-protocols-with-embeddings.json'))
+    for protocol in iter_store(Path('output/all-protocols-with-embeddings.npy')):
+        protocol['embedding']                    # memoryview, format 'f'
+
+    python3 embedding_store.py convert output/all-protocols-with-embeddings.json
+    python3 embedding_store.py info output/all-protocols-with-embeddings.npy
+"""
+
+import argparse
+import ast
+import json
+import mmap
+import struct
+import sys
+from array import array
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+MATRIX_SUFFIX = '.npy'
+META_SUFFIX = '.meta.jsonl'
+
+NPY_MAGIC = b'\x93NUMPY'
+NPY_DESCR = '<f4'
+# Header (magic to newline) length is padded to a multiple of this, as NumPy does
+NPY_ALIGNMENT = 64
+
+ROW_FIELD = 'embedding_row'
+
+
+def store_paths(path: Path) -> Tuple[Path, Path]:
+    """(matrix, metadata) paths for an output path (.json, .jsonl or .npy)"""
+    path = Path(path)
+    if path.suffix == '.jsonl' and path.name.endswith(META_SUFFIX):
+        path = path.with_name(path.name[:-len(META_SUFFIX)])
+    stem = path.with_suffix('')
+    return stem.with_suffix(MATRIX_SUFFIX), stem.with_name(stem.name + META_SUFFIX)
+
+
+def is_store(path: Path) -> bool:
+    return Path(path).suffix == MATRIX_SUFFIX
+
+
+def npy_header(rows: int, columns: int, size: Optional[int] = None) -> bytes:
+    """
+    .npy v1.0 header for a C-order little-endian float32 (rows, columns)
+    matrix, padded to size bytes (default: the next multiple of NPY_ALIGNMENT)
+    """
+    header = f"{{'descr': '{NPY_DESCR}', 'fortran_order': False, 'shape': ({rows}, {columns}), }}"
+    prefix = len(NPY_MAGIC) + 2 + 2
+    if size is None:
+        size = -(-(prefix + len(header) + 1) // NPY_ALIGNMENT) * NPY_ALIGNMENT
+    header = header.ljust(size - prefix - 1) + '\n'
+    return NPY_MAGIC + bytes((1, 0)) + struct.pack('<H', len(header)) + header.encode('latin1')
+
+
+def read_npy_header(data: Any) -> Tuple[int, Tuple[int, int]]:
+    """(data offset, shape) of a float32 .npy matrix, from its first bytes"""
+    if bytes(data[:len(NPY_MAGIC)]) != NPY_MAGIC:
+        raise ValueError('not a .npy file')
+    major = data[len(NPY_MAGIC)]
+    if major == 1:
+        (length,), start = struct.unpack('<H', bytes(data[8:10])), 10
+    elif major in (2, 3):
+        (length,), start = struct.unpack('<I', bytes(data[8:12])), 12
+    else:
+        raise ValueError(f".npy version {major} is not supported")
+
+    header = ast.literal_eval(bytes(data[start:start + length]).decode('latin1'))
+    if header['descr'] != NPY_DESCR or header['fortran_order'] or len(header['shape']) != 2:
+        raise ValueError(f"expected a C-order {NPY_DESCR} matrix, got {header}")
+    return start + length, tuple(header['shape'])
+
+
+class EmbeddingMatrix:
+    """A mapped float32 matrix; row(i) is a memoryview into the mapping, not a copy"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self.mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        offset, (self.rows, self.columns) = read_npy_header(self.mapping)
+
+        values = memoryview(self.mapping)[offset:offset + self.rows * self.columns * 4].cast('f')
+        if sys.byteorder == 'big':
+            # The file is little-endian: swap into a private copy
+            swapped = array('f', values)
+            swapped.byteswap()
+            values = memoryview(swapped)
+        self.values = values
+
+    def row(self, index: int) -> memoryview:
+        if not 0 <= index < self.rows:
+            raise IndexError(f"row {index} of {self.rows}")
+        return self.values[index * self.columns:(index + 1) * self.columns]
+
+    def __len__(self) -> int:
+        return self.rows
+
+
+def load_matrix(path: Path) -> Any:
+    """The whole matrix: a read-only numpy memmap, or an EmbeddingMatrix without NumPy"""
+    path = store_paths(path)[0]
+    if numpy is not None:
+        return numpy.load(path, mmap_mode='r')
+    return EmbeddingMatrix(path)
+
+
+def write_store(protocols: Iterable[Any], path: Path, dimensions: Optional[int] = None) -> Tuple[Path, Path]:
+    """
+    Write protocols (dicts or Protocol records, all with embeddings) as a
+    store next to path; returns (matrix path, metadata path)
+    """
+    matrix_path, meta_path = store_paths(path)
+    matrix_path.parent.mkdir(parents=True, exist_ok=True)
+
+    rows = 0
+    # The row count is known only at the end: reserve room for any shape, fill it in then
+    header_size = len(npy_header(2 ** 63, 2 ** 31))
+    with open(matrix_path, 'wb') as matrix, open(meta_path, 'w', encoding='utf-8') as meta:
+        matrix.write(npy_header(0, 0, header_size))
+        for protocol in protocols:
+            vector = protocol['embedding']
+            if not (isinstance(vector, array) and vector.typecode == 'f'):
+                vector = array('f', vector)
+            if dimensions is None:
+                dimensions = len(vector)
+            if len(vector) != dimensions:
+                raise ValueError(f"protocol {rows}: {len(vector)} dimensions, expected {dimensions}")
+            if sys.byteorder == 'big':
+                vector = array('f', vector)
+                vector.byteswap()
+            matrix.write(vector)
+
+            record = {(ROW_FIELD if key == 'embedding' else key): (rows if key == 'embedding' else protocol[key])
+                      for key in protocol.keys()}
+            meta.write(json.dumps(record, ensure_ascii=False) + '\n')
+            rows += 1
+
+        matrix.seek(0)
+        matrix.write(npy_header(rows, dimensions or 0, header_size))
+
+    return matrix_path, meta_path
+
+
+def count_store(path: Path) -> int:
+    with open(store_paths(path)[0], 'rb') as f:
+        return read_npy_header(f.read(4096))[1][0]
+
+
+def iter_store(path: Path, start: int = 0, stop: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """Protocols [start, stop) of a store, each embedding a memoryview row of the mapped matrix"""
+    matrix_path, meta_path = store_paths(path)
+    matrix = EmbeddingMatrix(matrix_path)
+    with open(meta_path, 'r', encoding='utf-8') as f:
+        for line in islice(f, start, stop):
+            if not line.endswith('\n'):
+                return  # Partial last record
+            record = json.loads(line)
+            yield {('embedding' if key == ROW_FIELD else key): (matrix.row(value) if key == ROW_FIELD else value)
+                   for key, value in record.items()}
+
+
+def store_size(path: Path) -> int:
+    """Bytes of the matrix and metadata files"""
+    return sum(part.stat().st_size for part in store_paths(path))
+
+
+def main():
+    from protocol_jsonl import iter_protocol_file
+
+    parser = argparse.ArgumentParser(description='Convert embedded protocols to and inspect the float32 store')
+    commands = parser.add_subparsers(dest='command', required=True)
+    convert = commands.add_parser('convert', help='Write a store next to a JSON or JSON Lines file')
+    convert.add_argument('files', type=Path, nargs='+')
+    info = commands.add_parser('info', help='Rows, dimensions and sizes of stores')
+    info.add_argument('files', type=Path, nargs='+')
+    args = parser.parse_args()
+
+    for path in args.files:
+        if args.command == 'convert':
+            matrix_path, meta_path = write_store(iter_protocol_file(path), path)
+            print(f"✓ {path.name} ({path.stat().st_size / 1024 / 1024:.2f} MB) → {matrix_path.name} + "
+                  f"{meta_path.name} ({store_size(path) / 1024 / 1024:.2f} MB)")
+        else:
+            matrix = EmbeddingMatrix(store_paths(path)[0])
+            print(f"{path}: {matrix.rows:,} x {matrix.columns} float32, "
+                  f"{store_size(path) / 1024 / 1024:.2f} MB")
+
+
+if __name__ == '__main__':
+    main()
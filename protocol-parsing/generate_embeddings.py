@@ -3,23 +3,103 @@
 OpenAI Embedding Generation for MIO Protocol Library
 Week 2 Day 5 - Vector Embeddings for Semantic Search
 
-Processes 205 parsed protocols from 3 JSON files and generates embeddings.
+Processes 231 parsed protocols from 3 JSON files and generates embeddings.
 Uses text-embedding-3-small model with batch processing.
 
+Inputs are read as JSON Lines when output/*-parsed.jsonl is newer than the
+array file. With --jsonl, protocols are streamed batch by batch and each
+embedded protocol is appended to the output as soon as its batch returns,
+so a run can resume with --start at the output's line count. --shard K/N
+embeds the K-th contiguous slice only, for parallel runs; concatenating
+the shard outputs in order (protocol_jsonl.py to-array) gives the full file.
+
+Protocols are packed into as few requests as the API's per-request limits
+allow (batch_planner.py: 2048 inputs, 300,000 tokens), and each batch's
+predicted token count is logged next to the usage the API reports.
+Batches are sent concurrently (async_embeddings.py): up to --max-in-flight
+requests at once, paced by requests- and tokens-per-minute buckets, with
+429s retried after their Retry-After. Results are used in input order.
+
+Every embedding the API returns is appended to a checkpoint
+(embedding_checkpoint.py) as soon as its batch comes back, keyed by chunk
+identity; if the run dies, --resume restores them and embeds only the
+rest, and the output is assembled from both. With --jsonl, --resume
+continues after the output's last complete line.
+
+Embeddings are cached on disk (embedding_cache.py), keyed by the exact
+embedding text, model and dimensions: only texts the cache has not seen
+go to the API, and a run with nothing new needs no API key. --no-cache
+bypasses the cache; --prune-cache drops entries the current inputs no
+longer produce.
+
+Protocols are held as protocol_record.Protocol records from load to save:
+each embedding is stored in place as a float32 array instead of copying
+the protocol dict, and records become plain dicts only when written.
+With NumPy installed, embeddings are validated in bulk and checked for
+zero, non-unit and near-duplicate vectors (embedding_diagnostics.py).
+
+The output is an embedding store (embedding_store.py): the embeddings as
+one float32 matrix (output/all-protocols-with-embeddings.npy) and the rest
+of each protocol as JSON Lines (.meta.jsonl), under a fifth of the size of
+the JSON file and loaded without parsing floats. --output-format json
+writes the JSON file instead.
+
 Usage:
     python3 generate_embeddings.py
     OPENAI_API_KEY=sk-... python3 generate_embeddings.py
+    python3 generate_embeddings.py --jsonl --shard 2/4
+    python3 generate_embeddings.py --resume
+    python3 generate_embeddings.py --output-format json
+    python3 generate_embeddings.py --jsonl --start 100
+    python3 generate_embeddings.py --prune-cache
 """
 
+import argparse
 import json
 import os
 import sys
-import time
+from array import array
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Iterable, Iterator, Optional
+
+from async_embeddings import (
+    DEFAULT_MAX_IN_FLIGHT,
+    DEFAULT_REQUESTS_PER_MINUTE,
+    DEFAULT_TOKENS_PER_MINUTE,
+    EmbeddingDriver,
+    RateLimiter,
+    openai_create,
+    run_ordered,
+)
+from batch_planner import MAX_INPUTS_PER_REQUEST, MAX_TOKENS_PER_REQUEST, pack_batches
+from embedding_cache import CACHE_FILE, EmbeddingCache, cache_key
+from embedding_checkpoint import EmbeddingCheckpoint, checkpoint_path
+from embedding_diagnostics import diagnose_embeddings, np, print_diagnostics
+from embedding_store import store_size, write_store
+from protocol_jsonl import (
+    count_jsonl,
+    count_records,
+    drop_partial_line,
+    iter_protocol_file,
+    iter_protocol_files,
+    jsonl_path,
+    parse_shard,
+    resolve_input,
+    shard_range,
+    write_jsonl,
+)
+from protocol_record import Protocol, embedding_floats, to_dicts, to_records
+
+PARSERS_DIR = Path(__file__).parent / 'parsers'
+if str(PARSERS_DIR) not in sys.path:
+    sys.path.insert(0, str(PARSERS_DIR))
+
+from chunk_identity import chunk_key  # noqa: E402
+from token_counter import count_tokens  # noqa: E402
 
 try:
-    from openai import OpenAI
+    from openai import AsyncOpenAI
 except ImportError:
     print("ERROR: openai package not installed")
     print("Install with: pip install openai")
@@ -48,40 +128,40 @@ OUTPUT_FILE = OUTPUT_DIR / "all-protocols-with-embeddings.json"
 
 EMBEDDING_MODEL = "text-embedding-3-small"
 EMBEDDING_DIMENSIONS = 1536
-BATCH_SIZE = 100  # OpenAI allows up to 2048 inputs per batch
+CACHE_LOOKUP_SIZE = 100  # Embedding texts looked up in the cache per query
 MAX_TOKENS = 8000  # Use chunk_summary if chunk_text exceeds this
 
 
-def load_protocols() -> List[Dict[str, Any]]:
-    """Load and combine all 3 protocol JSON files."""
+def input_paths() -> List[Path]:
+    """INPUT_FILES, each replaced by its .jsonl twin when that is newer"""
+    paths = [resolve_input(path) for path in INPUT_FILES]
+    for path in paths:
+        if not path.exists():
+            print(f"ERROR: File not found: {path}")
+            sys.exit(1)
+    return paths
+
+
+def load_protocols() -> List[Protocol]:
+    """Load and combine all 3 protocol files (JSON arrays or JSON Lines)."""
     print("Loading protocol files...")
     all_protocols = []
 
-    for file_path in INPUT_FILES:
-        if not file_path.exists():
-            print(f"ERROR: File not found: {file_path}")
+    for file_path in input_paths():
+        try:
+            protocols = list(to_records(iter_protocol_file(file_path)))
+        except ValueError:
+            print(f"ERROR: Unexpected format in {file_path.name}")
             sys.exit(1)
 
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-
-            # Handle both array format and object with protocols key
-            if isinstance(data, list):
-                protocols = data
-            elif isinstance(data, dict) and 'protocols' in data:
-                protocols = data['protocols']
-            else:
-                print(f"ERROR: Unexpected format in {file_path.name}")
-                sys.exit(1)
-
-            all_protocols.extend(protocols)
-            print(f"  Loaded {len(protocols)} protocols from {file_path.name}")
+        all_protocols.extend(protocols)
+        print(f"  Loaded {len(protocols)} protocols from {file_path.name}")
 
     print(f"Total protocols loaded: {len(all_protocols)}")
     return all_protocols
 
 
-def prepare_embedding_text(protocol: Dict[str, Any]) -> str:
+def prepare_embedding_text(protocol: Protocol) -> str:
     """
     Prepare text for embedding with metadata context.
     Uses chunk_text as primary content, falls back to chunk_summary if too long.
@@ -94,11 +174,8 @@ def prepare_embedding_text(protocol: Dict[str, Any]) -> str:
     patterns = protocol.get('applicable_patterns', [])
     temperament = protocol.get('temperament_match', [])
 
-    # Estimate tokens (rough: 1 token ≈ 4 chars)
-    estimated_tokens = len(chunk_text) / 4
-
-    # Use chunk_summary if chunk_text is too long
-    main_content = chunk_text if estimated_tokens < MAX_TOKENS else chunk_summary
+    # Use chunk_summary if chunk_text is too long (cl100k_base tokens)
+    main_content = chunk_text if count_tokens(chunk_text) < MAX_TOKENS else chunk_summary
 
     # Build enriched text with metadata
     metadata_parts = []
@@ -124,150 +201,224 @@ def prepare_embedding_text(protocol: Dict[str, Any]) -> str:
     return embedding_text
 
 
-def generate_embeddings_batch(
-    client: OpenAI,
-    texts: List[str],
-    batch_num: int,
-    total_batches: int
-) -> tuple[List[List[float]], int]:
-    """
-    Generate embeddings for a batch of texts with retry logic.
-    Returns: (embeddings, token_count)
-    """
-    max_retries = 5
-    base_delay = 2
-
-    for attempt in range(max_retries):
-        try:
-            print(f"  Processing batch {batch_num}/{total_batches} ({len(texts)} texts)...", end=' ')
-
-            response = client.embeddings.create(
-                model=EMBEDDING_MODEL,
-                input=texts,
-                dimensions=EMBEDDING_DIMENSIONS
-            )
+def get_client() -> AsyncOpenAI:
+    """Async OpenAI client from OPENAI_API_KEY (retries are left to the EmbeddingDriver)"""
+    api_key = os.environ.get('OPENAI_API_KEY')
+    if not api_key:
+        print("ERROR: OPENAI_API_KEY environment variable not set")
+        print("Set it with: export OPENAI_API_KEY=sk-...")
+        sys.exit(1)
 
-            embeddings = [item.embedding for item in response.data]
-            token_count = response.usage.total_tokens
+    return AsyncOpenAI(api_key=api_key, max_retries=0)
+
+
+def make_driver(max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+                requests_per_minute: int = DEFAULT_REQUESTS_PER_MINUTE,
+                tokens_per_minute: int = DEFAULT_TOKENS_PER_MINUTE) -> EmbeddingDriver:
+    """Concurrent, rate-limited driver for EMBEDDING_MODEL"""
+    return EmbeddingDriver(
+        openai_create(get_client, EMBEDDING_MODEL, EMBEDDING_DIMENSIONS),
+        RateLimiter(requests_per_minute, tokens_per_minute),
+        max_in_flight=max_in_flight,
+        count_tokens=count_tokens,
+    )
+
+
+def open_cache(path: Optional[Path]) -> Optional[EmbeddingCache]:
+    """The embedding cache at path for EMBEDDING_MODEL (None: caching disabled)"""
+    if path is None:
+        return None
+    return EmbeddingCache(path, EMBEDDING_MODEL, EMBEDDING_DIMENSIONS)
+
+
+def iter_embedding_inputs(
+    protocols: Iterable[Protocol],
+    cache: Optional[EmbeddingCache] = None
+) -> Iterator[tuple[Protocol, str, Optional[array]]]:
+    """(protocol, embedding text, cached embedding or None), looked up CACHE_LOOKUP_SIZE at a time"""
+    remaining = iter(protocols)
+    while True:
+        chunk = list(islice(remaining, CACHE_LOOKUP_SIZE))
+        if not chunk:
+            return
+        texts = [prepare_embedding_text(protocol) for protocol in chunk]
+        cached = cache.get_many(texts) if cache else [None] * len(chunk)
+        yield from zip(chunk, texts, cached)
+
+
+def input_key(protocol: Protocol, text: Optional[str] = None) -> str:
+    """Cache and checkpoint key of the protocol's embedding text"""
+    if text is None:
+        text = prepare_embedding_text(protocol)
+    return cache_key(text, EMBEDDING_MODEL, EMBEDDING_DIMENSIONS)
 
-            print(f"✓ ({token_count} tokens)")
-            return embeddings, token_count
 
-        except Exception as e:
-            error_msg = str(e)
+def texts_to_embed(batch: List[tuple]) -> List[str]:
+    """Texts of a planned batch the cache does not have"""
+    return [text for _, text, cached in batch if cached is None]
 
-            # Handle rate limit (429) with exponential backoff
-            if "429" in error_msg or "rate_limit" in error_msg.lower():
-                if attempt < max_retries - 1:
-                    delay = base_delay * (2 ** attempt)
-                    print(f"⚠ Rate limit, retrying in {delay}s...")
-                    time.sleep(delay)
-                    continue
-                else:
-                    print(f"✗ Failed after {max_retries} retries")
-                    raise
-            else:
-                print(f"✗ Error: {error_msg}")
-                raise
 
-    raise Exception("Max retries exceeded")
+def iter_embedded_batches(
+    protocols: Iterable[Protocol],
+    total_protocols: int,
+    cache: Optional[EmbeddingCache] = None,
+    driver: Optional[EmbeddingDriver] = None,
+    checkpoint: Optional[EmbeddingCheckpoint] = None
+) -> Iterator[tuple[List[Protocol], int]]:
+    """
+    Embed protocols in token-packed batches, reading only as many batches
+    ahead as the driver keeps in flight. Cached texts are not sent; new
+    embeddings go to the cache and checkpoint as each request returns.
+    Yields, in input order: (batch protocols with embeddings, batch token count)
+    """
+    driver = driver or make_driver()
+
+    print(f"Processing {total_protocols} protocols in batches of up to {MAX_INPUTS_PER_REQUEST:,} texts "
+          f"and {MAX_TOKENS_PER_REQUEST:,} tokens")
+    print(f"Model: {EMBEDDING_MODEL} (dimensions: {EMBEDDING_DIMENSIONS}), "
+          f"up to {driver.max_in_flight} batches in flight\n")
+
+    def tokens_to_embed(entry: tuple) -> Optional[int]:
+        _, text, cached = entry
+        return count_tokens(text) if cached is None else None
+
+    def save_batch(batch: List[tuple], new_embeddings: List[List[float]], batch_tokens: int) -> None:
+        sent = [(protocol, text) for protocol, text, cached in batch if cached is None]
+        if cache:
+            cache.put_many([text for _, text in sent], new_embeddings)
+        if checkpoint:
+            checkpoint.append((chunk_key(protocol), input_key(protocol, text), embedding)
+                              for (protocol, text), embedding in zip(sent, new_embeddings))
+
+    batches = pack_batches(iter_embedding_inputs(protocols, cache), tokens_to_embed)
+    first = 1
+    for batch_num, (batch, new_embeddings, batch_tokens) in enumerate(
+            run_ordered(driver, batches, texts_to_embed, save_batch), 1):
+        label = f"  Batch {batch_num} (protocols {first}-{first + len(batch) - 1})"
+        sent = texts_to_embed(batch)
+        if sent:
+            predicted = sum(count_tokens(text) for text in sent)
+            error = f"{batch_tokens / predicted - 1:+.1%}" if predicted else "n/a"
+            print(f"{label}: {len(sent)} texts embedded ✓ "
+                  f"({batch_tokens:,} tokens, predicted {predicted:,}, {error})")
+        else:
+            print(f"{label}: all {len(batch)} texts cached")
+
+        # Add embeddings to the protocol records in place
+        embedded = iter(new_embeddings)
+        for protocol, _, cached in batch:
+            protocol.set_embedding(next(embedded) if cached is None else cached, EMBEDDING_MODEL)
+        first += len(batch)
+
+        yield [protocol for protocol, _, _ in batch], batch_tokens
+
+
+def embedding_cost(total_tokens: int) -> float:
+    """$0.020 per 1M tokens for text-embedding-3-small"""
+    cost_per_million = 0.020
+    return (total_tokens / 1_000_000) * cost_per_million
 
 
-def generate_all_embeddings(protocols: List[Dict[str, Any]]) -> tuple[List[Dict[str, Any]], int, float]:
+def restore_checkpoint(protocols: List[Protocol], checkpoint: EmbeddingCheckpoint) -> List[Protocol]:
+    """Set the embeddings the checkpoint holds for protocols' current texts; returns the protocols still to embed"""
+    restored = checkpoint.load()
+    pending = []
+    for protocol in protocols:
+        embedding = restored.get((chunk_key(protocol), input_key(protocol)))
+        if embedding is None:
+            pending.append(protocol)
+        else:
+            protocol.set_embedding(embedding, EMBEDDING_MODEL)
+
+    print(f"Resumed {len(protocols) - len(pending)} of {len(protocols)} protocols from {checkpoint.path.name}")
+    return pending
+
+
+def generate_all_embeddings(
+    protocols: List[Protocol],
+    cache: Optional[EmbeddingCache] = None,
+    driver: Optional[EmbeddingDriver] = None,
+    checkpoint: Optional[EmbeddingCheckpoint] = None,
+    resume: bool = False
+) -> tuple[List[Protocol], int, float]:
     """
     Generate embeddings for all protocols with batch processing.
+    With resume, protocols the checkpoint holds are restored, not sent.
     Returns: (protocols_with_embeddings, total_tokens, total_cost)
     """
-    # Check for API key
-    api_key = os.environ.get('OPENAI_API_KEY')
-    if not api_key:
-        print("ERROR: OPENAI_API_KEY environment variable not set")
-        print("Set it with: export OPENAI_API_KEY=sk-...")
-        sys.exit(1)
+    print("\nPreparing texts for embedding...")
+    pending = restore_checkpoint(protocols, checkpoint) if checkpoint and resume else protocols
+    total_tokens = 0
 
-    client = OpenAI(api_key=api_key)
+    for _, batch_tokens in iter_embedded_batches(pending, len(pending), cache, driver, checkpoint):
+        total_tokens += batch_tokens
 
-    # Prepare all embedding texts
-    print("\nPreparing texts for embedding...")
-    embedding_texts = []
-    for protocol in protocols:
-        text = prepare_embedding_text(protocol)
-        embedding_texts.append(text)
+    # Every record now holds its embedding, restored or new, in input order
+    return protocols, total_tokens, embedding_cost(total_tokens)
 
-    # Calculate batches
-    total_protocols = len(protocols)
-    num_batches = (total_protocols + BATCH_SIZE - 1) // BATCH_SIZE
 
-    print(f"Processing {total_protocols} protocols in {num_batches} batches of {BATCH_SIZE}")
-    print(f"Model: {EMBEDDING_MODEL} (dimensions: {EMBEDDING_DIMENSIONS})\n")
+def stream_embeddings(protocols: Iterable[Protocol], total_protocols: int, output_file: Path,
+                      append: bool, first_index: int = 0,
+                      cache: Optional[EmbeddingCache] = None,
+                      driver: Optional[EmbeddingDriver] = None) -> tuple[int, int]:
+    """
+    Embed protocols and append each batch to the JSONL output_file as soon
+    as it validates. Returns: (protocols written, total_tokens)
+    """
+    if not append:
+        output_file.write_text('', encoding='utf-8')
 
-    # Process batches
-    all_embeddings = []
+    written = 0
     total_tokens = 0
 
-    for batch_num in range(num_batches):
-        start_idx = batch_num * BATCH_SIZE
-        end_idx = min(start_idx + BATCH_SIZE, total_protocols)
-        batch_texts = embedding_texts[start_idx:end_idx]
-
-        batch_embeddings, batch_tokens = generate_embeddings_batch(
-            client, batch_texts, batch_num + 1, num_batches
-        )
+    for embedded, batch_tokens in iter_embedded_batches(protocols, total_protocols, cache, driver):
+        issues = [issue for i, protocol in enumerate(embedded, first_index + written)
+                  if (issue := embedding_issue(protocol, i))]
+        if issues:
+            print(f"✗ Validation failed: {issues[0]}")
+            print("  Resume with --jsonl --resume once fixed")
+            sys.exit(1)
 
-        all_embeddings.extend(batch_embeddings)
+        written += write_jsonl(to_dicts(embedded), output_file, append=True)
         total_tokens += batch_tokens
 
-        # Small delay between batches to avoid rate limits
-        if batch_num < num_batches - 1:
-            time.sleep(0.5)
+    return written, total_tokens
 
-    # Calculate cost ($0.020 per 1M tokens for text-embedding-3-small)
-    cost_per_million = 0.020
-    total_cost = (total_tokens / 1_000_000) * cost_per_million
 
-    # Add embeddings to protocols
-    print("\nAdding embeddings to protocol data...")
-    protocols_with_embeddings = []
+def embedding_issue(protocol: Protocol, i: int) -> Optional[str]:
+    """What is wrong with one protocol's embedding (record or dict), or None"""
+    if 'embedding' not in protocol:
+        return f"Protocol {i}: Missing embedding field"
 
-    for protocol, embedding in zip(protocols, all_embeddings):
-        protocol_copy = protocol.copy()
-        protocol_copy['embedding'] = embedding
-        protocol_copy['embedding_model'] = EMBEDDING_MODEL
-        protocol_copy['embedding_dimensions'] = EMBEDDING_DIMENSIONS
-        protocols_with_embeddings.append(protocol_copy)
+    embedding = protocol['embedding']
 
-    return protocols_with_embeddings, total_tokens, total_cost
+    if not isinstance(embedding, (list, array, memoryview)):
+        return f"Protocol {i}: Embedding is not a list"
 
+    if len(embedding) != EMBEDDING_DIMENSIONS:
+        return f"Protocol {i}: Wrong dimension ({len(embedding)} != {EMBEDDING_DIMENSIONS})"
 
-def validate_embeddings(protocols: List[Dict[str, Any]]) -> bool:
-    """Validate that all protocols have valid embeddings."""
-    print("\nValidating embeddings...")
-
-    issues = []
+    # Check for null/NaN values
+    if any(x is None or (isinstance(x, float) and x != x) for x in embedding):
+        return f"Protocol {i}: Contains null/NaN values"
 
-    for i, protocol in enumerate(protocols):
-        if 'embedding' not in protocol:
-            issues.append(f"Protocol {i}: Missing embedding field")
-            continue
+    # Check that values are floats
+    if not all(isinstance(x, (int, float)) for x in embedding):
+        return f"Protocol {i}: Contains non-numeric values"
 
-        embedding = protocol['embedding']
+    return None
 
-        if not isinstance(embedding, list):
-            issues.append(f"Protocol {i}: Embedding is not a list")
-            continue
 
-        if len(embedding) != EMBEDDING_DIMENSIONS:
-            issues.append(f"Protocol {i}: Wrong dimension ({len(embedding)} != {EMBEDDING_DIMENSIONS})")
-            continue
+def validate_embeddings(protocols: List[Protocol]) -> bool:
+    """Validate that all protocols have valid embeddings (in bulk, with norm and near-duplicate checks, with NumPy)."""
+    print("\nValidating embeddings...")
 
-        # Check for null/NaN values
-        if any(x is None or (isinstance(x, float) and x != x) for x in embedding):
-            issues.append(f"Protocol {i}: Contains null/NaN values")
-            continue
+    if np is not None:
+        diagnostics = diagnose_embeddings(protocols, EMBEDDING_DIMENSIONS)
+        print_diagnostics(diagnostics, [chunk_key(protocol) for protocol in protocols])
+        return diagnostics.valid
 
-        # Check that values are floats
-        if not all(isinstance(x, (int, float)) for x in embedding):
-            issues.append(f"Protocol {i}: Contains non-numeric values")
+    issues = [issue for i, protocol in enumerate(protocols) if (issue := embedding_issue(protocol, i))]
 
     if issues:
         print("✗ Validation failed:")
@@ -278,51 +429,221 @@ def validate_embeddings(protocols: List[Dict[str, Any]]) -> bool:
         return False
 
     print(f"✓ All {len(protocols)} protocols have valid embeddings")
+    print("  (pip install numpy for norm and near-duplicate checks)")
     return True
 
 
-def save_output(protocols: List[Dict[str, Any]]) -> int:
-    """Save protocols with embeddings to JSON file."""
-    print(f"\nSaving to {OUTPUT_FILE.name}...")
-
+def save_output(protocols: List[Protocol], output_format: str = 'store') -> tuple[Path, int]:
+    """Save protocols with embeddings as an embedding store or a JSON file; returns (path, bytes)."""
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(protocols, f, indent=2, ensure_ascii=False)
+    if output_format == 'store':
+        matrix_path, meta_path = write_store(protocols, OUTPUT_FILE, EMBEDDING_DIMENSIONS)
+        output_file, file_size = matrix_path, store_size(OUTPUT_FILE)
+        print(f"\nSaved to {matrix_path.name} + {meta_path.name}")
+    else:
+        print(f"\nSaving to {OUTPUT_FILE.name}...")
+        with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
+            json.dump(to_dicts(protocols), f, indent=2, ensure_ascii=False)
+        output_file, file_size = OUTPUT_FILE, OUTPUT_FILE.stat().st_size
 
-    file_size = OUTPUT_FILE.stat().st_size
     print(f"✓ Saved {len(protocols)} protocols ({file_size:,} bytes)")
 
-    return file_size
+    return output_file, file_size
 
 
-def get_sample_embedding(protocols: List[Dict[str, Any]]) -> List[float]:
+def get_sample_embedding(protocols: List[Protocol]) -> List[float]:
     """Get first 10 values of first protocol's embedding."""
     if protocols and 'embedding' in protocols[0]:
-        return protocols[0]['embedding'][:10]
+        return embedding_floats(protocols[0]['embedding'][:10])
     return []
 
 
+def print_driver_summary(driver: EmbeddingDriver) -> None:
+    print(f"API Requests:       {driver.requests} ({driver.retries} retried, {driver.rate_limited} rate limited, "
+          f"{driver.limiter.waited:.1f}s paced)")
+    if driver.predicted_tokens:
+        print(f"Token Estimate:     {driver.predicted_tokens:,} predicted, {driver.actual_tokens:,} billed "
+              f"({driver.actual_tokens / driver.predicted_tokens - 1:+.2%})")
+
+
+def print_cache_summary(cache: Optional[EmbeddingCache]) -> None:
+    if cache is None:
+        print("Embedding Cache:    disabled")
+        return
+    print(f"Embedding Cache:    {cache.hits}/{cache.hits + cache.misses} hits ({cache.hit_rate():.0%}), "
+          f"{cache.path.name} {cache.file_size() / 1024 / 1024:.2f} MB")
+
+
+def prune_cache(cache: EmbeddingCache) -> None:
+    """--prune-cache: keep only the entries the current inputs embed to"""
+    protocols = load_protocols()
+    deleted = cache.retain(prepare_embedding_text(protocol) for protocol in protocols)
+    print(f"\n✓ Pruned {deleted:,} stale cache entries")
+    print("  Run 'python3 embedding_cache.py compact' to shrink the file")
+
+
+def run_streaming(start: int, shard: Optional[tuple[int, int]], cache: Optional[EmbeddingCache],
+                  driver: EmbeddingDriver, resume: bool = False) -> None:
+    """--jsonl mode: stream the inputs (or one shard of them) into a JSONL output"""
+    paths = input_paths()
+    total = sum(count_records(path) for path in paths)
+    shard_start, shard_stop = shard_range(total, *shard) if shard else (0, total)
+
+    output_file = jsonl_path(OUTPUT_FILE)
+    if shard:
+        output_file = OUTPUT_DIR / f"{OUTPUT_FILE.stem}.shard-{shard[0]}-of-{shard[1]}.jsonl"
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+
+    # Appending: drop a record a killed run left half written
+    if (start or resume) and output_file.exists():
+        drop_partial_line(output_file)
+    if resume:
+        start = count_jsonl(output_file) if output_file.exists() else 0
+
+    print(f"Streaming protocols {shard_start + start}-{shard_stop} of {total} from {len(paths)} files")
+    if start:
+        print(f"Resuming at line {start} of {output_file.name}")
+
+    protocols = to_records(iter_protocol_files(paths, shard_start + start, shard_stop))
+    written, total_tokens = stream_embeddings(protocols, max(shard_stop - shard_start - start, 0), output_file,
+                                              append=start > 0, first_index=start,
+                                              cache=cache, driver=driver)
+
+    print("\n" + "=" * 70)
+    print("SUMMARY")
+    print("=" * 70)
+    print(f"Protocols Embedded: {written}")
+    print(f"Total Tokens Used:  {total_tokens:,}")
+    print(f"Total Cost:         ${embedding_cost(total_tokens):.4f}")
+    print(f"Output File:        {output_file} ({start + written} lines)")
+    print_driver_summary(driver)
+    print_cache_summary(cache)
+    print("\n✓ Embedding generation complete!")
+    print("=" * 70)
+
+
 def main():
     """Main execution flow."""
+    parser = argparse.ArgumentParser(description='Generate OpenAI embeddings for the parsed MIO protocols')
+    parser.add_argument(
+        '--jsonl',
+        action='store_true',
+        help='Stream batches and append each embedded protocol to a JSON Lines output as it is produced'
+    )
+    parser.add_argument(
+        '--start',
+        type=int,
+        default=0,
+        help='With --jsonl: skip this many protocols (of the shard) and append to the existing output'
+    )
+    parser.add_argument(
+        '--shard',
+        type=parse_shard,
+        help='With --jsonl: embed only the K-th of N contiguous slices, e.g. 2/4'
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Restore the embeddings an interrupted run checkpointed and embed only the rest '
+             '(with --jsonl: continue after the output\'s last complete line)'
+    )
+    parser.add_argument(
+        '--output-format',
+        choices=('store', 'json'),
+        default='store',
+        help='store: float32 .npy matrix plus .meta.jsonl (default); json: one JSON array with the embeddings as lists'
+    )
+    parser.add_argument(
+        '--cache',
+        type=Path,
+        default=CACHE_FILE,
+        help=f'Embedding cache file (default: output/{CACHE_FILE.name})'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Embed every protocol, neither reading nor filling the cache'
+    )
+    parser.add_argument(
+        '--prune-cache',
+        action='store_true',
+        help='Delete cache entries the current inputs no longer produce, then exit'
+    )
+    parser.add_argument(
+        '--max-in-flight',
+        type=int,
+        default=DEFAULT_MAX_IN_FLIGHT,
+        help=f'Batches sent concurrently (default: {DEFAULT_MAX_IN_FLIGHT})'
+    )
+    parser.add_argument(
+        '--requests-per-minute',
+        type=int,
+        default=DEFAULT_REQUESTS_PER_MINUTE,
+        help=f'Account request rate limit (default: {DEFAULT_REQUESTS_PER_MINUTE})'
+    )
+    parser.add_argument(
+        '--tokens-per-minute',
+        type=int,
+        default=DEFAULT_TOKENS_PER_MINUTE,
+        help=f'Account token rate limit (default: {DEFAULT_TOKENS_PER_MINUTE})'
+    )
+    args = parser.parse_args()
+
+    if args.max_in_flight < 1:
+        parser.error('--max-in-flight must be at least 1')
+    if args.no_cache and args.prune_cache:
+        parser.error('--prune-cache cannot be combined with --no-cache')
+    if args.resume and args.start:
+        parser.error('--resume finds the start itself; do not combine it with --start')
+    if (args.start or args.shard) and not args.jsonl:
+        parser.error('--start and --shard require --jsonl')
+
     print("=" * 70)
     print("MIO Protocol Library - OpenAI Embedding Generation")
     print("Week 2 Day 5 - Vector Embeddings for Semantic Search")
     print("=" * 70)
 
+    cache = open_cache(None if args.no_cache else args.cache)
+
+    if args.prune_cache:
+        prune_cache(cache)
+        return
+
+    driver = make_driver(args.max_in_flight, args.requests_per_minute, args.tokens_per_minute)
+
+    if args.jsonl:
+        run_streaming(args.start, args.shard, cache, driver, args.resume)
+        return
+
     # Load protocols
     protocols = load_protocols()
 
+    checkpoint_file = checkpoint_path(OUTPUT_FILE)
+    if not args.resume and checkpoint_file.exists() and count_jsonl(checkpoint_file):
+        print(f"Starting over: discarding {count_jsonl(checkpoint_file)} checkpointed embeddings "
+              f"in {checkpoint_file.name} (--resume keeps them)")
+    checkpoint = EmbeddingCheckpoint(checkpoint_file, resume=args.resume)
+
     # Generate embeddings
-    protocols_with_embeddings, total_tokens, total_cost = generate_all_embeddings(protocols)
+    try:
+        protocols_with_embeddings, total_tokens, total_cost = generate_all_embeddings(
+            protocols, cache, driver, checkpoint, args.resume
+        )
+    except Exception as e:
+        print(f"\n✗ Embedding failed: {e}")
+        print(f"  {checkpoint.written} new embeddings are checkpointed in {checkpoint.path}")
+        print("  Rerun with --resume to embed only the rest")
+        sys.exit(1)
 
     # Validate
     if not validate_embeddings(protocols_with_embeddings):
         print("\n✗ Validation failed. Aborting.")
         sys.exit(1)
 
-    # Save output
-    file_size = save_output(protocols_with_embeddings)
+    # Save output; the checkpoint is no longer needed once it is written
+    output_file, file_size = save_output(protocols_with_embeddings, args.output_format)
+    checkpoint.remove()
 
     # Get sample embedding
     sample = get_sample_embedding(protocols_with_embeddings)
@@ -335,8 +656,10 @@ def main():
     print(f"Total Protocols:    {len(protocols_with_embeddings)}")
     print(f"Total Tokens Used:  {total_tokens:,}")
     print(f"Total Cost:         ${total_cost:.4f}")
-    print(f"Output File:        {OUTPUT_FILE}")
+    print(f"Output File:        {output_file}")
     print(f"Output File Size:   {file_size:,} bytes ({file_size / 1024 / 1024:.2f} MB)")
+    print_driver_summary(driver)
+    print_cache_summary(cache)
     print(f"\nSample Embedding (first 10 values):")
     print(f"  {sample}")
     print("\n✓ Embedding generation complete!")
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
 MIO Protocol Database Insertion - Week 2 Day 6
-Batch insert 205 protocols with embeddings into Supabase mio_knowledge_chunks table
+Batch insert 231 protocols with embeddings into Supabase mio_knowledge_chunks table
 
 Usage:
     # Dry run (validation only, no insert)
@@ -13,6 +13,13 @@ Usage:
     # With batch size override
     python3 insert_to_supabase.py --batch-size 25
 
+    # One of 4 parallel shards of a JSON Lines input
+    python3 insert_to_supabase.py --input-file output/all-protocols-with-embeddings.jsonl --shard 2/4
+
+    # From the embedding store (float32 .npy matrix + .meta.jsonl); by default
+    # the newest of the .json, .jsonl and .npy outputs is read
+    python3 insert_to_supabase.py --input-file output/all-protocols-with-embeddings.npy
+
 Environment Variables Required:
     SUPABASE_SERVICE_KEY - Service role key for database access
 """
@@ -22,10 +29,14 @@ import sys
 import json
 import argparse
 import time
+from array import array
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
+from protocol_jsonl import count_records, iter_protocol_file, parse_shard, resolve_input, shard_range
+from protocol_record import Protocol
+
 # Supabase client
 try:
     from supabase import create_client, Client
@@ -110,24 +121,20 @@ def get_supabase_client() -> Optional[Client]:
         return None
 
 
-def load_protocols(file_path: Path) -> Optional[List[Dict[str, Any]]]:
+def load_protocols(file_path: Path, start: int = 0, stop: Optional[int] = None) -> Optional[List[Dict[str, Any]]]:
     """
-    Load protocols from JSON file
+    Load protocols [start, stop) from a JSON array, JSON Lines or embedding store file
     Returns None if file not found or invalid JSON
     """
     if not file_path.exists():
         print_error(f"Input file not found: {file_path}")
-        print_info("Expected location: protocol-parsing/output/all-protocols-with-embeddings.json")
+        print_info("Expected location: protocol-parsing/output/all-protocols-with-embeddings.npy "
+                   "(+ .meta.jsonl), or the .json/.jsonl written with --output-format json")
         print_info("This file should be created by the parallel embedding generation task")
         return None
 
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            protocols = json.load(f)
-
-        if not isinstance(protocols, list):
-            print_error(f"Invalid JSON format: expected list, got {type(protocols)}")
-            return None
+        protocols = list(iter_protocol_file(file_path, start, stop))
 
         print_success(f"Loaded {len(protocols)} protocols from {file_path.name}")
         return protocols
@@ -135,6 +142,9 @@ def load_protocols(file_path: Path) -> Optional[List[Dict[str, Any]]]:
     except json.JSONDecodeError as e:
         print_error(f"Invalid JSON in {file_path.name}: {e}")
         return None
+    except ValueError as e:
+        print_error(f"Invalid JSON format: {e}")
+        return None
     except Exception as e:
         print_error(f"Error reading {file_path.name}: {e}")
         return None
@@ -155,8 +165,8 @@ def validate_protocol(protocol: Dict[str, Any], index: int) -> Tuple[bool, Optio
     if 'embedding' in protocol:
         embedding = protocol['embedding']
 
-        # Check if embedding is a list
-        if not isinstance(embedding, list):
+        # Check if embedding is a list (or float32 values from an embedding store)
+        if not isinstance(embedding, (list, array, memoryview)):
             return False, f"Embedding must be a list, got {type(embedding)}"
 
         # Check embedding dimension
@@ -229,28 +239,9 @@ def validate_all_protocols(protocols: List[Dict[str, Any]]) -> Tuple[bool, List[
 def transform_protocol_to_db_record(protocol: Dict[str, Any]) -> Dict[str, Any]:
     """
     Transform protocol JSON to database record format
-    Maps JSON fields to database schema
+    Maps JSON fields to database schema (protocol_record.DB_FIELDS)
     """
-    # Calculate token approximation (4 characters per token)
-    chunk_text = protocol.get('chunk_text', '')
-    tokens_approx = len(chunk_text) // 4 if chunk_text else 0
-
-    return {
-        'source_file': protocol['source_file'],
-        'file_number': protocol.get('file_number'),
-        'chunk_number': protocol.get('chunk_number'),
-        'chunk_text': chunk_text,
-        'chunk_summary': protocol.get('chunk_summary'),
-        'embedding': protocol['embedding'],  # vector(1536)
-        'category': protocol.get('category'),
-        'applicable_patterns': protocol.get('applicable_patterns', []),
-        'temperament_match': protocol.get('temperament_match', []),
-        'time_commitment_min': protocol.get('time_commitment_min'),
-        'time_commitment_max': protocol.get('time_commitment_max'),
-        'difficulty_level': protocol.get('difficulty_level'),
-        'state_created': protocol.get('state_created', []),
-        'tokens_approx': tokens_approx
-    }
+    return Protocol.from_dict(protocol).db_record()
 
 
 def insert_batch(
@@ -558,11 +549,25 @@ Examples:
     parser.add_argument(
         '--input-file',
         type=Path,
-        default=INPUT_FILE,
-        help='Path to input JSON file with embeddings'
+        help='Path to input JSON, JSON Lines or embedding store (.npy) file with embeddings '
+             '(default: the newest of output/all-protocols-with-embeddings.json/.jsonl/.npy)'
+    )
+
+    parser.add_argument(
+        '--start',
+        type=int,
+        default=0,
+        help='Skip this many protocols (of the shard), e.g. to resume after a failed run'
+    )
+
+    parser.add_argument(
+        '--shard',
+        type=parse_shard,
+        help='Insert only the K-th of N contiguous slices of the input, e.g. 2/4'
     )
 
     args = parser.parse_args()
+    args.input_file = args.input_file or resolve_input(INPUT_FILE)
 
     # Print header
     print_header("MIO Protocol Database Insertion - Week 2 Day 6")
@@ -576,7 +581,11 @@ Examples:
             sys.exit(1)
 
     # Step 2: Load protocols
-    protocols = load_protocols(args.input_file)
+    start, stop = 0, None
+    if args.shard and args.input_file.exists():
+        start, stop = shard_range(count_records(args.input_file), *args.shard)
+        print_info(f"Shard {args.shard[0]}/{args.shard[1]}: protocols {start}-{stop}")
+    protocols = load_protocols(args.input_file, start + args.start, stop)
     if not protocols:
         print_error("Cannot proceed without protocol data")
         sys.exit(1)
@@ -4,31 +4,104 @@ MIO Protocol Parser - Day 1: File Normalization
 Prepares source files for parsing by normalizing encoding, whitespace, and structure
 """
 
+import argparse
+import json
 import os
-import re
 import shutil
+import tempfile
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import List, Tuple
-
-# Source file paths
-SOURCES = {
-    'daily_deductible': '/Users/kesonpurpose/Downloads/UIB ASSETS/Cursor App Build/Purpose Waze Company/Context/UFB/📚 Daily Deductible Library_ Complete Practice Collection.md',
-    'neural_rewiring': '/Users/kesonpurpose/Downloads/UIB ASSETS/Cursor App Build/Purpose Waze Company/Context/30 Day Challenge/Identity Collision Avatar Assessment /neural_rewiring_protocols.txt',
-    'research_protocols': [
-        '/Users/kesonpurpose/Downloads/UIB ASSETS/Cursor App Build/Purpose Waze Company/Context/30 Day Challenge/MIO-System-PRODUCTION/01-Knowledge-Base/mio-kb-01-core-framework.md',
-        '/Users/kesonpurpose/Downloads/UIB ASSETS/Cursor App Build/Purpose Waze Company/Context/30 Day Challenge/MIO-System-PRODUCTION/01-Knowledge-Base/mio-kb-02-avatar-index.md',
-        '/Users/kesonpurpose/Downloads/UIB ASSETS/Cursor App Build/Purpose Waze Company/Context/30 Day Challenge/MIO-System-PRODUCTION/01-Knowledge-Base/mio-kb-03-protocol-library.md',
-        '/Users/kesonpurpose/Downloads/UIB ASSETS/Cursor App Build/Purpose Waze Company/Context/30 Day Challenge/MIO-System-PRODUCTION/01-Knowledge-Base/mio-kb-04-communication-frameworks.md',
-        '/Users/kesonpurpose/Downloads/UIB ASSETS/Cursor App Build/Purpose Waze Company/Context/30 Day Challenge/MIO-System-PRODUCTION/01-Knowledge-Base/mio-kb-05-emergency-tools.md',
-        '/Users/kesonpurpose/Downloads/UIB ASSETS/Cursor App Build/Purpose Waze Company/Context/30 Day Challenge/MIO-System-PRODUCTION/01-Knowledge-Base/mio-kb-06-data-coaching.md',
-        '/Users/kesonpurpose/Downloads/UIB ASSETS/Cursor App Build/Purpose Waze Company/Context/30 Day Challenge/MIO-System-PRODUCTION/01-Knowledge-Base/mio-kb-07-neural-rewiring-protocols.md',
-        '/Users/kesonpurpose/Downloads/UIB ASSETS/Cursor App Build/Purpose Waze Company/Context/30 Day Challenge/MIO-System-PRODUCTION/01-Knowledge-Base/mio-kb-08-forensic-to-protocol-integration.md'
-    ]
+from typing import Any, Callable, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from staging_manifest import MANIFEST_NAME, StagingManifest, content_addressed_name, sha256_file
+
+# Where content authors keep the sources (override with --source-root or
+# MIO_SOURCE_ROOT)
+DEFAULT_SOURCE_ROOT = Path(os.environ.get(
+    'MIO_SOURCE_ROOT',
+    '/Users/kesonpurpose/Downloads/UIB ASSETS/Cursor App Build/Purpose Waze Company/Context'
+))
+
+# Glob rules relative to the source root. Single sources take the first
+# match; research_protocols takes every match in sorted (mio-kb-NN) order.
+SOURCE_RULES = {
+    'daily_deductible': 'UFB/*Daily Deductible Library*.md',
+    'neural_rewiring': '30 Day Challenge/Identity Collision Avatar Assessment*/neural_rewiring_protocols.txt',
+    'research_protocols': '30 Day Challenge/MIO-System-PRODUCTION/01-Knowledge-Base/mio-kb-*.md'
 }
 
+
+def discover_sources(root: Path, rules: Dict[str, str] = SOURCE_RULES) -> Dict[str, Any]:
+    """
+    Resolve SOURCE_RULES under root into the source layout main() uses:
+    {'daily_deductible': path, 'neural_rewiring': path, 'research_protocols': [paths]}
+
+    A single source with no match resolves to root/<rule> so the usual
+    "not found" message names what was expected.
+    """
+    root = Path(root)
+    sources = {}
+
+    for key, pattern in rules.items():
+        matches = sorted(p for p in root.glob(pattern) if p.is_file())
+        if key == 'research_protocols':
+            sources[key] = [str(p) for p in matches]
+        else:
+            sources[key] = str(matches[0] if matches else root / pattern)
+
+    return sources
+
+
 STAGING_DIR = Path(__file__).parent / 'staging'
 BACKUP_DIR = Path(__file__).parent / 'backup'
 
+# Recorded in staging/manifest.json - bump whenever normalize_text() output
+# changes so every staging file is rebuilt on the next run
+NORMALIZER_VERSION = 1
+
+# Characters per read in --stream mode (blocks are extended to a line boundary)
+STREAM_BLOCK_SIZE = 1024 * 1024
+
+# Smart quotes / dashes / ellipsis → ASCII, plus tabs. A tab maps straight
+# to one space: expanding to four spaces and collapsing the run afterwards
+# gives the same result.
+CHAR_REPLACEMENTS = (
+    ('\u2018', "'"),   # Left single quote
+    ('\u2019', "'"),   # Right single quote
+    ('\u201c', '"'),   # Left double quote
+    ('\u201d', '"'),   # Right double quote
+    ('\u2013', '-'),   # En dash
+    ('\u2014', '--'),  # Em dash
+    ('\u2026', '...'), # Ellipsis
+    ('\t', ' '),       # Tab
+)
+
+
+def _normalize_lines(text: str) -> str:
+    """
+    Apply every per-line rule (character mapping, space collapsing, line
+    endings, trailing whitespace). Safe to run on any block that ends at a
+    line boundary: the result for a whole document equals the concatenated
+    results for its line-aligned blocks.
+    """
+    for old, new in CHAR_REPLACEMENTS:
+        if old in text:
+            text = text.replace(old, new)
+
+    # Multiple spaces → single (each pass halves every run)
+    while '  ' in text:
+        text = text.replace('  ', ' ')
+
+    # Normalize line endings to Unix LF
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+
+    # Remove trailing whitespace from lines
+    return '\n'.join(map(str.rstrip, text.split('\n')))
+
+
 def normalize_text(text: str) -> str:
     """
     Normalize text content:
@@ -37,50 +110,122 @@ def normalize_text(text: str) -> str:
     - Normalize whitespace (tabs → spaces, multiple spaces → single)
     - Ensure consistent line endings (Unix LF)
     - Remove BOM if present
+
+    Every rule is a C-level str operation guarded by a cheap membership
+    test, so rules that don't apply cost one scan and no copy. Output is
+    byte-identical to the original regex/list implementation
+    (see benchmarks/bench_normalize.py).
     """
     # Remove BOM
     if text.startswith('\ufeff'):
         text = text[1:]
 
-    # Smart quotes → regular quotes
-    replacements = {
-        '\u2018': "'",  # Left single quote
-        '\u2019': "'",  # Right single quote
-        '\u201c': '"',  # Left double quote
-        '\u201d': '"',  # Right double quote
-        '\u2013': '-',  # En dash
-        '\u2014': '--', # Em dash
-        '\u2026': '...',# Ellipsis
-    }
+    # Ensure file ends with single newline
+    return _normalize_lines(text).rstrip() + '\n'
 
-    for old, new in replacements.items():
-        text = text.replace(old, new)
 
-    # Normalize whitespace
-    text = text.replace('\t', '    ')  # Tabs → 4 spaces
-    text = re.sub(r' +', ' ', text)    # Multiple spaces → single
+def iter_line_blocks(f: TextIO, block_size: int = STREAM_BLOCK_SIZE) -> Iterator[str]:
+    """
+    Read a text file in blocks of roughly block_size characters, each ending
+    on a line boundary (except possibly the last).
+    """
+    remainder = ''
+    while True:
+        chunk = f.read(block_size)
+        if not chunk:
+            break
+
+        chunk = remainder + chunk
+        cut = chunk.rfind('\n') + 1
+        if cut == 0:
+            # No newline yet - keep accumulating this (very long) line
+            remainder = chunk
+            continue
 
-    # Normalize line endings to Unix LF
-    text = text.replace('\r\n', '\n').replace('\r', '\n')
+        remainder = chunk[cut:]
+        yield chunk[:cut]
 
-    # Remove trailing whitespace from lines
-    lines = text.split('\n')
-    lines = [line.rstrip() for line in lines]
-    text = '\n'.join(lines)
+    if remainder:
+        yield remainder
 
-    # Ensure file ends with single newline
-    text = text.rstrip() + '\n'
 
-    return text
+class StreamingNormalizer:
+    """
+    Incremental normalize_text(): feed line-aligned blocks, write whatever
+    feed() returns, then write finish(). The concatenated output is identical
+    to normalize_text() on the whole document.
+
+    Only trailing blank lines are held back (normalize_text strips them at
+    end of file), so memory stays bounded by the block size.
+    """
+
+    def __init__(self):
+        self.started = False
+        self.held_newlines = 0
 
-def process_file(source_path: str, dest_path: Path, backup: bool = True) -> Tuple[int, int]:
+    def feed(self, block: str) -> str:
+        if not block:
+            return ''
+
+        if not self.started:
+            self.started = True
+            if block.startswith('\ufeff'):
+                block = block[1:]
+
+        body = _normalize_lines(block)
+        content = body.rstrip('\n')
+        if not content:
+            # Blank lines only - emit them later if more content follows
+            self.held_newlines += len(body)
+            return ''
+
+        output = '\n' * self.held_newlines + content
+        self.held_newlines = len(body) - len(content)
+        return output
+
+    def finish(self) -> str:
+        return '\n'
+
+
+def stream_normalize(source: TextIO, dest: TextIO, block_size: int = STREAM_BLOCK_SIZE) -> Tuple[int, int]:
+    """
+    Normalize source into dest block by block.
+
+    Returns: (original_size, normalized_size)
+    """
+    normalizer = StreamingNormalizer()
+    original_size = 0
+    normalized_size = 0
+
+    for block in iter_line_blocks(source, block_size):
+        original_size += len(block)
+        output = normalizer.feed(block)
+        if output:
+            dest.write(output)
+            normalized_size += len(output)
+
+    tail = normalizer.finish()
+    dest.write(tail)
+    normalized_size += len(tail)
+
+    return (original_size, normalized_size)
+
+def process_file(source_path: str, dest_path: Path, backup: bool = True,
+                 stream: bool = False, block_size: int = STREAM_BLOCK_SIZE,
+                 sha256: Optional[str] = None) -> Tuple[int, int]:
     """
     Process a single source file:
     1. Read with UTF-8 encoding
     2. Normalize content
-    3. Create backup
+    3. Create backup (content-addressed, so identical content is stored once)
     4. Write normalized version
 
+    sha256 is the source's content hash if the caller already has it.
+
+    With stream=True the source is normalized block by block into a
+    temporary file next to dest_path, which then replaces it; the file is
+    never held in memory.
+
     Returns: (original_size, normalized_size)
     """
     source_path = Path(source_path)
@@ -89,132 +234,385 @@ def process_file(source_path: str, dest_path: Path, backup: bool = True) -> Tupl
         print(f"⚠️  Source file not found: {source_path}")
         return (0, 0)
 
-    # Read original
+    dest_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = dest_path.with_name(dest_path.name + '.tmp')
+
+    # Read (and in stream mode, normalize) original
     try:
         with open(source_path, 'r', encoding='utf-8', errors='replace') as f:
-            original_text = f.read()
+            if stream:
+                with open(tmp_path, 'w', encoding='utf-8') as out:
+                    original_size, normalized_size = stream_normalize(f, out, block_size)
+            else:
+                original_text = f.read()
     except Exception as e:
+        tmp_path.unlink(missing_ok=True)
         print(f"❌ Error reading {source_path.name}: {e}")
         return (0, 0)
 
-    original_size = len(original_text)
+    if not stream:
+        original_size = len(original_text)
 
-    # Normalize
-    normalized_text = normalize_text(original_text)
-    normalized_size = len(normalized_text)
+        # Normalize
+        normalized_text = normalize_text(original_text)
+        normalized_size = len(normalized_text)
 
     # Create backup
     if backup:
-        backup_path = BACKUP_DIR / source_path.name
-        BACKUP_DIR.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(source_path, backup_path)
+        backup_path = BACKUP_DIR / content_addressed_name(source_path, sha256 or sha256_file(source_path))
+        if not backup_path.exists():
+            BACKUP_DIR.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(source_path, backup_path)
 
     # Write normalized version
-    dest_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(dest_path, 'w', encoding='utf-8') as f:
-        f.write(normalized_text)
+    if stream:
+        os.replace(tmp_path, dest_path)
+    else:
+        with open(dest_path, 'w', encoding='utf-8') as f:
+            f.write(normalized_text)
 
     return (original_size, normalized_size)
 
-def main():
-    """Main normalization workflow"""
-    print("=" * 60)
-    print("MIO Protocol Parser - Day 1: File Normalization")
-    print("=" * 60)
-    print()
 
-    # Create directories
-    STAGING_DIR.mkdir(parents=True, exist_ok=True)
-    BACKUP_DIR.mkdir(parents=True, exist_ok=True)
+def normalize_to_file(source_path: Path, dest_path: Path, stream: bool = False,
+                      block_size: int = STREAM_BLOCK_SIZE) -> Tuple[int, int]:
+    """
+    Normalize one source into dest_path (no backup, no rename). Used as the
+    process-pool job for research files in --workers mode.
 
-    stats = {
-        'files_processed': 0,
-        'total_original': 0,
-        'total_normalized': 0,
-        'errors': []
-    }
+    Returns: (original_size, normalized_size)
+    """
+    with open(source_path, 'r', encoding='utf-8', errors='replace') as f, \
+            open(dest_path, 'w', encoding='utf-8') as out:
+        if stream:
+            return stream_normalize(f, out, block_size)
 
-    # Process Daily Deductible
-    print("📚 Processing Daily Deductible Library...")
-    orig, norm = process_file(
-        SOURCES['daily_deductible'],
-        STAGING_DIR / 'daily-deductible-normalized.md'
-    )
-    if orig > 0:
-        stats['files_processed'] += 1
-        stats['total_original'] += orig
-        stats['total_normalized'] += norm
-        print(f"   ✓ Normalized: {orig:,} → {norm:,} bytes")
-    print()
+        text = f.read()
+        normalized = normalize_text(text)
+        out.write(normalized)
+        return (len(text), len(normalized))
+
+
+def timed_call(func: Callable[[], Any]) -> Tuple[Any, float]:
+    """
+    Run func() and return (result, CPU seconds). CPU time rather than wall
+    time, so a worker that waited for a core isn't counted as slower.
+    Picklable for process pools.
+    """
+    start = time.process_time()
+    result = func()
+    return result, time.process_time() - start
+
+
+def research_header(source_path: Path) -> str:
+    """Header written above each KB file in research-protocols-combined.md"""
+    return f"# SOURCE FILE: {source_path.name}\n# ORIGINAL PATH: {source_path}\n\n"
+
+
+RESEARCH_SEPARATOR = "\n\n" + "=" * 80 + "\n\n"
 
-    # Process Neural Rewiring
-    print("🧠 Processing Neural Rewiring Protocols...")
-    orig, norm = process_file(
-        SOURCES['neural_rewiring'],
-        STAGING_DIR / 'neural-rewiring-normalized.txt'
-    )
-    if orig > 0:
-        stats['files_processed'] += 1
-        stats['total_original'] += orig
-        stats['total_normalized'] += norm
-        print(f"   ✓ Normalized: {orig:,} → {norm:,} bytes")
-    print()
 
-    # Process Research Protocols (combine into single file)
-    print("🔬 Processing Research Protocols (8 files)...")
+def process_research_files(source_paths: List[Path], dest_path: Path, stream: bool = False,
+                           block_size: int = STREAM_BLOCK_SIZE) -> Dict:
+    """
+    Normalize the KB files into one combined staging file, each preceded by
+    a '# SOURCE FILE:' header and followed by a separator line.
+
+    In stream mode each section is written straight to a temp file instead
+    of collecting combined_content in memory.
+
+    Returns: {'files', 'original', 'normalized', 'combined_size', 'errors', 'timings'}
+    """
+    total = len(source_paths)
+    result = {'files': 0, 'original': 0, 'normalized': 0, 'combined_size': 0,
+              'errors': [], 'timings': []}
     combined_content = []
-    research_orig = 0
-    research_norm = 0
 
-    for i, source_path in enumerate(SOURCES['research_protocols'], 1):
-        source_path = Path(source_path)
+    tmp_path = dest_path.with_name(dest_path.name + '.tmp')
+    out = open(tmp_path, 'w', encoding='utf-8') if stream else None
+
+    for i, source_path in enumerate(source_paths, 1):
         if not source_path.exists():
-            print(f"   ⚠️  File {i}/8 not found: {source_path.name}")
+            print(f"   ⚠️  File {i}/{total} not found: {source_path.name}")
             continue
 
+        mark = out.tell() if out else 0
+        start = time.process_time()
         try:
             with open(source_path, 'r', encoding='utf-8', errors='replace') as f:
-                text = f.read()
-
-            research_orig += len(text)
-            normalized = normalize_text(text)
-            research_norm += len(normalized)
-
-            # Add file header
-            combined_content.append(f"# SOURCE FILE: {source_path.name}\n")
-            combined_content.append(f"# ORIGINAL PATH: {source_path}\n\n")
-            combined_content.append(normalized)
-            combined_content.append("\n\n" + "=" * 80 + "\n\n")
-
-            print(f"   ✓ {i}/8: {source_path.name} ({len(normalized):,} bytes)")
+                if out:
+                    header = research_header(source_path)
+                    out.write(header)
+                    orig, norm = stream_normalize(f, out, block_size)
+                    out.write(RESEARCH_SEPARATOR)
+                    result['combined_size'] += len(header) + norm + len(RESEARCH_SEPARATOR)
+                else:
+                    text = f.read()
+                    orig = len(text)
+                    normalized = normalize_text(text)
+                    norm = len(normalized)
+
+                    # Add file header
+                    combined_content.append(research_header(source_path))
+                    combined_content.append(normalized)
+                    combined_content.append(RESEARCH_SEPARATOR)
+
+            seconds = time.process_time() - start
+            result['files'] += 1
+            result['original'] += orig
+            result['normalized'] += norm
+            result['timings'].append((source_path.name, seconds))
+            print(f"   ✓ {i}/{total}: {source_path.name} ({norm:,} bytes, {seconds * 1000:.0f} ms)")
 
         except Exception as e:
-            print(f"   ❌ {i}/8: {source_path.name} - Error: {e}")
-            stats['errors'].append(f"{source_path.name}: {e}")
+            if out:
+                # Drop the partially written section
+                out.seek(mark)
+                out.truncate()
+            print(f"   ❌ {i}/{total}: {source_path.name} - Error: {e}")
+            result['errors'].append(f"{source_path.name}: {e}")
 
     # Write combined research protocols
-    if combined_content:
+    if out:
+        out.close()
+        if result['combined_size']:
+            os.replace(tmp_path, dest_path)
+        else:
+            tmp_path.unlink()
+    elif combined_content:
         combined_text = ''.join(combined_content)
-        dest_path = STAGING_DIR / 'research-protocols-combined.md'
+        result['combined_size'] = len(combined_text)
         with open(dest_path, 'w', encoding='utf-8') as f:
             f.write(combined_text)
 
-        stats['files_processed'] += len(SOURCES['research_protocols'])
-        stats['total_original'] += research_orig
-        stats['total_normalized'] += research_norm
-        print(f"   ✓ Combined: {len(combined_content)} sections → {len(combined_text):,} bytes")
-    print()
+    return result
+
+
+def submit_research_jobs(executor: Executor, source_paths: List[Path], parts_dir: Path,
+                         stream: bool = False, block_size: int = STREAM_BLOCK_SIZE) -> List[Optional[Future]]:
+    """
+    Start normalizing every KB file into its own part file. Returns one
+    future per source (None for missing files), in source order.
+    """
+    jobs = []
+    for i, source_path in enumerate(source_paths, 1):
+        if not source_path.exists():
+            jobs.append(None)
+            continue
+
+        part_path = parts_dir / f"{i:03d}.part"
+        job = partial(normalize_to_file, source_path, part_path, stream, block_size)
+        jobs.append(executor.submit(timed_call, job))
+    return jobs
+
+
+def assemble_research_parts(source_paths: List[Path], jobs: List[Optional[Future]],
+                            parts_dir: Path, dest_path: Path) -> Dict:
+    """
+    Concatenate the part files from submit_research_jobs() in source order,
+    with the same headers and separators as process_research_files().
+    Parts are copied in blocks, so memory stays bounded in stream mode.
+    """
+    total = len(source_paths)
+    result = {'files': 0, 'original': 0, 'normalized': 0, 'combined_size': 0,
+              'errors': [], 'timings': []}
+
+    tmp_path = dest_path.with_name(dest_path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as out:
+        for i, (source_path, job) in enumerate(zip(source_paths, jobs), 1):
+            if job is None:
+                print(f"   ⚠️  File {i}/{total} not found: {source_path.name}")
+                continue
+
+            try:
+                (orig, norm), seconds = job.result()
+            except Exception as e:
+                print(f"   ❌ {i}/{total}: {source_path.name} - Error: {e}")
+                result['errors'].append(f"{source_path.name}: {e}")
+                continue
+
+            header = research_header(source_path)
+            out.write(header)
+            with open(parts_dir / f"{i:03d}.part", 'r', encoding='utf-8') as part:
+                shutil.copyfileobj(part, out)
+            out.write(RESEARCH_SEPARATOR)
+
+            result['files'] += 1
+            result['original'] += orig
+            result['normalized'] += norm
+            result['combined_size'] += len(header) + norm + len(RESEARCH_SEPARATOR)
+            result['timings'].append((source_path.name, seconds))
+            print(f"   ✓ {i}/{total}: {source_path.name} ({norm:,} bytes, {seconds * 1000:.0f} ms)")
+
+    if result['combined_size']:
+        os.replace(tmp_path, dest_path)
+    else:
+        tmp_path.unlink()
+
+    return result
+
+
+def is_unchanged(manifest: Optional[StagingManifest], dest_path: Path, source_paths: List[Path]) -> bool:
+    """True if the manifest says dest_path is already built from these exact sources"""
+    if manifest is None or not source_paths:
+        return False
+    return manifest.is_current(dest_path, source_paths)
+
+
+def staging_targets(sources: Dict[str, Any]) -> List[Tuple[str, List[Path], Path]]:
+    """(message, source paths, staging path) for every staging file, in build order"""
+    research_paths = [Path(p) for p in sources['research_protocols']]
+    return [
+        ("📚 Processing Daily Deductible Library...", [Path(sources['daily_deductible'])],
+         STAGING_DIR / 'daily-deductible-normalized.md'),
+        ("🧠 Processing Neural Rewiring Protocols...", [Path(sources['neural_rewiring'])],
+         STAGING_DIR / 'neural-rewiring-normalized.txt'),
+        (f"🔬 Processing Research Protocols ({len(research_paths)} files)...", research_paths,
+         STAGING_DIR / 'research-protocols-combined.md'),
+    ]
+
+
+def stale_targets(manifest: StagingManifest, sources: Dict[str, Any]) -> List[Path]:
+    """Staging files whose sources changed since they were built (stat first, hash on change)"""
+    stale = []
+    for _, source_paths, dest_path in staging_targets(sources):
+        present = [p for p in source_paths if p.exists()]
+        if present and not manifest.is_current(dest_path, present):
+            stale.append(dest_path)
+    return stale
+
+
+def normalize_all(sources: Dict[str, Any], manifest: StagingManifest, force: bool = False,
+                  stream: bool = False, block_size: int = STREAM_BLOCK_SIZE, workers: int = 1) -> Dict:
+    """
+    Rebuild every staging file whose sources changed (all of them with
+    force=True) and record them in the manifest.
+
+    Returns the run statistics; stats['changed'] lists rebuilt staging paths.
+    """
+    check_manifest = None if force else manifest
+
+    stats = {
+        'files_processed': 0,
+        'files_skipped': 0,
+        'total_original': 0,
+        'total_normalized': 0,
+        'errors': [],
+        'timings': [],
+        'changed': []
+    }
+
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    parts_dir = None
+
+    (dd_message, dd_sources, dd_dest), (nr_message, nr_sources, nr_dest), \
+        (research_message, research_paths, research_dest) = staging_targets(sources)
+    research_present = [p for p in research_paths if p.exists()]
+
+    try:
+        # Decide what needs rebuilding; with --workers every job starts now
+        single_jobs = []
+        for message, (source_path,), dest_path in [(dd_message, dd_sources, dd_dest),
+                                                   (nr_message, nr_sources, nr_dest)]:
+            if source_path.exists() and is_unchanged(check_manifest, dest_path, [source_path]):
+                single_jobs.append((message, source_path, dest_path, None, None, None))
+                continue
+
+            sha256 = manifest.fingerprint(source_path)['sha256'] if source_path.exists() else None
+            job = partial(process_file, str(source_path), dest_path, stream=stream,
+                          block_size=block_size, sha256=sha256)
+            future = executor.submit(timed_call, job) if executor else None
+            single_jobs.append((message, source_path, dest_path, job, future, sha256))
+
+        research_unchanged = is_unchanged(check_manifest, research_dest, research_present)
+        # Hashed before the sources are read: the manifest records these
+        research_sha256 = [] if research_unchanged else [manifest.fingerprint(p)['sha256'] for p in research_present]
+        research_jobs = None
+        if executor and not research_unchanged:
+            parts_dir = Path(tempfile.mkdtemp(prefix='.parts-', dir=STAGING_DIR))
+            research_jobs = submit_research_jobs(executor, research_paths, parts_dir,
+                                                 stream, block_size)
+
+        # Process Daily Deductible and Neural Rewiring
+        for message, source_path, dest_path, job, future, sha256 in single_jobs:
+            print(message)
+
+            if job is None:
+                stats['files_skipped'] += 1
+                print(f"   ✓ Unchanged, skipped ({dest_path.name})")
+                print()
+                continue
+
+            (orig, norm), seconds = future.result() if future else timed_call(job)
+            if orig > 0:
+                manifest.record(dest_path, [source_path], [sha256])
+                stats['changed'].append(dest_path)
+                stats['files_processed'] += 1
+                stats['total_original'] += orig
+                stats['total_normalized'] += norm
+                stats['timings'].append((source_path.name, seconds))
+                print(f"   ✓ Normalized: {orig:,} → {norm:,} bytes ({seconds * 1000:.0f} ms)")
+            print()
+
+        # Process Research Protocols (combine into single file)
+        print(research_message)
+
+        if research_unchanged:
+            stats['files_skipped'] += len(research_present)
+            print(f"   ✓ Unchanged, skipped ({research_dest.name})")
+        else:
+            # Any changed KB file rebuilds the combined file; unchanged members
+            # are re-read but the manifest keeps their hashes
+            if research_jobs is not None:
+                research = assemble_research_parts(research_paths, research_jobs, parts_dir, research_dest)
+            else:
+                research = process_research_files(research_paths, research_dest, stream, block_size)
+            stats['errors'].extend(research['errors'])
+            stats['timings'].extend(research['timings'])
+
+            if research['combined_size']:
+                if not research['errors']:
+                    manifest.record(research_dest, research_present, research_sha256)
+                stats['changed'].append(research_dest)
+                stats['files_processed'] += len(research_paths)
+                stats['total_original'] += research['original']
+                stats['total_normalized'] += research['normalized']
+                print(f"   ✓ Combined: {research['files']} files → {research['combined_size']:,} bytes")
+        print()
+    finally:
+        if executor:
+            executor.shutdown()
+        if parts_dir:
+            shutil.rmtree(parts_dir, ignore_errors=True)
+
+    manifest.save()
+    return stats
+
 
-    # Summary
+def print_summary(stats: Dict, wall_time: float, workers: int) -> None:
+    """Print the end-of-run summary"""
     print("=" * 60)
     print("NORMALIZATION COMPLETE")
     print("=" * 60)
     print(f"Files processed: {stats['files_processed']}")
+    print(f"Files skipped:   {stats['files_skipped']} (unchanged)")
     print(f"Original size:   {stats['total_original']:,} bytes")
     print(f"Normalized size: {stats['total_normalized']:,} bytes")
     print(f"Size change:     {stats['total_normalized'] - stats['total_original']:+,} bytes")
     print()
 
+    if stats['timings']:
+        busy_time = sum(seconds for _, seconds in stats['timings'])
+        print(f"Per-file CPU time ({workers} worker{'s' if workers > 1 else ''}):")
+        for name, seconds in stats['timings']:
+            print(f"   {seconds * 1000:8.1f} ms  {name}")
+        print(f"Sum of file times: {busy_time * 1000:8.1f} ms")
+        print(f"Wall time:         {wall_time * 1000:8.1f} ms")
+        if workers > 1:
+            # Serial run time is roughly the CPU sum, so this is the gain
+            print(f"Parallel speedup:  {busy_time / wall_time:8.2f}x (of {os.cpu_count()} cores)")
+        print()
+
     if stats['errors']:
         print(f"⚠️  Errors: {len(stats['errors'])}")
         for error in stats['errors']:
@@ -228,6 +626,130 @@ def main():
         print(f"   ✓ {file.name} ({size:,} bytes)")
     print()
 
+
+def watch_sources(source_root: Path, interval: float, stream: bool, block_size: int,
+                  changes_path: Path) -> None:
+    """
+    Poll the source root and, whenever a source changes, re-normalize and
+    re-parse only the affected staging files. Each added/changed/removed
+    chunk is appended to changes_path as one JSON line.
+    """
+    # Imported here so plain normalization doesn't need the parsers
+    from parse_targets import OUTPUT_DIR, parse_staging_file, reparse_to_output
+    from chunk_identity import diff_chunks
+
+    manifest = StagingManifest.load(STAGING_DIR / MANIFEST_NAME, NORMALIZER_VERSION)
+
+    # Baseline parse of whatever is staged now
+    parsed = {}
+    for _, _, dest_path in staging_targets(discover_sources(source_root)):
+        if dest_path.exists():
+            parsed[dest_path.name] = parse_staging_file(dest_path)
+
+    print(f"👀 Watching {source_root} every {interval:g}s (Ctrl+C to stop)")
+    print(f"   Changes → {changes_path}")
+    print()
+
+    changes_path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        while True:
+            sources = discover_sources(source_root)
+            if stale_targets(manifest, sources):
+                cycle_start = time.perf_counter()
+                stats = normalize_all(sources, manifest, stream=stream, block_size=block_size)
+
+                with open(changes_path, 'a', encoding='utf-8') as out:
+                    for dest_path in stats['changed']:
+                        protocols = reparse_to_output(dest_path, OUTPUT_DIR)
+                        changes = diff_chunks(parsed.get(dest_path.name, []), protocols)
+                        parsed[dest_path.name] = protocols
+
+                        for change in changes:
+                            out.write(json.dumps({'staging_file': dest_path.name, **change},
+                                                 ensure_ascii=False) + '\n')
+                            print(f"   {change['op']:>7}: {change['chunk'].get('chunk_summary')}")
+                        print(f"   ✓ {dest_path.name}: {len(changes)} affected chunks")
+
+                elapsed = time.perf_counter() - cycle_start
+                print(f"   ⏱  Rebuilt in {elapsed * 1000:.0f} ms")
+                print()
+
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+
+
+def main():
+    """Main normalization workflow"""
+    parser = argparse.ArgumentParser(description='Normalize MIO source files into staging/')
+    parser.add_argument(
+        '--source-root',
+        type=Path,
+        default=DEFAULT_SOURCE_ROOT,
+        help='Directory the SOURCE_RULES globs are resolved against (default: $MIO_SOURCE_ROOT)'
+    )
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Normalize in line-aligned blocks with bounded memory (same output)'
+    )
+    parser.add_argument(
+        '--block-size',
+        type=int,
+        default=STREAM_BLOCK_SIZE,
+        help=f'Characters per read in --stream mode (default: {STREAM_BLOCK_SIZE:,})'
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help=f'Rebuild every staging file even if {MANIFEST_NAME} says it is up to date'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Normalize sources concurrently in a process pool of this size (default: 1, serial)'
+    )
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        help='Keep polling the sources and re-normalize/re-parse only what changed'
+    )
+    parser.add_argument(
+        '--interval',
+        type=float,
+        default=1.0,
+        help='Seconds between polls in --watch mode (default: 1.0)'
+    )
+    parser.add_argument(
+        '--changes-file',
+        type=Path,
+        default=Path(__file__).parent / 'output' / 'watch-changes.jsonl',
+        help='Where --watch appends affected chunks (default: output/watch-changes.jsonl)'
+    )
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("MIO Protocol Parser - Day 1: File Normalization")
+    print("=" * 60)
+    print()
+
+    # Create directories
+    STAGING_DIR.mkdir(parents=True, exist_ok=True)
+    BACKUP_DIR.mkdir(parents=True, exist_ok=True)
+
+    sources = discover_sources(args.source_root)
+    manifest = StagingManifest.load(STAGING_DIR / MANIFEST_NAME, NORMALIZER_VERSION)
+
+    run_start = time.perf_counter()
+    stats = normalize_all(sources, manifest, force=args.force, stream=args.stream,
+                          block_size=args.block_size, workers=args.workers)
+    print_summary(stats, time.perf_counter() - run_start, args.workers)
+
+    if args.watch:
+        watch_sources(args.source_root, args.interval, args.stream, args.block_size, args.changes_file)
+        return
+
     print("✅ Ready for parser development (Day 2-4)")
     print()
 
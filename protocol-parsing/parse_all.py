@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+MIO Protocol Parser - Parse All
+Runs every registered parser (parse_targets.PARSE_TARGETS) over its staging
+file concurrently in a process pool, then merges the results in registry
+order whatever order the workers finish in.
+
+Each protocol keeps its per-file chunk_number and gets a
+global_chunk_number, unique across all three outputs (1..N in merge order).
+Every parser runs in a fresh worker process (Python 3.11+; before that a
+worker may run two parsers), so its peak RSS is its own (interpreter
+included); with --workers 1 everything runs in this process and the peak
+RSS column is this process's running peak.
+
+Usage:
+    python3 parse_all.py
+    python3 parse_all.py --jsonl
+    python3 parse_all.py --workers 1 --no-write
+"""
+
+import argparse
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from parse_targets import OUTPUT_DIR, PARSE_TARGETS, STAGING_DIR
+from protocol_jsonl import jsonl_path, write_jsonl
+
+# One task per worker process needs Python 3.11+
+POOL_OPTIONS = {'max_tasks_per_child': 1} if sys.version_info >= (3, 11) else {}
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """This process's peak resident set size so far"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024  # Linux reports KiB
+
+
+def run_target(staging_name: str, staging_dir: Path) -> Dict[str, Any]:
+    """Parse one staging file; picklable for process pools"""
+    target = PARSE_TARGETS[staging_name]
+    start = time.perf_counter()
+    protocols = target.parse(Path(staging_dir) / staging_name)
+    return {
+        'staging_name': staging_name,
+        'protocols': protocols,
+        'wall_time': time.perf_counter() - start,
+        'peak_rss': peak_rss_bytes(),
+    }
+
+
+def parse_all(staging_dir: Path = STAGING_DIR, workers: int = len(PARSE_TARGETS)) -> List[Dict[str, Any]]:
+    """
+    Parse every registered staging file that exists, returning one result
+    per file in PARSE_TARGETS order with global_chunk_number assigned
+    """
+    names = [name for name in PARSE_TARGETS if (staging_dir / name).exists()]
+    for name in PARSE_TARGETS:
+        if name not in names:
+            print(f"⚠️  {staging_dir / name} not found, skipping")
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(names) or 1), **POOL_OPTIONS) as executor:
+            futures = [executor.submit(run_target, name, staging_dir) for name in names]
+            results = [future.result() for future in futures]
+    else:
+        results = [run_target(name, staging_dir) for name in names]
+
+    # Futures are collected in submission order, so the merge is deterministic
+    global_chunk_number = 0
+    for result in results:
+        for protocol in result['protocols']:
+            global_chunk_number += 1
+            protocol['global_chunk_number'] = global_chunk_number
+
+    return results
+
+
+def write_results(results: List[Dict[str, Any]], staging_dir: Path, output_dir: Path, jsonl: bool) -> None:
+    """Write each parser's protocols to its output file"""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for result in results:
+        target = PARSE_TARGETS[result['staging_name']]
+        if jsonl:
+            write_jsonl(result['protocols'], output_dir / jsonl_path(target.output_name))
+        else:
+            target.write(result['protocols'], output_dir / target.output_name, staging_dir / target.staging_name)
+
+
+def format_rss(peak: Optional[int]) -> str:
+    return f"{peak / 1024 / 1024:.1f}" if peak is not None else "n/a"
+
+
+def print_report(results: List[Dict[str, Any]], wall_time: float, workers: int) -> None:
+    """Per-parser wall time, chunks/sec and peak RSS"""
+    print(f"{'Parser':<34} {'Chunks':>7} {'Wall ms':>9} {'Chunks/s':>10} {'Peak RSS MB':>12}")
+    for result in results:
+        count = len(result['protocols'])
+        seconds = result['wall_time']
+        rate = count / seconds if seconds else 0.0
+        print(f"{result['staging_name']:<34} {count:>7} {seconds * 1000:9.1f} {rate:10,.0f} "
+              f"{format_rss(result['peak_rss']):>12}")
+
+    total = sum(len(result['protocols']) for result in results)
+    busy_time = sum(result['wall_time'] for result in results)
+    print()
+    print(f"Total chunks:        {total}")
+    print(f"Sum of parser times: {busy_time * 1000:8.1f} ms")
+    mode = f"{workers} workers, pool start-up included" if workers > 1 else "serial"
+    print(f"Wall time:           {wall_time * 1000:8.1f} ms ({total / wall_time:,.0f} chunks/s, {mode})")
+    print(f"Driver peak RSS:     {format_rss(peak_rss_bytes())} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run every MIO parser concurrently and merge the results')
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=len(PARSE_TARGETS),
+        help=f'Process pool size (default: {len(PARSE_TARGETS)}, one per parser; 1 runs serially in-process)'
+    )
+    parser.add_argument(
+        '--staging-dir',
+        type=Path,
+        default=STAGING_DIR,
+        help='Directory holding the staging files (default: staging/)'
+    )
+    parser.add_argument(
+        '--output-dir',
+        type=Path,
+        default=OUTPUT_DIR,
+        help='Directory for the parsed files (default: output/)'
+    )
+    parser.add_argument(
+        '--jsonl',
+        action='store_true',
+        help='Write output/*-parsed.jsonl instead of the array files'
+    )
+    parser.add_argument(
+        '--no-write',
+        action='store_true',
+        help='Parse and report only'
+    )
+    args = parser.parse_args()
+
+    print("=" * 76)
+    print("MIO Protocol Parser - Parse All")
+    print("=" * 76)
+    print()
+
+    run_start = time.perf_counter()
+    results = parse_all(args.staging_dir, args.workers)
+    wall_time = time.perf_counter() - run_start
+
+    print_report(results, wall_time, args.workers)
+
+    if not args.no_write:
+        write_results(results, args.staging_dir, args.output_dir, args.jsonl)
+        print()
+        for result in results:
+            target = PARSE_TARGETS[result['staging_name']]
+            output_name = jsonl_path(target.output_name).name if args.jsonl else target.output_name
+            print(f"✓ {len(result['protocols'])} protocols → {args.output_dir / output_name}")
+
+
+if __name__ == '__main__':
+    main()
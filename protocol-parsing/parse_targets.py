@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+MIO Protocol Parser - Parse Targets
+Maps each staging file to the parser that reads it and the output file its
+parser's main() writes, so other steps can re-parse a single staging file.
+
+Usage:
+    python3 parse_targets.py                # output/*-parsed.json
+    python3 parse_targets.py --jsonl        # output/*-parsed.jsonl, streamed
+    python3 parse_targets.py --incremental  # also output/changeset.jsonl
+
+--incremental compares each parse with the previous output by chunk_id and
+content_hash (see parsers/chunk_identity.py), rewrites only outputs that
+changed, and writes the added/changed/moved/removed chunks to the changeset.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple
+
+BASE_DIR = Path(__file__).parent
+PARSERS_DIR = BASE_DIR / 'parsers'
+STAGING_DIR = BASE_DIR / 'staging'
+OUTPUT_DIR = BASE_DIR / 'output'
+CHANGESET_FILE = OUTPUT_DIR / 'changeset.jsonl'
+
+if str(PARSERS_DIR) not in sys.path:
+    sys.path.insert(0, str(PARSERS_DIR))
+
+from chunk_identity import diff_chunks  # noqa: E402
+from parse_daily_deductible import DailyDeductibleParser  # noqa: E402
+from parse_neural_rewiring import iter_neural_rewiring_file  # noqa: E402
+from parse_research_protocols import ResearchProtocolParser  # noqa: E402
+from protocol_jsonl import iter_protocol_file, jsonl_path, resolve_input, write_jsonl  # noqa: E402
+
+
+def iter_daily_deductible(staging_path: Path) -> Iterator[Dict[str, Any]]:
+    return DailyDeductibleParser().iter_file(str(staging_path))
+
+
+def iter_neural_rewiring(staging_path: Path) -> Iterator[Dict[str, Any]]:
+    return iter_neural_rewiring_file(str(staging_path))
+
+
+def iter_research_protocols(staging_path: Path) -> Iterator[Dict[str, Any]]:
+    return ResearchProtocolParser().iter_file(staging_path.read_text(encoding='utf-8'))
+
+
+def parse_daily_deductible(staging_path: Path) -> List[Dict[str, Any]]:
+    return list(iter_daily_deductible(staging_path))
+
+
+def parse_neural_rewiring(staging_path: Path) -> List[Dict[str, Any]]:
+    return list(iter_neural_rewiring(staging_path))
+
+
+def parse_research_protocols(staging_path: Path) -> List[Dict[str, Any]]:
+    return list(iter_research_protocols(staging_path))
+
+
+def write_protocol_list(protocols: List[Dict[str, Any]], output_path: Path) -> None:
+    """Output format of parse_daily_deductible.py / parse_neural_rewiring.py"""
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(protocols, f, indent=2, ensure_ascii=False)
+
+
+def write_research_output(protocols: List[Dict[str, Any]], output_path: Path, staging_path: Path) -> None:
+    """Output format of ResearchProtocolParser.parse_and_save()"""
+    stats = ResearchProtocolParser().generate_statistics(protocols)
+    output_data = {
+        'metadata': {
+            'source_file': str(staging_path),
+            'total_protocols': len(protocols),
+            'kb_files_processed': len(set(p['source_file'] for p in protocols)),
+            'statistics': stats
+        },
+        'protocols': protocols
+    }
+    output_path.write_text(json.dumps(output_data, indent=2), encoding='utf-8')
+
+
+class ParseTarget(NamedTuple):
+    """How one staging file is parsed and where the result goes"""
+    staging_name: str
+    output_name: str
+    parse: Callable[[Path], List[Dict[str, Any]]]
+    write: Callable[[List[Dict[str, Any]], Path, Path], None]
+    iterate: Callable[[Path], Iterator[Dict[str, Any]]]
+
+
+PARSE_TARGETS = {
+    'daily-deductible-normalized.md': ParseTarget(
+        'daily-deductible-normalized.md',
+        'daily-deductible-parsed.json',
+        parse_daily_deductible,
+        lambda protocols, output_path, staging_path: write_protocol_list(protocols, output_path),
+        iter_daily_deductible
+    ),
+    'neural-rewiring-normalized.txt': ParseTarget(
+        'neural-rewiring-normalized.txt',
+        'neural-rewiring-parsed.json',
+        parse_neural_rewiring,
+        lambda protocols, output_path, staging_path: write_protocol_list(protocols, output_path),
+        iter_neural_rewiring
+    ),
+    'research-protocols-combined.md': ParseTarget(
+        'research-protocols-combined.md',
+        'research-protocols-parsed.json',
+        parse_research_protocols,
+        write_research_output,
+        iter_research_protocols
+    ),
+}
+
+
+def parse_staging_file(staging_path: Path) -> List[Dict[str, Any]]:
+    """Parse one staging file with its registered parser"""
+    return PARSE_TARGETS[staging_path.name].parse(staging_path)
+
+
+def iter_staging_file(staging_path: Path) -> Iterator[Dict[str, Any]]:
+    """Yield one staging file's protocols lazily with its registered parser"""
+    return PARSE_TARGETS[staging_path.name].iterate(staging_path)
+
+
+def reparse_to_output(staging_path: Path, output_dir: Path = OUTPUT_DIR) -> List[Dict[str, Any]]:
+    """Parse one staging file and rewrite its output/*-parsed.json"""
+    target = PARSE_TARGETS[staging_path.name]
+    protocols = target.parse(staging_path)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    target.write(protocols, output_dir / target.output_name, staging_path)
+    return protocols
+
+
+def stream_to_jsonl(staging_path: Path, output_dir: Path = OUTPUT_DIR) -> int:
+    """
+    Parse one staging file into output/*-parsed.jsonl, writing each
+    protocol as soon as its parser yields it; returns the count
+    """
+    target = PARSE_TARGETS[staging_path.name]
+    return write_jsonl(target.iterate(staging_path), output_dir / jsonl_path(target.output_name))
+
+
+def reparse_incremental(staging_path: Path, output_dir: Path = OUTPUT_DIR, jsonl: bool = False) -> List[Dict[str, Any]]:
+    """
+    Parse one staging file and diff it against its previous output (array
+    or JSONL, whichever is newer). The output is rewritten only if some
+    chunk was added, changed, moved or removed; returns those changes.
+    """
+    target = PARSE_TARGETS[staging_path.name]
+    array_path = output_dir / target.output_name
+    output_path = jsonl_path(array_path) if jsonl else array_path
+
+    previous_path = resolve_input(array_path)
+    previous = list(iter_protocol_file(previous_path)) if previous_path.exists() else []
+
+    protocols = target.parse(staging_path)
+    changes = diff_chunks(previous, protocols)
+
+    if changes or not output_path.exists():
+        output_dir.mkdir(parents=True, exist_ok=True)
+        if jsonl:
+            write_jsonl(protocols, output_path)
+        else:
+            target.write(protocols, output_path, staging_path)
+
+    return changes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Re-parse staging files into output/')
+    parser.add_argument(
+        'staging_files',
+        type=Path,
+        nargs='*',
+        help='Staging files to parse (default: every registered file in staging/)'
+    )
+    parser.add_argument(
+        '--jsonl',
+        action='store_true',
+        help='Stream one protocol per line to output/*-parsed.jsonl instead of the array files'
+    )
+    parser.add_argument(
+        '--output-dir',
+        type=Path,
+        default=OUTPUT_DIR,
+        help='Directory for the parsed files (default: output/)'
+    )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Diff against the previous output and write only the affected chunks to the changeset'
+    )
+    parser.add_argument(
+        '--changeset',
+        type=Path,
+        help='Where --incremental writes changes, one JSON line each (default: <output-dir>/changeset.jsonl)'
+    )
+    args = parser.parse_args()
+
+    staging_files = args.staging_files or [STAGING_DIR / name for name in PARSE_TARGETS]
+
+    if args.incremental:
+        changeset_path = args.changeset or args.output_dir / CHANGESET_FILE.name
+        all_changes = []
+        for staging_path in staging_files:
+            if staging_path.name not in PARSE_TARGETS:
+                print(f"⚠️  No parser registered for {staging_path.name}, skipping")
+                continue
+
+            changes = reparse_incremental(staging_path, args.output_dir, args.jsonl)
+            all_changes.extend({'staging_file': staging_path.name, **change} for change in changes)
+
+            counts = {op: sum(1 for change in changes if change['op'] == op)
+                      for op in ('added', 'changed', 'moved', 'removed')}
+            summary = ', '.join(f"{count} {op}" for op, count in counts.items() if count) or 'unchanged'
+            print(f"✓ {staging_path.name}: {summary}")
+
+        write_jsonl(all_changes, changeset_path)
+        print(f"✓ {len(all_changes)} affected chunks → {changeset_path}")
+        return
+
+    for staging_path in staging_files:
+        if staging_path.name not in PARSE_TARGETS:
+            print(f"⚠️  No parser registered for {staging_path.name}, skipping")
+            continue
+
+        target = PARSE_TARGETS[staging_path.name]
+        if args.jsonl:
+            count = stream_to_jsonl(staging_path, args.output_dir)
+            output_name = jsonl_path(target.output_name).name
+        else:
+            count = len(reparse_to_output(staging_path, args.output_dir))
+            output_name = target.output_name
+        print(f"✓ {staging_path.name} → {output_name} ({count} protocols)")
+
+
+if __name__ == '__main__':
+    main()
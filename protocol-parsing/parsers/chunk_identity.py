@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Chunk Identity - MIO Protocol Parsing System
+Stable identities and content hashes for parsed chunks, and the changeset
+between two parses of the same staging file
+
+chunk_id is the chunk's source file plus its structural path, so it
+survives edits to other chunks:
+    daily_deductible_library.md#traditional-foundation/1
+    neural_rewiring_protocols.txt#comparison_catastrophe/warrior/practice-1
+    mio-kb-03-protocol-library.md#practice-1-prayer-and-worship
+
+content_hash is the SHA-256 of the chunk's fields other than its identity,
+hash and chunk numbers, so renumbering alone does not change it.
+
+Changeset records (one JSON line each, see diff_chunks):
+    {"op": "added" | "changed" | "moved" | "removed",
+     "chunk_id": ..., "content_hash": ..., "previous_hash": ..., "chunk": {...}}
+"moved" is an unchanged chunk whose chunk_number shifted: its metadata
+needs updating but not its embedding. "removed" carries the previous chunk.
+"""
+
+import hashlib
+import json
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+# Fields left out of content_hash
+UNHASHED_FIELDS = ('chunk_id', 'content_hash', 'chunk_number', 'global_chunk_number')
+
+SLUG_SEPARATORS = re.compile(r'[^a-z0-9]+')
+
+
+def slugify(text: str) -> str:
+    """'Success Sabotage - Burnout' -> 'success-sabotage-burnout'"""
+    return SLUG_SEPARATORS.sub('-', text.lower()).strip('-')
+
+
+def make_chunk_id(source_file: str, *path: Any) -> str:
+    return f"{source_file}#{'/'.join(str(part) for part in path)}"
+
+
+def content_hash(protocol: Dict[str, Any]) -> str:
+    """SHA-256 of the protocol's content fields, key order independent"""
+    content = {key: value for key, value in protocol.items() if key not in UNHASHED_FIELDS}
+    # ASCII-escaped output takes json's fastest encoder path
+    encoded = json.dumps(content, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('ascii')).hexdigest()
+
+
+def stamp_identity(protocol: Dict[str, Any], *path: Any) -> Dict[str, Any]:
+    """Set chunk_id (source_file + path) and content_hash on protocol"""
+    protocol['chunk_id'] = make_chunk_id(protocol['source_file'], *path)
+    protocol['content_hash'] = content_hash(protocol)
+    return protocol
+
+
+def chunk_key(protocol: Dict[str, Any]) -> str:
+    """chunk_id, or one derived from the old position fields for output
+    written before chunks carried an identity"""
+    return protocol.get('chunk_id') or make_chunk_id(protocol.get('source_file'), protocol.get('chunk_number'))
+
+
+def chunk_hash(protocol: Dict[str, Any]) -> str:
+    return protocol.get('content_hash') or content_hash(protocol)
+
+
+def change(op: str, protocol: Dict[str, Any], previous_hash: Optional[str] = None) -> Dict[str, Any]:
+    return {
+        'op': op,
+        'chunk_id': chunk_key(protocol),
+        'content_hash': chunk_hash(protocol),
+        'previous_hash': previous_hash,
+        'chunk': protocol,
+    }
+
+
+def diff_chunks(previous: Iterable[Dict[str, Any]], current: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Added, changed, moved and removed chunks between two parses of one staging file"""
+    before = {chunk_key(p): p for p in previous}
+    changes = []
+    seen = set()
+
+    for protocol in current:
+        key = chunk_key(protocol)
+        seen.add(key)
+        old = before.get(key)
+        if old is None:
+            changes.append(change('added', protocol))
+        elif chunk_hash(old) != chunk_hash(protocol):
+            changes.append(change('changed', protocol, chunk_hash(old)))
+        elif old.get('chunk_number') != protocol.get('chunk_number'):
+            changes.append(change('moved', protocol, chunk_hash(old)))
+
+    for key, protocol in before.items():
+        if key not in seen:
+            changes.append(change('removed', protocol, chunk_hash(protocol)))
+
+    return changes
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Keyword Matcher - MIO Protocol Parsing System
+Multi-keyword matcher for the parsers' pattern/temperament keyword tables
+
+A table like {'sage': ['wisdom', 'reflect'], 'warrior': ['action']} is
+compiled once into a single trie-shaped regex (shared prefixes factored
+out, longest keyword preferred), so a chunk is scanned in one pass instead
+of once per keyword. Each search restarts one character after the previous
+hit, so overlapping keywords are all found; keywords that are prefixes of a
+longer hit at the same position ('comparison' in 'comparison collision')
+are resolved from a precomputed table, like Aho-Corasick output links.
+
+Boolean lookups on small tables still use one `keyword in text` per
+keyword: CPython's substring search is fast enough that a regex pass only
+wins past roughly SCAN_MAX_KEYWORDS keywords (see
+benchmarks/bench_keyword_matcher.py). Positions and counts always come
+from the single trie pass.
+
+Matching is case-sensitive; the parsers lower-case text before matching,
+as their keyword tables are lower case.
+"""
+
+import re
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+# Largest table matched_labels answers with per-keyword substring scans
+SCAN_MAX_KEYWORDS = 100
+
+
+def trie_pattern(keywords: Iterable[str]) -> str:
+    """
+    Regex source matching any of keywords, built from their trie so
+    alternatives share prefixes, e.g. 'depletion' and 'depletion dedication'
+    -> 'depletion(?:\\ dedication)?'. Optional tails are greedy, so the
+    longest keyword at a position wins.
+    """
+    trie: Dict[str, Dict] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}  # End of a keyword
+
+    def build(node: Dict[str, Dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return '(?:' + body + ')?' if '' in node else body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """Compiled matcher for one label -> keywords table"""
+
+    def __init__(self, table: Dict[str, Iterable[str]]):
+        self.labels = list(table)
+        self.table = {label: tuple(keywords) for label, keywords in table.items()}
+        self.keyword_count = sum(len(keywords) for keywords in self.table.values())
+        self.keyword_labels: Dict[str, List[str]] = {}
+        self.empty_keyword_labels = set()  # '' is in every text
+
+        for label, keywords in table.items():
+            for keyword in keywords:
+                if not keyword:
+                    self.empty_keyword_labels.add(label)
+                    continue
+                labels = self.keyword_labels.setdefault(keyword, [])
+                if label not in labels:
+                    labels.append(label)
+
+        # Every keyword that is a prefix of (or equal to) each keyword
+        self.prefix_keywords: Dict[str, List[str]] = {
+            keyword: [other for other in self.keyword_labels if keyword.startswith(other)]
+            for keyword in self.keyword_labels
+        }
+
+        self.pattern = re.compile(trie_pattern(self.keyword_labels)) if self.keyword_labels else None
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, str]]:
+        """Yield (start, keyword) for every keyword occurrence, in text order"""
+        if self.pattern is None:
+            return
+
+        search = self.pattern.search
+        match = search(text)
+        while match:
+            start = match.start()
+            for keyword in self.prefix_keywords[match.group()]:
+                yield start, keyword
+            match = search(text, start + 1)
+
+    def match_positions(self, text: str) -> Dict[str, List[Tuple[int, str]]]:
+        """Label -> (start, keyword) of each of its keyword hits, for labels with hits"""
+        positions: Dict[str, List[Tuple[int, str]]] = {}
+        for start, keyword in self.iter_matches(text):
+            for label in self.keyword_labels[keyword]:
+                positions.setdefault(label, []).append((start, keyword))
+        return positions
+
+    def match_counts(self, text: str) -> Dict[str, int]:
+        """Label -> number of keyword hits, in table order, for weighted inference"""
+        positions = self.match_positions(text)
+        return {label: len(positions[label]) for label in self.labels if label in positions}
+
+    def matched_labels(self, text: str) -> List[str]:
+        """
+        Labels with at least one keyword in text, in table order - the same
+        result as checking `any(keyword in text for keyword in keywords)`
+        for each label
+        """
+        if self.keyword_count <= SCAN_MAX_KEYWORDS:
+            return self.scan_labels(text)
+        return self.trie_labels(text)
+
+    def scan_labels(self, text: str) -> List[str]:
+        """matched_labels by one substring scan per keyword"""
+        return [label for label, keywords in self.table.items() if any(keyword in text for keyword in keywords)]
+
+    def trie_labels(self, text: str) -> List[str]:
+        """matched_labels by a single trie pass over text"""
+        found = set(self.empty_keyword_labels)
+        for _, keyword in self.iter_matches(text):
+            found.update(self.keyword_labels[keyword])
+            if len(found) == len(self.labels):
+                break
+        return [label for label in self.labels if label in found]
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Markdown Event Tokenizer - MIO Protocol Parsing System
+Walks a normalized source once and yields the structural lines the parsers
+care about as typed events with character offsets into the original text.
+
+The parsers track their state from the event stream and slice the buffer
+only when building a chunk, instead of each one re-splitting the document
+with its own regexes.
+
+Event kinds:
+    HEADING    '#### Practice 1: ...'         level = number of '#'
+    SOURCE     '# SOURCE FILE: mio-kb-01.md'  text = file name
+    FIELD      '**Why it works:** ...'        text = label ('**Label:**' or '**Label**:')
+    LIST_ITEM  '  - item' / '3. step'         level = indent width
+    RULE       '---' / '=' * 80               level = run length
+    MARKER     'PRACTICE 3:' / '=== NAME ==='  research chunk boundaries
+
+Every event carries the line bounds (start, end - end excludes the newline),
+the text span (text_start, text_end) and body_start, where the line's inline
+content begins (after the '#'s, the field label or the list bullet).
+"""
+
+from typing import Container, Iterator, List, NamedTuple, Optional
+
+from regex_registry import MARKDOWN_EVENT
+
+HEADING = 'heading'
+SOURCE = 'source'
+FIELD = 'field'
+LIST_ITEM = 'list_item'
+RULE = 'rule'
+MARKER = 'marker'
+
+
+class Event(NamedTuple):
+    """One structural line of a document, as offsets into that document"""
+    kind: str
+    start: int
+    end: int
+    level: int
+    text_start: int
+    text_end: int
+    body_start: int
+
+    def text(self, content: str) -> str:
+        """Heading text, field label, source file name or marker line"""
+        return content[self.text_start:self.text_end]
+
+    def line(self, content: str) -> str:
+        """The whole line the event was found on"""
+        return content[self.start:self.end]
+
+
+# Group that closes last in each branch of MARKDOWN_EVENT -> event kind
+_BRANCH_KINDS = {
+    'source': SOURCE,
+    'heading': HEADING,
+    'rule': RULE,
+    'marker': MARKER,
+    'field': FIELD,
+    'item': LIST_ITEM,
+}
+
+
+def iter_events(content: str, pos: int = 0, endpos: Optional[int] = None,
+                kinds: Optional[Container[str]] = None) -> Iterator[Event]:
+    """
+    Yield the events of content[pos:endpos] in document order. Offsets are
+    always into content itself, so callers can slice the original buffer.
+    kinds limits the events built to the ones the caller handles.
+    """
+    if endpos is None:
+        endpos = len(content)
+
+    for match in MARKDOWN_EVENT.finditer(content, pos, endpos):
+        kind = _BRANCH_KINDS[match.lastgroup]
+        if kinds is not None and kind not in kinds:
+            continue
+
+        start, end = match.span()
+
+        if kind == HEADING:
+            text_start = match.start('heading')
+            yield Event(HEADING, start, end, len(match.group('hashes')), text_start, end, text_start)
+        elif kind == FIELD:
+            yield Event(FIELD, start, end, 0, match.start('field'), match.end('field'), match.end('field') + 3)
+        elif kind == LIST_ITEM:
+            text_start = match.start('item')
+            yield Event(LIST_ITEM, start, end, len(match.group('indent')), text_start, end, text_start)
+        elif kind == RULE:
+            yield Event(RULE, start, end, end - start, start, end, end)
+        elif kind == MARKER:
+            yield Event(MARKER, start, end, 0, start, end, start)
+        else:
+            text_start = match.start('source')
+            yield Event(SOURCE, start, end, 1, text_start, end, text_start)
+
+
+def tokenize(content: str) -> List[Event]:
+    """All events of a document as a list"""
+    return list(iter_events(content))
+
+
+def block_lines(content: str, start: int, end: int) -> List[str]:
+    """Stripped, non-empty lines of content[start:end]"""
+    return [line.strip() for line in content[start:end].split('\n') if line.strip()]
@@ -8,11 +8,24 @@ Input: Normalized markdown file with practice structure
 Output: JSON array ready for database import
 """
 
-import re
 import json
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 from pathlib import Path
 
+from chunk_identity import stamp_identity
+from keyword_matcher import KeywordMatcher
+from markdown_events import FIELD, HEADING, RULE, Event, block_lines, iter_events
+from regex_registry import (
+    DD_DURATION,
+    DD_PRACTICE_HEADER,
+    DD_PRACTICE_ID_TITLE,
+    DD_SECTION_HEADER,
+    DD_SECTION_NOTE,
+    DD_STATE_FIELD,
+    DD_TIME_FIELD,
+)
+from token_counter import count_tokens
+
 
 class DailyDeductibleParser:
     """Parser for Daily Deductible Library practices"""
@@ -47,6 +60,12 @@ class DailyDeductibleParser:
         "creator": ["visualization", "create", "imagine", "design", "vision"]
     }
 
+    # Temperament keywords compiled for single-pass matching
+    TEMPERAMENT_MATCHER = KeywordMatcher(TEMPERAMENT_KEYWORDS)
+
+    # Field labels that structure a practice block
+    FIELD_LABELS = {"Time", "The State It Creates", "Instructions", "Why it works"}
+
     def __init__(self):
         self.current_category = None
         self.practices = []
@@ -59,25 +78,31 @@ class DailyDeductibleParser:
         if not time_str or "varies" in time_str.lower() or "throughout" in time_str.lower():
             return None, None
 
-        # Look for range: "5-30 minutes" or "10-20 minutes"
-        range_match = re.search(r'(\d+)\s*-\s*(\d+)\s*min', time_str, re.IGNORECASE)
-        if range_match:
-            return int(range_match.group(1)), int(range_match.group(2))
+        # First of each duration form, e.g. "5-30 minutes" / "10 minutes" /
+        # "1-4 hours" / "1 hour", in one pass. Priority: range in minutes,
+        # then single minutes, then hour range, then single hours
+        durations = {}
+        for match in DD_DURATION.finditer(time_str):
+            low, high, unit = match.groups()
+            is_minutes = unit.lower() == 'min'
+
+            # Look for range: "5-30 minutes" or "10-20 minutes"
+            if is_minutes and high is not None:
+                return int(low), int(high)
+            durations.setdefault((is_minutes, high is not None), match)
 
-        # Look for single value: "10 minutes"
-        single_match = re.search(r'(\d+)\s*min', time_str, re.IGNORECASE)
+        single_match = durations.get((True, False))
         if single_match:
-            val = int(single_match.group(1))
+            val = int(single_match.group('low'))
             return val, val
 
-        # Look for hour-based: "1-4 hours" or "1 hour"
-        hour_range_match = re.search(r'(\d+)\s*-\s*(\d+)\s*hour', time_str, re.IGNORECASE)
+        hour_range_match = durations.get((False, True))
         if hour_range_match:
-            return int(hour_range_match.group(1)) * 60, int(hour_range_match.group(2)) * 60
+            return int(hour_range_match.group('low')) * 60, int(hour_range_match.group('high')) * 60
 
-        hour_match = re.search(r'(\d+)\s*hour', time_str, re.IGNORECASE)
+        hour_match = durations.get((False, False))
         if hour_match:
-            val = int(hour_match.group(1)) * 60
+            val = int(hour_match.group('low')) * 60
             return val, val
 
         return None, None
@@ -115,11 +140,7 @@ class DailyDeductibleParser:
         Infer temperament match based on practice characteristics
         """
         text = (practice_title + " " + instructions).lower()
-        temperaments = []
-
-        for temp, keywords in self.TEMPERAMENT_KEYWORDS.items():
-            if any(keyword in text for keyword in keywords):
-                temperaments.append(temp)
+        temperaments = self.TEMPERAMENT_MATCHER.matched_labels(text)
 
         # Default to sage if no matches
         return temperaments if temperaments else ["sage"]
@@ -129,30 +150,60 @@ class DailyDeductibleParser:
         Extract practice ID from header like "#### **1\. Prayer and Worship**"
         Note: Escaped periods in markdown (1\. not 1.)
         """
-        match = re.search(r'####\s+\*\*(\d+)\\?\.\s+(.+?)\*\*', header)
+        match = DD_PRACTICE_ID_TITLE.search(header)
         if match:
-            return int(match.group(1))
+            return int(match.group('id'))
         return None
 
     def extract_practice_title(self, header: str) -> Optional[str]:
         """
         Extract practice title from header
         """
-        match = re.search(r'####\s+\*\*\d+\\?\.\s+(.+?)\*\*', header)
+        match = DD_PRACTICE_ID_TITLE.search(header)
         if match:
-            return match.group(1).strip()
+            return match.group('title').strip()
         return None
 
+    @staticmethod
+    def category_name(section_title: str) -> str:
+        """
+        Section header title without its parenthetical description and
+        escaped chars: "Faith-Based Practices (Christian Focus)" ->
+        "Faith-Based Practices"
+        """
+        category_name = section_title.strip()
+        # Only a title ending in ')' can have a note to remove
+        if category_name.endswith(')'):
+            category_name = DD_SECTION_NOTE.sub('', category_name)
+        return category_name.replace('\\', '')  # Remove escape chars
+
+    def resolve_category(self, section_title: str) -> str:
+        """
+        Map a section header title to its category slug
+        """
+        return self.CATEGORY_MAP.get(self.category_name(section_title), "traditional-foundation")
+
     def parse_practice(self, practice_text: str, chunk_number: int) -> Optional[Dict]:
         """
         Parse a single practice block into structured JSON
         """
-        lines = practice_text.strip().split('\n')
+        practice_text = practice_text.strip()
+        fields = list(iter_events(practice_text, kinds=(FIELD,)))
+        return self._parse_practice_block(practice_text, 0, len(practice_text), fields, chunk_number)
 
+    def _parse_practice_block(self, content: str, start: int, end: int, fields: List[Event],
+                              chunk_number: int) -> Optional[Dict]:
+        """
+        Parse the practice at content[start:end], given the FIELD events
+        inside it, without splitting the block into lines
+        """
         # Extract header (first line)
-        header = lines[0]
-        practice_id = self.extract_practice_id(header)
-        practice_title = self.extract_practice_title(header)
+        header_end = content.find('\n', start, end)
+        if header_end == -1:
+            header_end = end
+        header_match = DD_PRACTICE_ID_TITLE.search(content, start, header_end)
+        practice_id = int(header_match.group('id')) if header_match else None
+        practice_title = header_match.group('title').strip() if header_match else None
 
         if not practice_id or not practice_title:
             return None
@@ -161,43 +212,46 @@ class DailyDeductibleParser:
         time_str = ""
         state_str = ""
         instructions_lines = []
-        why_it_works = ""
 
-        in_instructions = False
-        in_why = False
+        # Lines between labelled fields belong to the most recent
+        # Instructions field until a Why field ends it; Time and State
+        # lines don't change that
+        body_lines = None
+        position = header_end + 1
 
-        for line in lines[1:]:
-            line = line.strip()
+        for field in fields:
+            label = field.text(content)
+            if field.start < position or label not in self.FIELD_LABELS:
+                continue
+
+            if body_lines is not None:
+                body_lines.extend(block_lines(content, position, field.start))
+            position = field.end + 1
 
             # Extract time and state (often on same line)
-            if "**Time:**" in line:
-                # Extract time part
-                time_match = re.search(r'\*\*Time:\*\*\s*([^*]+?)(?:\s*\*\*|$)', line)
+            if label == "Time":
+                time_match = DD_TIME_FIELD.search(content, field.start, field.end)
                 if time_match:
                     time_str = time_match.group(1).strip()
 
                 # Extract state part (may be on same line)
                 # Stop at **Instructions:** if present
-                state_match = re.search(r'\*\*The State It Creates:\*\*\s*(.+?)(?:\s*\*\*Instructions:\*\*|$)', line)
+                state_match = DD_STATE_FIELD.search(content, field.start, field.end)
                 if state_match:
                     state_str = state_match.group(1).strip()
 
             # Extract states if on separate line
-            elif line.startswith("**The State It Creates:**"):
-                state_str = line.replace("**The State It Creates:**", "").strip()
+            elif label == "The State It Creates":
+                state_str = content[field.body_start:field.end].strip()
 
             # Extract instructions
-            elif line.startswith("**Instructions:**"):
-                in_instructions = True
-                in_why = False
-            elif line.startswith("**Why it works:**"):
-                in_why = True
-                in_instructions = False
-                why_it_works = line.replace("**Why it works:**", "").strip()
-            elif in_instructions and line:
-                instructions_lines.append(line)
-            elif in_why and line:
-                why_it_works += " " + line
+            elif label == "Instructions":
+                body_lines = instructions_lines
+            elif label == "Why it works":
+                body_lines = None
+
+        if body_lines is not None:
+            body_lines.extend(block_lines(content, position, end))
 
         # Parse time
         time_min, time_max = self.parse_time(time_str)
@@ -206,7 +260,7 @@ class DailyDeductibleParser:
         states = self.parse_states(state_str)
 
         # Build full chunk text
-        chunk_text = practice_text.strip()
+        chunk_text = content[start:end].strip()
 
         # Build instructions text
         instructions_text = "\n".join(instructions_lines)
@@ -217,8 +271,8 @@ class DailyDeductibleParser:
         temperament = self.infer_temperament(practice_title, instructions_text)
         difficulty = self.infer_difficulty(time_min, time_max)
 
-        # Calculate approximate tokens (rough estimate: 4 chars per token)
-        tokens_approx = len(chunk_text) // 4
+        # cl100k_base tokens, as the embeddings API counts them
+        tokens_approx = count_tokens(chunk_text)
 
         # Build practice object
         practice = {
@@ -241,73 +295,82 @@ class DailyDeductibleParser:
             "practice_frequency": "daily"
         }
 
-        return practice
+        return stamp_identity(practice, category, practice_id)
 
     def parse_file(self, file_path: str) -> List[Dict]:
         """
         Parse entire Daily Deductible markdown file
         """
+        self.practices = list(self.iter_file(file_path))
+
+        return self.practices
+
+    def iter_file(self, file_path: str) -> Iterator[Dict]:
+        """
+        Yield the file's practices one at a time, as iter_practices does
+        """
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
 
         # Use direct parsing method which handles categories properly
-        self.practices = self._parse_direct(content)
-
-        return self.practices
+        yield from self.iter_practices(content)
 
     def _parse_direct(self, content: str) -> List[Dict]:
         """
-        Alternative parsing method: find all practice headers and extract blocks
+        All practices in content (see iter_practices)
         """
-        practices = []
-
-        # Find all practice headers
-        practice_pattern = r'#### \*\*(\d+)\\\.\s+(.+?)\*\*'
-        practice_matches = list(re.finditer(practice_pattern, content))
-
-        # Find all section headers (categories)
-        # Must start with ### ** and NOT be followed by a digit (which would be a practice)
-        section_pattern = r'### \*\*(?!\d)(.+?)\*\*'
-        section_matches = list(re.finditer(section_pattern, content))
+        return list(self.iter_practices(content))
 
+    def iter_practices(self, content: str) -> Iterator[Dict]:
+        """
+        Single pass over the document's events: section headers set the
+        category, each practice header closes the previous practice block,
+        which is parsed and yielded before the next one is read
+        """
         chunk_number = 1
 
-        for i, match in enumerate(practice_matches):
-            start = match.start()
-
-            # Find which category this practice belongs to
-            # Look backwards from practice start to find the most recent section header
-            current_category = "traditional-foundation"  # Default
-            for section_match in reversed(section_matches):
-                if section_match.start() < start:
-                    category_name = section_match.group(1).strip()
-                    # Remove any parenthetical descriptions and escaped chars
-                    category_name = re.sub(r'\s*\(.+?\)\s*$', '', category_name)
-                    category_name = category_name.replace('\\', '')  # Remove escape chars
-                    current_category = self.CATEGORY_MAP.get(category_name, "traditional-foundation")
-                    break
-
-            # Set category for this practice
-            self.current_category = current_category
-
-            # End is either the next practice or end of section
-            if i + 1 < len(practice_matches):
-                end = practice_matches[i + 1].start()
-            else:
-                # Find next major section or end of file
-                next_section = content.find('\n---\n', start)
-                if next_section != -1:
-                    end = next_section
-                else:
-                    end = len(content)
-
-            practice_text = content[start:end].strip()
-            parsed = self.parse_practice(practice_text, chunk_number)
+        category = "traditional-foundation"  # Default before any section header
+        block = None  # [start, category, fields] of the practice being read
+        block_end = None  # First '---' rule after the block (ends the last practice)
+
+        for event in iter_events(content, kinds=(FIELD, HEADING, RULE)):
+            if event.kind == FIELD:
+                if block:
+                    block[2].append(event)
+
+            elif event.kind == HEADING:
+                if event.level == 4 and DD_PRACTICE_HEADER.match(content, event.text_start, event.end):
+                    # End is the next practice header
+                    if block:
+                        parsed = self._parse_block_in_category(content, block, event.start, chunk_number)
+                        if parsed:
+                            yield parsed
+                            chunk_number += 1
+                    block = [event.start, category, []]
+                    block_end = None
+
+                elif event.level == 3:
+                    # Must be a ### ** header NOT followed by a digit (which would be a practice)
+                    section_match = DD_SECTION_HEADER.match(content, event.text_start, event.end)
+                    if section_match:
+                        category = self.resolve_category(section_match.group(1))
+
+            elif event.kind == RULE and block and block_end is None:
+                if event.level == 3 and content[event.start] == '-' and event.end < len(content):
+                    block_end = event.start - 1
+
+        # The last practice ends at the next major section or end of file
+        if block:
+            end = block_end if block_end is not None else len(content)
+            block[2] = [field for field in block[2] if field.start < end]
+            parsed = self._parse_block_in_category(content, block, end, chunk_number)
             if parsed:
-                practices.append(parsed)
-                chunk_number += 1
+                yield parsed
 
-        return practices
+    def _parse_block_in_category(self, content: str, block: list, end: int, chunk_number: int) -> Optional[Dict]:
+        """Parse one practice block from iter_practices with its section's category"""
+        start, self.current_category, fields = block
+        return self._parse_practice_block(content, start, end, fields, chunk_number)
 
 
 def main():
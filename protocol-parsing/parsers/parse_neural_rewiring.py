@@ -5,10 +5,22 @@ Extracts Pattern × Temperament matrix protocols (40 total: 10 patterns × 4 tem
 Week 2 Day 2-4 of 6-week MIO transformation
 """
 
-import re
 import json
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator
+
+from chunk_identity import stamp_identity
+from markdown_events import FIELD, HEADING, RULE, Event, iter_events
+from regex_registry import (
+    NR_PARENTHETICAL,
+    NR_PATTERN_HEADER,
+    NR_PRACTICE_HEADER,
+    NR_PRACTICE_TITLE,
+    NR_PROTOCOL_TITLE,
+    NR_TEMPERAMENT_HEADER,
+    NR_TIME_FREQUENCY,
+    closed_end,
+)
 
 # Pattern to Temperament lookup
 TEMPERAMENTS = ["WARRIOR", "SAGE", "CONNECTOR", "BUILDER"]
@@ -20,6 +32,17 @@ PATTERN_NAMES = {
     "PERFORMANCE LIABILITY": "performance_liability"
 }
 
+# Practice fields and where each one's text stops: at the first of these
+# labels after it, or at the next '---' rule (None); otherwise at the end
+# of the practice
+PRACTICE_FIELDS = {
+    "Why This Rewires the Pattern": ("How to Do It",),
+    "How to Do It": ("Expected Outcome", "What to Do"),
+    "What to Do": None,
+    "Expected Outcome": None,
+    "When to Use": ("What to Do",),
+}
+
 
 def normalize_pattern_name(name: str) -> str:
     """Convert pattern name to snake_case identifier"""
@@ -34,8 +57,7 @@ def extract_time_and_frequency(practice_title: str) -> tuple:
     Example: "Social Media Detox Protocol (varies, ongoing)" -> (None, None, "ongoing")
     """
     # Pattern: (NUMBER minutes, FREQUENCY) or (varies, FREQUENCY)
-    time_pattern = r'\((\d+|varies)\s*(?:minutes?)?,?\s*([^)]+)\)'
-    match = re.search(time_pattern, practice_title, re.IGNORECASE)
+    match = NR_TIME_FREQUENCY.search(practice_title, 0, closed_end(practice_title, ')'))
 
     if match:
         time_str = match.group(1)
@@ -50,6 +72,16 @@ def extract_time_and_frequency(practice_title: str) -> tuple:
     return None, None, "as_needed"
 
 
+def strip_parentheticals(text: str) -> str:
+    """
+    Remove "(10 minutes, daily)"-style parentheticals, and the whitespace
+    before them, from a practice name
+    """
+    # Nothing after the last ')' can close, so it is left as is
+    end = closed_end(text, ')')
+    return NR_PARENTHETICAL.sub('', text[:end]) + text[end:]
+
+
 def determine_difficulty(time_min: int, frequency: str, is_emergency: bool) -> str:
     """
     Determine difficulty level based on time commitment and frequency
@@ -73,66 +105,79 @@ def determine_difficulty(time_min: int, frequency: str, is_emergency: bool) -> s
         return "intermediate"
 
 
-def parse_practice_section(text: str, pattern_name: str, temperament: str, protocol_title: str, chunk_number: int) -> Dict[str, Any]:
+def extract_practice_fields(content: str, end: int, fields: List[Event], rules: List[int]) -> Dict[str, str]:
     """
-    Parse a single practice section into structured data
+    Text of each PRACTICE_FIELDS field of one practice, by offset: from the
+    end of its label to its terminator. fields are the practice's FIELD
+    events, rules the start offsets of its '---' rules.
+    """
+    values = {}
+
+    for i, field in enumerate(fields):
+        label = field.text(content)
+        if label not in PRACTICE_FIELDS or label in values:
+            continue
+
+        terminators = PRACTICE_FIELDS[label]
+        if terminators is None:
+            stop = next((rule for rule in rules if rule > field.start), end)
+        else:
+            stop = next((other.start for other in fields[i + 1:] if other.text(content) in terminators), end)
+
+        values[label] = content[field.body_start:stop].strip()
+
+    return values
+
+
+def build_practice(content: str, start: int, end: int, fields: List[Event], rules: List[int],
+                   pattern_name: str, temperament: str, protocol_title: str, chunk_number: int) -> Dict[str, Any]:
+    """
+    Build the protocol for the practice at content[start:end] from its
+    FIELD events and '---' rule offsets
     """
     # Extract practice number and title
-    practice_match = re.match(r'####\s*Practice\s+(\d+):\s*(.+)', text.split('\n')[0])
-    emergency_match = re.match(r'####\s*Emergency Protocol:\s*(.+)', text.split('\n')[0])
+    header_end = content.find('\n', start, end)
+    if header_end == -1:
+        header_end = end
+    title_match = NR_PRACTICE_TITLE.match(content, start, header_end)
 
     is_emergency = False
     practice_number = None
     practice_name = ""
 
-    if practice_match:
-        practice_number = int(practice_match.group(1))
-        practice_name = practice_match.group(2).strip()
-    elif emergency_match:
-        is_emergency = True
-        practice_name = emergency_match.group(1).strip()
+    if title_match:
+        is_emergency = title_match.group('emergency') is not None
+        if not is_emergency:
+            practice_number = int(title_match.group('number'))
+        practice_name = title_match.group('name').strip()
 
     # Extract time and frequency
     time_min, time_max, frequency = extract_time_and_frequency(practice_name)
 
-    # Extract "Why This Rewires the Pattern"
-    why_pattern = r'\*\*Why This Rewires the Pattern\*\*:\s*(.+?)(?=\*\*How to Do It\*\*:|$)'
-    why_match = re.search(why_pattern, text, re.DOTALL)
-    why_rewires = why_match.group(1).strip() if why_match else ""
+    values = extract_practice_fields(content, end, fields, rules)
 
-    # Extract "How to Do It" steps
-    how_pattern = r'\*\*How to Do It\*\*:\s*(.+?)(?=\*\*(?:Expected Outcome|What to Do)\*\*:|$)'
-    how_match = re.search(how_pattern, text, re.DOTALL)
-    how_to_do = how_match.group(1).strip() if how_match else ""
+    why_rewires = values.get("Why This Rewires the Pattern", "")
+    how_to_do = values.get("How to Do It", "")
 
-    # For emergency protocols, extract "What to Do" instead
+    # For emergency protocols, "What to Do" replaces "How to Do It"
     if is_emergency:
-        what_pattern = r'\*\*What to Do\*\*:\s*(.+?)(?=---|$)'
-        what_match = re.search(what_pattern, text, re.DOTALL)
-        how_to_do = what_match.group(1).strip() if what_match else ""
-
-    # Extract "Expected Outcome"
-    outcome_pattern = r'\*\*Expected Outcome\*\*:\s*(.+?)(?=---|$)'
-    outcome_match = re.search(outcome_pattern, text, re.DOTALL)
-    expected_outcome = outcome_match.group(1).strip() if outcome_match else ""
+        how_to_do = values.get("What to Do", "")
 
-    # Extract "When to Use" for emergency protocols
-    when_pattern = r'\*\*When to Use\*\*:\s*(.+?)(?=\*\*What to Do\*\*:|$)'
-    when_match = re.search(when_pattern, text, re.DOTALL)
-    when_to_use = when_match.group(1).strip() if when_match else ""
+    expected_outcome = values.get("Expected Outcome", "")
+    when_to_use = values.get("When to Use", "")
 
     # Determine difficulty
     difficulty = determine_difficulty(time_min, frequency, is_emergency)
 
     # Create chunk summary
-    clean_practice_name = re.sub(r'\s*\([^)]+\)', '', practice_name)
+    clean_practice_name = strip_parentheticals(practice_name)
     chunk_summary = f"{clean_practice_name} - {temperament.capitalize()}"
 
-    return {
+    protocol = {
         "source_file": "neural_rewiring_protocols.txt",
         "file_number": 1,
         "chunk_number": chunk_number,
-        "chunk_text": text.strip(),
+        "chunk_text": content[start:end].strip(),
         "chunk_summary": chunk_summary,
         "category": "neural-rewiring",
         "applicable_patterns": [normalize_pattern_name(pattern_name)],
@@ -153,28 +198,39 @@ def parse_practice_section(text: str, pattern_name: str, temperament: str, proto
         "emergency_trigger": when_to_use if is_emergency else None
     }
 
+    return stamp_identity(protocol, protocol["pattern_name"], protocol["temperament_name"],
+                          "emergency" if is_emergency else f"practice-{practice_number}")
 
-def parse_temperament_section(text: str, pattern_name: str, temperament: str, start_chunk: int) -> List[Dict[str, Any]]:
+
+def parse_practice_section(text: str, pattern_name: str, temperament: str, protocol_title: str, chunk_number: int) -> Dict[str, Any]:
     """
-    Parse all practices for a single pattern × temperament combination
+    Parse a single practice section into structured data
     """
-    protocols = []
+    events = list(iter_events(text, kinds=(FIELD, RULE)))
+    fields = [event for event in events if event.kind == FIELD]
+    rules = [event.start for event in events if event.kind == RULE and text[event.start] == '-']
+    return build_practice(text, 0, len(text), fields, rules, pattern_name, temperament, protocol_title, chunk_number)
+
+
+def build_section_protocols(content: str, section: list, end: int, start_chunk: int) -> List[Dict[str, Any]]:
+    """
+    Build the protocols of one closed temperament section
+    section: [pattern, temperament, start, practices], each practice
+    [start, end, FIELD events, '---' rule offsets]
+    """
+    pattern_name, temperament, start, practices = section
 
     # Extract protocol title
-    title_match = re.search(r'\*\*Your Protocol:\s*([^*]+)\*\*', text)
+    title_match = NR_PROTOCOL_TITLE.search(content, start, end)
     protocol_title = title_match.group(1).strip() if title_match else f"{pattern_name} - {temperament}"
 
-    # Split by practice sections (both regular and emergency)
-    practice_sections = re.split(r'(?=####\s+(?:Practice\s+\d+:|Emergency Protocol:))', text)
-
+    protocols = []
     chunk_number = start_chunk
-    for section in practice_sections:
-        section = section.strip()
-        if not section or not section.startswith('####'):
-            continue
 
+    for practice_start, practice_end, fields, rules in practices:
         try:
-            protocol = parse_practice_section(section, pattern_name, temperament, protocol_title, chunk_number)
+            protocol = build_practice(content, practice_start, practice_end, fields, rules,
+                                      pattern_name, temperament, protocol_title, chunk_number)
             protocols.append(protocol)
             chunk_number += 1
         except Exception as e:
@@ -184,70 +240,106 @@ def parse_temperament_section(text: str, pattern_name: str, temperament: str, st
     return protocols
 
 
-def parse_pattern_section(text: str, pattern_name: str, start_chunk: int) -> List[Dict[str, Any]]:
+def parse_protocol_events(content: str, pattern_name: str = None, temperament: str = None,
+                          start_chunk: int = 1) -> List[Dict[str, Any]]:
     """
-    Parse all temperament sections for a single pattern
+    All protocols in content (see iter_protocol_events)
     """
-    all_protocols = []
+    return list(iter_protocol_events(content, pattern_name, temperament, start_chunk))
 
-    # Split by temperament headers
-    temperament_pattern = r'###\s+' + re.escape(pattern_name) + r'\s+\+\s+(WARRIOR|SAGE|CONNECTOR|BUILDER)\s+TEMPERAMENT'
-
-    # Find all temperament sections
-    temp_sections = re.split(f'(?={temperament_pattern})', text)
 
+def iter_protocol_events(content: str, pattern_name: str = None, temperament: str = None,
+                         start_chunk: int = 1) -> Iterator[Dict[str, Any]]:
+    """
+    Parse practices in one pass over the document's events. A pattern
+    header sets the pattern, a temperament header opens a section, a
+    practice header opens a practice, and FIELD events and '---' rules are
+    collected for the open practice. Each header closes what it supersedes,
+    and a section's protocols are built and yielded when it closes, once
+    its "Your Protocol" title is in range. pattern_name/temperament give
+    the context when content starts inside a section.
+    """
     chunk_number = start_chunk
-    for section in temp_sections:
-        section = section.strip()
-        if not section:
-            continue
+    section = [pattern_name, temperament, 0, []] if temperament else None
+    practice = None
 
-        # Extract temperament from this section
-        temp_match = re.search(temperament_pattern, section)
-        if not temp_match:
+    for event in iter_events(content, kinds=(HEADING, FIELD, RULE)):
+        if event.kind == FIELD:
+            if practice:
+                practice[2].append(event)
             continue
 
-        temperament = temp_match.group(1)
-
-        # Parse this temperament's practices
-        protocols = parse_temperament_section(section, pattern_name, temperament, chunk_number)
-        all_protocols.extend(protocols)
-        chunk_number += len(protocols)
+        if event.kind == RULE:
+            if practice and content[event.start] == '-':
+                practice[3].append(event.start)
+            continue
 
-    return all_protocols
+        if event.level == 2:
+            pattern_match = NR_PATTERN_HEADER.match(content, event.text_start, event.end)
+            if not pattern_match:
+                continue
+            if practice:
+                practice[1] = event.start
+                practice = None
+            if section:
+                for protocol in build_section_protocols(content, section, event.start, chunk_number):
+                    yield protocol
+                    chunk_number += 1
+                section = None
+            pattern_name = pattern_match.group(1).strip()
+
+        elif event.level == 3 and pattern_name:
+            temperament_match = NR_TEMPERAMENT_HEADER.match(content, event.text_start, event.end)
+            if not temperament_match or temperament_match.group(1) != pattern_name:
+                continue
+            if practice:
+                practice[1] = event.start
+                practice = None
+            if section:
+                for protocol in build_section_protocols(content, section, event.start, chunk_number):
+                    yield protocol
+                    chunk_number += 1
+            section = [pattern_name, temperament_match.group(2), event.start, []]
+
+        elif event.level == 4 and section and NR_PRACTICE_HEADER.match(content, event.text_start, event.end):
+            if practice:
+                practice[1] = event.start
+            practice = [event.start, len(content), [], []]
+            section[3].append(practice)
+
+    if section:
+        yield from build_section_protocols(content, section, len(content), chunk_number)
 
 
-def parse_neural_rewiring_file(file_path: str) -> List[Dict[str, Any]]:
+def parse_temperament_section(text: str, pattern_name: str, temperament: str, start_chunk: int) -> List[Dict[str, Any]]:
     """
-    Parse the complete neural rewiring protocols file
+    Parse all practices for a single pattern × temperament combination
     """
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+    return parse_protocol_events(text, pattern_name, temperament, start_chunk)
 
-    all_protocols = []
 
-    # Find all pattern sections (## N. PATTERN NAME PROTOCOLS)
-    pattern_sections = re.split(r'(?=^## \d+\. [A-Z\s]+PROTOCOLS)', content, flags=re.MULTILINE)
+def parse_pattern_section(text: str, pattern_name: str, start_chunk: int) -> List[Dict[str, Any]]:
+    """
+    Parse all temperament sections for a single pattern
+    """
+    return parse_protocol_events(text, pattern_name, start_chunk=start_chunk)
 
-    chunk_number = 1
-    for section in pattern_sections:
-        section = section.strip()
-        if not section:
-            continue
 
-        # Extract pattern name
-        pattern_match = re.match(r'## \d+\.\s+([A-Z\s]+)\s+PROTOCOLS', section)
-        if not pattern_match:
-            continue
+def parse_neural_rewiring_file(file_path: str) -> List[Dict[str, Any]]:
+    """
+    Parse the complete neural rewiring protocols file
+    """
+    return list(iter_neural_rewiring_file(file_path))
 
-        pattern_name = pattern_match.group(1).strip()
 
-        # Parse all temperaments for this pattern
-        protocols = parse_pattern_section(section, pattern_name, chunk_number)
-        all_protocols.extend(protocols)
-        chunk_number += len(protocols)
+def iter_neural_rewiring_file(file_path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the file's protocols one at a time, as iter_protocol_events does
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        content = f.read()
 
-    return all_protocols
+    yield from iter_protocol_events(content)
 
 
 def main():
@@ -7,10 +7,28 @@ Week 2 Day 2-4 of 6-week MIO transformation
 """
 
 import json
-import re
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional
 from pathlib import Path
 
+from chunk_identity import slugify, stamp_identity
+from keyword_matcher import KeywordMatcher
+from markdown_events import MARKER, RULE, SOURCE, iter_events
+from regex_registry import (
+    RP_CLINICAL_FRAMING,
+    RP_KB_FILE,
+    RP_NUMBERED_STEP,
+    RP_PATTERN_HEADER,
+    RP_TIME_COMMITMENT,
+    RP_USER_FRAMING,
+)
+from token_chunker import CHUNK_TOKEN_BUDGET, CHUNK_TOKEN_OVERLAP, split_protocol
+
+# File delimiter between KB files in the combined staging file
+FILE_SEPARATOR_LENGTH = 80
+
+# Longest marker-line slug in a chunk_id
+CHUNK_ID_MAX_LENGTH = 80
+
 
 class ResearchProtocolParser:
     """Parser for extracting research protocols from MIO knowledge base files"""
@@ -55,46 +73,42 @@ class ResearchProtocolParser:
         'builder': ['builder', 'system', 'optimiz', 'data', 'metric', 'structured']
     }
 
-    def __init__(self):
+    # Keyword tables compiled for single-pass matching
+    PATTERN_MATCHER = KeywordMatcher(PATTERN_KEYWORDS)
+    TEMPERAMENT_MATCHER = KeywordMatcher(TEMPERAMENT_KEYWORDS)
+
+    def __init__(self, token_budget: Optional[int] = CHUNK_TOKEN_BUDGET,
+                 token_overlap: int = CHUNK_TOKEN_OVERLAP):
+        """token_budget: split chunks longer than this into linked parts
+        (token_chunker.py); None keeps every chunk whole"""
         self.protocols = []
+        self.token_budget = token_budget
+        self.token_overlap = token_overlap
 
     def extract_file_number(self, filename: str) -> Optional[int]:
         """Extract KB file number from filename"""
-        match = re.search(r'mio-kb-(\d+)', filename)
-        return int(match.group(1)) if match else None
+        match = RP_KB_FILE.search(filename)
+        return int(match.group('number')) if match else None
 
     def extract_kb_prefix(self, filename: str) -> Optional[str]:
         """Extract KB prefix (e.g., 'mio-kb-01') from filename"""
-        match = re.search(r'(mio-kb-\d+)', filename)
-        return match.group(1) if match else None
+        match = RP_KB_FILE.search(filename)
+        return match.group('prefix') if match else None
 
     def infer_patterns(self, text: str) -> List[str]:
         """Infer applicable patterns from protocol text"""
-        text_lower = text.lower()
-        patterns = []
-
-        for pattern_name, keywords in self.PATTERN_KEYWORDS.items():
-            if any(keyword in text_lower for keyword in keywords):
-                patterns.append(pattern_name)
-
-        return list(set(patterns))  # Remove duplicates
+        # Unique labels in table order, so output is the same on every run
+        return self.PATTERN_MATCHER.matched_labels(text.lower())
 
     def infer_temperaments(self, text: str) -> List[str]:
         """Infer applicable temperaments from protocol text"""
-        text_lower = text.lower()
-        temperaments = []
-
-        for temp_name, keywords in self.TEMPERAMENT_KEYWORDS.items():
-            if any(keyword in text_lower for keyword in keywords):
-                temperaments.append(temp_name)
-
-        return list(set(temperaments)) if temperaments else ['all']
+        temperaments = self.TEMPERAMENT_MATCHER.matched_labels(text.lower())
+        return temperaments or ['all']
 
     def extract_time_commitment(self, text: str) -> tuple:
         """Extract time commitment range from protocol text"""
         # Look for time patterns like "5-30 minutes" or "10 minutes"
-        time_pattern = r'(\d+)(?:-(\d+))?\s*(?:min|minute)'
-        matches = re.findall(time_pattern, text.lower())
+        matches = RP_TIME_COMMITMENT.findall(text.lower())
 
         if matches:
             times = []
@@ -112,7 +126,7 @@ class ResearchProtocolParser:
         text_lower = text.lower()
 
         # Count complexity indicators
-        steps = len(re.findall(r'\n\s*\d+\.', text))
+        steps = len(RP_NUMBERED_STEP.findall(text))
         has_protocol = 'protocol:' in text_lower
         has_multiple_options = text.count('option 1:') > 0 or text.count('method 1:') > 0
 
@@ -145,8 +159,8 @@ class ResearchProtocolParser:
     def extract_dual_framing(self, text: str) -> tuple:
         """Extract clinical and user-facing framing if present"""
         # Look for dual framing patterns
-        clinical_match = re.search(r'\*\*Internal\s*\(Clinical\)\*\*:\s*["\']([^"\']+)["\']', text)
-        user_match = re.search(r'\*\*External\s*\(User-facing\)\*\*:\s*["\']([^"\']+)["\']', text)
+        clinical_match = RP_CLINICAL_FRAMING.search(text)
+        user_match = RP_USER_FRAMING.search(text)
 
         clinical = clinical_match.group(1) if clinical_match else None
         user = user_match.group(1) if user_match else None
@@ -156,7 +170,7 @@ class ResearchProtocolParser:
     def extract_pattern_names(self, header: str) -> List[str]:
         """Extract pattern/sub-pattern names from === headers"""
         # Look for === PATTERN: NAME === or === NAME ===
-        pattern_match = re.search(r'===\s*(?:PATTERN:\s*)?([^=]+)===', header)
+        pattern_match = RP_PATTERN_HEADER.search(header)
         if pattern_match:
             name = pattern_match.group(1).strip()
             return [name.lower().replace(' ', '_')]
@@ -220,7 +234,7 @@ class ResearchProtocolParser:
             'chunk_text': chunk_text.strip(),
             'chunk_summary': summary,
             'category': category,
-            'applicable_patterns': applicable_patterns[:5],  # Limit to 5 most relevant
+            'applicable_patterns': applicable_patterns[:5],  # Limit to the first 5, in table order
             'temperament_match': temperament_match,
             'time_commitment_min': time_min,
             'time_commitment_max': time_max,
@@ -236,75 +250,112 @@ class ResearchProtocolParser:
 
     def parse_file(self, content: str) -> List[Dict[str, Any]]:
         """Parse entire file content split by SOURCE FILE markers"""
-
-        # Split by file delimiter
-        file_sections = re.split(r'\n={80,}\n', content)
-
-        protocols = []
-
-        for section in file_sections:
-            if not section.strip():
+        return list(self.iter_file(content))
+
+    def iter_file(self, content: str) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the file's protocols one at a time. One pass over the events:
+        '=' * 80 rules delimit KB file sections, each with its first SOURCE
+        FILE marker and its chunk markers; a section's chunks are parsed as
+        soon as the rule closing it is reached
+        """
+        current = [0, len(content), None, []]  # [start, end, source event, marker events]
+        split_end = 0
+
+        for event in iter_events(content, kinds=(MARKER, RULE, SOURCE)):
+            if event.kind == RULE:
+                # Split by file delimiter (a whole '\n====...====\n' line)
+                if (event.level >= FILE_SEPARATOR_LENGTH and content[event.start] == '=' and
+                        event.start > split_end and event.end < len(content)):
+                    current[1] = event.start - 1
+                    yield from self.iter_section(content, *current)
+                    split_end = event.end + 1
+                    current = [split_end, len(content), None, []]
+            elif event.kind == SOURCE:
+                if current[2] is None:
+                    current[2] = event
+            elif event.kind == MARKER:
+                current[3].append(event)
+
+        yield from self.iter_section(content, *current)
+
+    def iter_section(self, content: str, start: int, end: int, source_event, markers: list) -> Iterator[Dict[str, Any]]:
+        """Yield the chunks of one KB file section of content[start:end]"""
+
+        # Extract source file metadata
+        if source_event is None:
+            return
+
+        source_file = source_event.text(content).strip()
+        file_number = self.extract_file_number(source_file)
+
+        if file_number is None:
+            return
+
+        chunk_number = 0
+        chunk_ids = set()
+
+        for chunk_text in self.iter_chunk_texts(content, start, end, markers):
+            protocol = self.identify_chunk(
+                self.parse_file_chunk(chunk_text, source_file, file_number, chunk_number + 1), chunk_ids
+            )
+            if self.token_budget is None:
+                parts = [protocol]
+            else:
+                parts = split_protocol(protocol, self.token_budget, self.token_overlap)
+
+            # Parts of an oversized chunk take consecutive chunk numbers
+            for part in parts:
+                chunk_number += 1
+                part['chunk_number'] = chunk_number
+                yield part
+
+    def iter_chunk_texts(self, content: str, start: int, end: int, markers: list) -> Iterator[str]:
+        """Text of each chunk of content[start:end]"""
+
+        # Split section by practice/protocol markers
+        # Look for PRACTICE X: or TOOL X: or AVATAR X: or === headers
+        chunk_start = start
+
+        for marker in markers:
+            if marker.start == start:
                 continue
 
-            # Extract source file metadata
-            source_match = re.search(r'# SOURCE FILE:\s*(.+)', section)
-            path_match = re.search(r'# ORIGINAL PATH:\s*(.+)', section)
-
-            if not source_match:
+            # === headers only start a new chunk after more than 10 lines
+            if content.startswith('===', marker.start) and content.count('\n', chunk_start, marker.start) <= 10:
                 continue
 
-            source_file = source_match.group(1).strip()
-            file_number = self.extract_file_number(source_file)
-
-            if file_number is None:
-                continue
-
-            # Split section by practice/protocol markers
-            # Look for PRACTICE X: or TOOL X: or AVATAR X: or === headers
-            chunks = []
-            current_chunk = []
-            chunk_number = 0
-
-            for line in section.split('\n'):
-                # Check for new chunk markers
-                is_new_chunk = (
-                    re.match(r'^PRACTICE\s+\d+:', line) or
-                    re.match(r'^TOOL\s+\d+:', line) or
-                    re.match(r'^AVATAR\s+\d+:', line) or
-                    re.match(r'^EMERGENCY TOOL\s+\d+:', line) or
-                    (re.match(r'^===\s+[A-Z]', line) and len(current_chunk) > 10)
-                )
-
-                if is_new_chunk and current_chunk:
-                    # Save previous chunk
-                    chunk_text = '\n'.join(current_chunk)
-                    if len(chunk_text.strip()) > 50:  # Minimum chunk size
-                        chunk_number += 1
-                        protocol = self.parse_file_chunk(
-                            chunk_text,
-                            source_file,
-                            file_number,
-                            chunk_number
-                        )
-                        protocols.append(protocol)
-                    current_chunk = [line]
-                else:
-                    current_chunk.append(line)
-
-            # Don't forget the last chunk
-            if current_chunk:
-                chunk_text = '\n'.join(current_chunk)
-                if len(chunk_text.strip()) > 50:
-                    chunk_number += 1
-                    protocol = self.parse_file_chunk(
-                        chunk_text,
-                        source_file,
-                        file_number,
-                        chunk_number
-                    )
-                    protocols.append(protocol)
-
-        return protocols
+            # Save previous chunk
+            chunk_text = content[chunk_start:marker.start - 1]
+            if len(chunk_text.strip()) > 50:  # Minimum chunk size
+                yield chunk_text
+            chunk_start = marker.start
+
+        # Don't forget the last chunk
+        chunk_text = content[chunk_start:end]
+        if len(chunk_text.strip()) > 50:
+            yield chunk_text
+
+    def identify_chunk(self, protocol: Dict[str, Any], chunk_ids: set) -> Dict[str, Any]:
+        """
+        Stamp the chunk's identity within its KB file: the slug of the
+        marker line it starts with ('PRACTICE 1: ...', '=== ... ==='), or
+        'preamble' for the chunk under the SOURCE FILE header, suffixed
+        -2, -3... if a marker line repeats in the same file
+        """
+        first_line = protocol['chunk_text'].split('\n', 1)[0]
+        if first_line.startswith('# SOURCE FILE:'):
+            base = 'preamble'
+        else:
+            base = slugify(first_line)[:CHUNK_ID_MAX_LENGTH].rstrip('-') or 'chunk'
+
+        chunk_id = base
+        occurrence = 1
+        while chunk_id in chunk_ids:
+            occurrence += 1
+            chunk_id = f"{base}-{occurrence}"
+        chunk_ids.add(chunk_id)
+        return stamp_identity(protocol, chunk_id)
 
     def parse_and_save(self, input_file: Path, output_file: Path) -> Dict[str, Any]:
         """Parse input file and save results to JSON"""
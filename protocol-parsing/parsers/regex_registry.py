@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Regex Registry - MIO Protocol Parsing System
+Named, precompiled patterns for every parser's hot paths
+
+Parsers import their patterns from here instead of passing pattern strings
+to re.search/re.match, which looks each one up in the re module's cache on
+every call. Where a line or field used to be tried against several
+patterns in turn, they are merged into one alternation with named groups
+so it is matched once.
+
+Prefixes name the family: MARKDOWN_ (markdown_events.py), DD_ (Daily
+Deductible), NR_ (Neural Rewiring), RP_ (Research Protocols).
+benchmarks/bench_regex_registry.py times each family against the inline
+patterns it replaced.
+
+Every pattern here must run in linear time on any input, including
+truncated and malformed sources: no two adjacent quantifiers that can
+match the same characters (e.g. \s* before a span that also takes
+whitespace), and spans that must end on a closer are searched only up to
+the last closer (closed_end). benchmarks/bench_regex_backtracking.py
+fuzzes every pattern at its call site and fails on super-linear growth.
+"""
+
+import re
+
+
+def closed_end(text: str, closer: str) -> int:
+    """
+    Offset just past the last closer in text (0 if it has none): an endpos
+    for patterns whose match must finish on closer, so openers left
+    unclosed after it are never scanned to the end of the text each
+    """
+    index = text.rfind(closer)
+    return index + len(closer) if index != -1 else 0
+
+
+# ============================================================================
+# Markdown events
+# ============================================================================
+
+# One alternation anchored at line starts; earlier branches win, so a
+# '# SOURCE FILE:' line is never a heading and '---' is never a list item.
+# The research parser's five per-line re.match chunk markers are the
+# 'marker' branch.
+MARKDOWN_EVENT = re.compile(r"""
+    ^(?:
+        \#[ ]SOURCE[ ]FILE:[^\S\n]*(?P<source>[^\n]*)
+      | (?P<hashes>\#{1,6})[ \t]+(?P<heading>[^\n]*)
+      | (?P<rule>(?P<rule_char>[-=_*])(?P=rule_char){2,})$
+      | (?P<marker>(?:EMERGENCY[ ]TOOL|PRACTICE|TOOL|AVATAR)[^\S\n]+\d+:|===[^\S\n]+[A-Z])[^\n]*
+      | [ \t]*\*\*(?P<field>[^*\n]+?)(?::\*\*|\*\*:)[^\n]*
+      | (?P<indent>[ \t]*)(?:[-*+]|\d+\\?\.)[ \t]+(?P<item>[^\n]*)
+    )
+""", re.MULTILINE | re.VERBOSE)
+
+# ============================================================================
+# Daily Deductible
+# ============================================================================
+
+# Practice headers ("#### **1\. Prayer and Worship**") and category section
+# headers ("### **Faith-Based Practices (Christian Focus)**"), matched
+# against the text of HEADING events. A practice header needs only its
+# number, so one whose title is truncated still ends the practice before
+# it (DD_PRACTICE_ID_TITLE then rejects it on its own)
+DD_PRACTICE_HEADER = re.compile(r'\*\*\d+\\\.')
+DD_SECTION_HEADER = re.compile(r'\*\*(?!\d)(.+?)\*\*')
+
+# Practice id and title from a whole header line
+DD_PRACTICE_ID_TITLE = re.compile(r'####\s+\*\*(?P<id>\d+)\\?\.\s+(?P<title>.+?)\*\*')
+
+# Trailing "(Christian Focus)" of a section title. Only tried at the start
+# of a whitespace run, and only on titles ending in ')' (category_name),
+# so no '(' scans to the end of a title it cannot close
+DD_SECTION_NOTE = re.compile(r'(?<!\s)\s*\(.+?\)\s*$')
+
+# Field values run to the next ** (Time) or **Instructions:** (State) or
+# the end of the line; callers strip the surrounding whitespace
+DD_TIME_FIELD = re.compile(r'\*\*Time:\*\*([^*]+)(?:\*\*|$)')
+DD_STATE_FIELD = re.compile(r'\*\*The State It Creates:\*\*(.+?)(?:\*\*Instructions:\*\*|$)')
+
+# "5-30 minutes", "10 min", "1-4 hours", "1 hour": the four duration forms
+# in one pass; parse_time picks the first of each form by priority.
+# A number starts at the first digit of a run, so a long run is tried
+# once, not from each digit; the check follows that first digit so the
+# engine still skips ahead to digits
+DD_DURATION = re.compile(r'(?P<low>\d(?<!\d\d)\d*)\s*(?:-\s*(?P<high>\d+)\s*)?(?P<unit>min|hour)', re.IGNORECASE)
+
+# ============================================================================
+# Neural Rewiring
+# ============================================================================
+
+# Section headers, matched against the text of HEADING events:
+# "## 8. NAME PROTOCOLS", "### NAME + SAGE TEMPERAMENT", "#### Practice 1: ..."
+# Names are whitespace-separated words, so the whitespace before
+# PROTOCOLS/'+' belongs to one quantifier only
+NR_PATTERN_HEADER = re.compile(r'\d+\.\s+([A-Z]+(?:\s+[A-Z]+)*)\s+PROTOCOLS')
+NR_TEMPERAMENT_HEADER = re.compile(r'(\s*[A-Z]+(?:\s+[A-Z]+)*)\s+\+\s+(WARRIOR|SAGE|CONNECTOR|BUILDER)\s+TEMPERAMENT')
+NR_PRACTICE_HEADER = re.compile(r'Practice\s+\d+:|Emergency Protocol:')
+
+# Title is stripped by the caller
+NR_PROTOCOL_TITLE = re.compile(r'\*\*Your Protocol:([^*]+)\*\*')
+
+# "#### Practice 1: Name (...)" or "#### Emergency Protocol: Name (...)"
+NR_PRACTICE_TITLE = re.compile(
+    r'####\s*(?:Practice\s+(?P<number>\d+):|(?P<emergency>Emergency Protocol:))\s*(?P<name>.+)'
+)
+
+# "(10 minutes, daily)" / "(varies, ongoing)" in a practice title; searched
+# up to closed_end(title, ')')
+NR_TIME_FREQUENCY = re.compile(r'\((\d+|varies)\s*(?:minutes?)?,?\s*([^)]+)\)', re.IGNORECASE)
+# Removed from the closed part of a title only (see strip_parentheticals)
+NR_PARENTHETICAL = re.compile(r'(?<!\s)\s*\([^)]+\)')
+
+# ============================================================================
+# Research Protocols
+# ============================================================================
+
+# "mio-kb-03" prefix and its file number
+RP_KB_FILE = re.compile(r'(?P<prefix>mio-kb-(?P<number>\d+))')
+
+# Numbers start at the first digit of a run, as in DD_DURATION
+RP_TIME_COMMITMENT = re.compile(r'(\d(?<!\d\d)\d*)(?:-(\d+))?\s*(?:min|minute)')
+# A numbered line after any blank lines; counted from the last newline
+# before it, so a run of blank lines is not rescanned from each one
+RP_NUMBERED_STEP = re.compile(r'\n[^\S\n]*\d+\.')
+
+RP_CLINICAL_FRAMING = re.compile(r'\*\*Internal\s*\(Clinical\)\*\*:\s*["\']([^"\']+)["\']')
+RP_USER_FRAMING = re.compile(r'\*\*External\s*\(User-facing\)\*\*:\s*["\']([^"\']+)["\']')
+
+# "=== PATTERN: NAME ===" or "=== NAME ===". The name always runs to the
+# next '=', so the lookahead checks once that '===' is there instead of
+# rescanning the name for every whitespace character given back
+RP_PATTERN_HEADER = re.compile(r'===(?=[^=]*===)\s*(?:PATTERN:\s*)?([^=]+)===')
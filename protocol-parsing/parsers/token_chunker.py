@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Token Chunker - MIO Protocol Parsing System
+Splits chunks over a token budget into overlapping parts at the coarsest
+boundary that fits: paragraphs, then lines (list items), then sentences,
+then words
+
+Every part is an exact substring of the chunk, at most `budget` tokens
+(token_counter.py, the embedding model's tokenizer), and starts with up
+to `overlap` tokens of the end of the part before it, so a passage cut at
+a boundary is embedded whole in at least one part.
+Parts of a split chunk are protocols of their own, linked to it:
+    chunk_id         <parent chunk_id>/part-<k>
+    parent_chunk_id  the chunk_id the unsplit chunk would have had
+    part_number      1..part_count
+    chunk_summary    "<parent summary> (part k/n)"
+Metadata inferred from the whole chunk (patterns, temperaments, ...) is
+kept on every part so filters find all of them.
+
+Usage:
+    python3 parsers/token_chunker.py staging/research-protocols-combined.md
+    python3 parsers/token_chunker.py staging/research-protocols-combined.md --budget 500 --overlap 50
+"""
+
+import argparse
+import re
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from chunk_identity import content_hash
+from token_counter import count_tokens
+
+# Default part size and overlap, in tokens
+CHUNK_TOKEN_BUDGET = 1000
+CHUNK_TOKEN_OVERLAP = 100
+
+# Split points, coarsest first
+BOUNDARIES = (
+    re.compile(r'\n[^\S\n]*\n\s*'),  # blank lines between paragraphs
+    re.compile(r'\n'),               # lines, so list items stay whole
+    re.compile(r'(?<=[.!?])\s+'),    # sentences
+    re.compile(r'\s+'),              # words
+)
+
+Span = Tuple[int, int]
+
+
+def split_spans(text: str, start: int, end: int, budget: int, count_tokens: Callable[[str], int],
+                level: int = 0) -> Iterator[Span]:
+    """Spans covering text[start:end] of at most budget tokens, cut at the coarsest boundary possible"""
+    if count_tokens(text[start:end]) <= budget:
+        yield start, end
+        return
+
+    if level == len(BOUNDARIES):
+        # One word over budget: cut it into equal pieces, re-cutting any
+        # piece still over (tokens are not spread evenly over characters)
+        step = max(1, (end - start) * budget // count_tokens(text[start:end]))
+        for cut in range(start, end, step):
+            piece_end = min(cut + step, end)
+            if step > 1 and count_tokens(text[cut:piece_end]) > budget:
+                yield from split_spans(text, cut, piece_end, budget, count_tokens, level)
+            else:
+                yield cut, piece_end
+        return
+
+    cut = start
+    for match in BOUNDARIES[level].finditer(text, start, end):
+        if match.start() > cut:
+            # Each span keeps the separator after it, so spans tile the text
+            yield from split_spans(text, cut, match.end(), budget, count_tokens, level + 1)
+            cut = match.end()
+    if cut < end:
+        yield from split_spans(text, cut, end, budget, count_tokens, level + 1)
+
+
+def pack_spans(text: str, spans: List[Span], budget: int, overlap: int,
+               count_tokens: Callable[[str], int]) -> List[Span]:
+    """
+    Merge consecutive spans greedily into parts of at most budget tokens;
+    each part after the first starts with the trailing spans (up to
+    overlap tokens, never a whole part) of the part before it
+    """
+    def fits(first: int, last: int) -> bool:
+        return count_tokens(text[spans[first][0]:spans[last][1]].strip()) <= budget
+
+    # Counted without the trailing separator, which mostly merges into the
+    # next span's first token once joined ('word ' is 2 tokens, ' word' 1)
+    tokens = [count_tokens(text[start:end].strip()) for start, end in spans]
+    parts = []
+    first = new = 0
+
+    while True:
+        last = first
+        total = tokens[first]
+        while last + 1 < len(spans) and total + tokens[last + 1] <= budget:
+            last += 1
+            total += tokens[last]
+        # Separators that don't merge (newlines) add tokens: binary search
+        # for the longest joined part that fits
+        low = max(first, new)
+        while low < last:
+            middle = (low + last + 1) // 2
+            if fits(first, middle):
+                low = middle
+            else:
+                last = middle - 1
+        while first < new and not fits(first, last):
+            first += 1
+        parts.append((spans[first][0], spans[last][1]))
+        if last + 1 == len(spans):
+            return parts
+
+        # Carry the part's tail over, leaving room for at least one new span
+        part_first = first
+        first = new = last + 1
+        carried = 0
+        while first - 1 > part_first and carried + tokens[first - 1] <= overlap:
+            first -= 1
+            carried += tokens[first]
+        while first <= last and carried + tokens[last + 1] > budget:
+            carried -= tokens[first]
+            first += 1
+
+
+def split_text(text: str, budget: int = CHUNK_TOKEN_BUDGET, overlap: int = CHUNK_TOKEN_OVERLAP,
+               count_tokens: Callable[[str], int] = count_tokens) -> List[str]:
+    """text as overlapping parts of at most budget tokens ([text] if it fits)"""
+    if count_tokens(text) <= budget:
+        return [text]
+
+    spans = list(split_spans(text, 0, len(text), budget, count_tokens))
+    return [text[start:end].strip() for start, end in pack_spans(text, spans, budget, overlap, count_tokens)]
+
+
+def split_protocol(protocol: Dict[str, Any], budget: int = CHUNK_TOKEN_BUDGET, overlap: int = CHUNK_TOKEN_OVERLAP,
+                   count_tokens: Callable[[str], int] = count_tokens) -> List[Dict[str, Any]]:
+    """[protocol] if its chunk_text fits the budget, else its linked parts"""
+    texts = split_text(protocol['chunk_text'], budget, overlap, count_tokens)
+    if len(texts) == 1:
+        return [protocol]
+
+    parts = []
+    for part_number, text in enumerate(texts, 1):
+        part = dict(
+            protocol,
+            chunk_text=text,
+            chunk_summary=f"{protocol['chunk_summary']} (part {part_number}/{len(texts)})",
+            parent_chunk_id=protocol['chunk_id'],
+            part_number=part_number,
+            part_count=len(texts),
+        )
+        part['chunk_id'] = f"{protocol['chunk_id']}/part-{part_number}"
+        part['content_hash'] = content_hash(part)
+        parts.append(part)
+    return parts
+
+
+def main():
+    from parse_research_protocols import ResearchProtocolParser
+
+    parser = argparse.ArgumentParser(description='Show how oversized research chunks are split')
+    parser.add_argument('input_file', type=Path, help='Combined research staging file')
+    parser.add_argument('--budget', type=int, default=CHUNK_TOKEN_BUDGET,
+                        help=f'Tokens per part (default: {CHUNK_TOKEN_BUDGET})')
+    parser.add_argument('--overlap', type=int, default=CHUNK_TOKEN_OVERLAP,
+                        help=f'Tokens repeated from the previous part (default: {CHUNK_TOKEN_OVERLAP})')
+    args = parser.parse_args()
+
+    if args.overlap >= args.budget:
+        parser.error('--overlap must be smaller than --budget')
+
+    chunks = ResearchProtocolParser(token_budget=None).parse_file(args.input_file.read_text(encoding='utf-8'))
+    print(f"{len(chunks)} chunks, budget {args.budget} tokens, overlap {args.overlap}")
+    print()
+
+    total_parts = 0
+    for chunk in chunks:
+        parts = split_protocol(chunk, args.budget, args.overlap)
+        total_parts += len(parts)
+        if len(parts) > 1:
+            sizes = ', '.join(str(count_tokens(part['chunk_text'])) for part in parts)
+            print(f"✂️  {chunk['chunk_id']}")
+            print(f"   {count_tokens(chunk['chunk_text'])} tokens -> {len(parts)} parts ({sizes})")
+
+    print()
+    print(f"✓ {len(chunks)} chunks -> {total_parts} after splitting")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Token Counter - MIO Protocol Parsing System
+Offline token counts for text-embedding-3-small (cl100k_base), from BPE
+ranks bundled in parsers/bpe/, for tokens_approx, chunk budgets and
+embedding batch sizes
+
+The counter uses tiktoken when it is installed, built from the bundled
+ranks so it never downloads anything. Otherwise a pure-Python byte-pair
+encoder gives the same counts: the pre-tokenizer is cl100k_base's pattern
+with \\p{L} and \\p{N} spelled in stdlib re classes, and merges are cached
+per word.
+
+Counts are cached by text: an LRU of COUNT_CACHE_SIZE entries keyed by the
+BLAKE2b digest of the text, so the cache does not keep chunk texts alive.
+
+Usage:
+    from token_counter import count_tokens
+    count_tokens(protocol['chunk_text'])
+
+    python3 parsers/token_counter.py staging/research-protocols-combined.md
+"""
+
+import argparse
+import binascii
+import gzip
+import hashlib
+import heapq
+import re
+import unicodedata
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Pattern
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+BPE_DIR = Path(__file__).parent / 'bpe'
+RANKS_FILE = BPE_DIR / 'cl100k_base.tiktoken.gz'
+# SHA-256 of the uncompressed ranks, as published with tiktoken
+RANKS_SHA256 = '223921b76ee99bde995b7ff738513eef100fb51d18c93597a113bcffe865b2a7'
+ENCODING_NAME = 'cl100k_base'
+
+# cl100k_base's pre-tokenizer; tiktoken takes it as is
+TIKTOKEN_PATTERN = (r"""'(?i:[sdmt]|ll|ve|re)|[^\r\n\p{L}\p{N}]?+\p{L}+|\p{N}{1,3}| ?[^\s\p{L}\p{N}]++[\r\n]*"""
+                    r"""|\s*[\r\n]|\s+(?!\S)|\s+""")
+
+# The same pattern for stdlib re, with {N} the \p{N} code points: \p{L} is
+# [^\W_{N}] (\w is letters, numbers and _) and "not a letter or number" is
+# _ or \W. Possessive quantifiers are dropped: each is followed by
+# something its own class cannot match.
+PYTHON_PATTERN = (r"""'(?i:[sdmt]|ll|ve|re)|(?:_|[^\r\n\w])?[^\W_{N}]+|[{N}]{{1,3}}| ?(?:_|[^\s\w])+[\r\n]*"""
+                  r"""|\s*[\r\n]|\s+(?!\S)|\s+""")
+
+# Unicode assigns number characters in planes 0 and 1 only
+UNICODE_SCAN_END = 0x20000
+
+COUNT_CACHE_SIZE = 65536
+WORD_CACHE_SIZE = 65536
+
+
+def load_ranks(path: Path = RANKS_FILE) -> Dict[bytes, int]:
+    """Token bytes -> rank from a gzipped .tiktoken file, checked against RANKS_SHA256"""
+    data = gzip.decompress(path.read_bytes())
+    if hashlib.sha256(data).hexdigest() != RANKS_SHA256:
+        raise ValueError(f"{path} is not the {ENCODING_NAME} rank file (SHA-256 mismatch)")
+
+    # One "<base64 token> <rank>" pair per line
+    fields = data.split()
+    return dict(zip(map(binascii.a2b_base64, fields[0::2]), map(int, fields[1::2])))
+
+
+def unicode_ranges(major_category: str) -> str:
+    """Character-class ranges of every code point in a Unicode major category ('N' for \\p{N})"""
+    ranges = []
+    for code in range(UNICODE_SCAN_END):
+        if unicodedata.category(chr(code))[0] == major_category:
+            if ranges and ranges[-1][1] == code - 1:
+                ranges[-1][1] = code
+            else:
+                ranges.append([code, code])
+    return ''.join(re.escape(chr(low)) + (f"-{re.escape(chr(high))}" if high > low else '') for low, high in ranges)
+
+
+@lru_cache(maxsize=None)
+def python_pretokenizer() -> Pattern:
+    return re.compile(PYTHON_PATTERN.format(N=unicode_ranges('N')))
+
+
+def bpe_merge(piece: bytes, ranks: Dict[bytes, int]) -> List[bytes]:
+    """
+    Merge piece's bytes, lowest rank (then leftmost) pair first, until no
+    adjacent pair is a token. Parts are a linked list of start offsets and
+    candidate pairs a heap, so long pieces cost O(n log n), not O(n²)
+    """
+    size = len(piece)
+    following = list(range(1, size + 1))  # start of the next part (size: none)
+    preceding = list(range(-1, size - 1))
+    alive = [True] * size
+    heap = []
+
+    def push(start: int) -> None:
+        middle = following[start]
+        if middle < size:
+            end = following[middle]
+            rank = ranks.get(piece[start:end])
+            if rank is not None:
+                heapq.heappush(heap, (rank, start, end))
+
+    for start in range(size - 1):
+        push(start)
+
+    while heap:
+        _, start, end = heapq.heappop(heap)
+        # Skip pairs a merge since has changed
+        if not alive[start] or following[start] >= size or following[following[start]] != end:
+            continue
+        middle = following[start]
+        alive[middle] = False
+        following[start] = end
+        if end < size:
+            preceding[end] = start
+        if preceding[start] >= 0:
+            push(preceding[start])
+        push(start)
+
+    starts = [start for start in range(size) if alive[start]]
+    return [piece[start:end] for start, end in zip(starts, starts[1:] + [size])]
+
+
+class TokenCounter:
+    """cl100k_base token counts with an LRU cache keyed by text digest"""
+
+    def __init__(self, ranks_file: Path = RANKS_FILE, cache_size: int = COUNT_CACHE_SIZE,
+                 use_tiktoken: bool = True):
+        ranks = load_ranks(ranks_file)
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        if use_tiktoken and tiktoken is not None:
+            self.backend = 'tiktoken'
+            self.encoding = tiktoken.Encoding(
+                name=ENCODING_NAME, pat_str=TIKTOKEN_PATTERN, mergeable_ranks=ranks, special_tokens={}
+            )
+            self.count_uncached = lambda text: len(self.encoding.encode_ordinary(text))
+        else:
+            self.backend = 'python'
+            self.ranks = ranks
+            self.pretokenizer = python_pretokenizer()
+            self.count_word = lru_cache(maxsize=WORD_CACHE_SIZE)(self.count_word_uncached)
+            self.count_uncached = self.count_python
+
+    def count_word_uncached(self, word: str) -> int:
+        piece = word.encode('utf-8')
+        if piece in self.ranks:
+            return 1
+        return len(bpe_merge(piece, self.ranks))
+
+    def count_python(self, text: str) -> int:
+        return sum(map(self.count_word, self.pretokenizer.findall(text)))
+
+    def count(self, text: str) -> int:
+        """Tokens in text, as the embeddings API counts them"""
+        if not text:
+            return 0
+        key = hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+        count = self.cache.get(key)
+        if count is not None:
+            self.hits += 1
+            self.cache.move_to_end(key)
+            return count
+
+        self.misses += 1
+        count = self.count_uncached(text)
+        self.cache[key] = count
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return count
+
+
+_counter: Optional[TokenCounter] = None
+
+
+def get_counter() -> TokenCounter:
+    """The shared counter, loaded on first use"""
+    global _counter
+    if _counter is None:
+        _counter = TokenCounter()
+    return _counter
+
+
+def count_tokens(text: str) -> int:
+    """Tokens in text (cl100k_base, cached)"""
+    return get_counter().count(text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Count cl100k_base tokens offline')
+    parser.add_argument('files', type=Path, nargs='+', help='Text files to count')
+    args = parser.parse_args()
+
+    counter = get_counter()
+    print(f"Backend: {counter.backend}")
+    for path in args.files:
+        text = path.read_text(encoding='utf-8')
+        tokens = counter.count(text)
+        print(f"{path}: {tokens:,} tokens, {len(text):,} chars ({len(text) / tokens:.2f} chars/token)")
+
+
+if __name__ == '__main__':
+    main()
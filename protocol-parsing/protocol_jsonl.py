@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+MIO Protocol Parser - JSON Lines I/O
+One protocol per line, so every stage can write records as it produces
+them and read them back without loading a whole file.
+
+Writers flush after every line. Readers can resume at a line offset, stop
+early, or take one contiguous shard of a file (or of several files read as
+one sequence), so shards concatenated in order are the full output again.
+A last line without its newline (a writer that died mid-record) is ignored,
+so resuming at the number of complete lines is always safe; appenders drop
+it first (drop_partial_line) so the next record starts on a line of its own.
+
+The existing array files (output/*-parsed.json, either a plain array or
+{"metadata": ..., "protocols": [...]}) and embedding stores (.npy matrix
+plus .meta.jsonl, embedding_store.py) are read by the same functions, and
+the CLI converts between JSON arrays and JSON Lines:
+
+Usage:
+    python3 protocol_jsonl.py to-jsonl output/daily-deductible-parsed.json
+    python3 protocol_jsonl.py to-array output/all-protocols-with-embeddings.shard-*.jsonl \\
+        --output output/all-protocols-with-embeddings.json
+    python3 protocol_jsonl.py count output/*-parsed.jsonl
+"""
+
+import argparse
+import json
+import os
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from embedding_store import count_store, is_store, iter_store, store_paths
+
+JSONL_SUFFIX = '.jsonl'
+COUNT_BLOCK_SIZE = 1024 * 1024
+
+
+def is_jsonl(path: Path) -> bool:
+    return Path(path).suffix == JSONL_SUFFIX
+
+
+def jsonl_path(path: Path) -> Path:
+    """output/x-parsed.json -> output/x-parsed.jsonl"""
+    return Path(path).with_suffix(JSONL_SUFFIX)
+
+
+def write_jsonl(records: Iterable[Dict[str, Any]], path: Path, append: bool = False) -> int:
+    """Write records one per line, flushing each line; returns the number written"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    count = 0
+    with open(path, 'a' if append else 'w', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            f.flush()
+            count += 1
+    return count
+
+
+def count_jsonl(path: Path) -> int:
+    """Complete lines in a JSONL file, counted without decoding them"""
+    count = 0
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(COUNT_BLOCK_SIZE), b''):
+            count += block.count(b'\n')
+    return count
+
+
+def drop_partial_line(path: Path) -> bool:
+    """Truncate a last line left without its newline; True if there was one"""
+    with open(path, 'rb+') as f:
+        end = f.seek(0, os.SEEK_END)
+        position = end
+        keep = 0
+        while position > 0:
+            step = min(COUNT_BLOCK_SIZE, position)
+            f.seek(position - step)
+            newline = f.read(step).rfind(b'\n')
+            if newline >= 0:
+                keep = position - step + newline + 1
+                break
+            position -= step
+        if keep == end:
+            return False
+        f.truncate(keep)
+        return True
+
+
+def iter_jsonl(path: Path, start: int = 0, stop: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """Yield the records on lines [start, stop), skipping earlier lines undecoded"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in islice(f, start, stop):
+            if not line.endswith('\n'):
+                return  # Partial last record
+            yield json.loads(line)
+
+
+def load_array(path: Path) -> List[Dict[str, Any]]:
+    """Protocols from an array file, plain or {"protocols": [...]}"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict) and 'protocols' in data:
+        return data['protocols']
+    raise ValueError(f"Unexpected format in {Path(path).name}: expected a list or an object with 'protocols'")
+
+
+def count_records(path: Path) -> int:
+    if is_store(path):
+        return count_store(path)
+    return count_jsonl(path) if is_jsonl(path) else len(load_array(path))
+
+
+def iter_protocol_file(path: Path, start: int = 0, stop: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """Records [start, stop) of a JSONL, array or embedding store file"""
+    if is_store(path):
+        return iter_store(path, start, stop)
+    if is_jsonl(path):
+        return iter_jsonl(path, start, stop)
+    return iter(load_array(path)[start:stop])
+
+
+def iter_protocol_files(paths: Iterable[Path], start: int = 0,
+                        stop: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Records [start, stop) of several files read as one sequence; files
+    wholly before start are counted, not decoded
+    """
+    offset = 0
+    for path in paths:
+        if stop is not None and offset >= stop:
+            return
+        count = count_records(path)
+        if offset + count > start:
+            local_stop = None if stop is None else stop - offset
+            yield from iter_protocol_file(path, max(start - offset, 0), local_stop)
+        offset += count
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """'2/4' -> (2, 4): the second of four shards, numbered from 1"""
+    try:
+        index, count = (int(part) for part in spec.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Shard must look like K/N, got {spec!r}")
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"Shard {spec!r}: K must be between 1 and N")
+    return index, count
+
+
+def shard_range(total: int, index: int, count: int) -> Tuple[int, int]:
+    """[start, stop) of the index-th of count contiguous shards over total records"""
+    return total * (index - 1) // count, total * index // count
+
+
+def resolve_input(path: Path) -> Path:
+    """The newest of path, its .jsonl twin and its embedding store (.npy), whichever exist"""
+    candidates = [p for p in (Path(path), jsonl_path(path), store_paths(path)[0]) if p.exists()]
+    if not candidates:
+        return Path(path)
+    return max(candidates, key=lambda p: p.stat().st_mtime_ns)
+
+
+def array_to_jsonl(source: Path, dest: Path) -> int:
+    return write_jsonl(load_array(source), dest)
+
+
+def jsonl_to_array(sources: List[Path], dest: Path) -> int:
+    """Concatenate JSONL files (e.g. shards, in order) into one array file"""
+    protocols = [record for source in sources for record in iter_jsonl(source)]
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    with open(dest, 'w', encoding='utf-8') as f:
+        json.dump(protocols, f, indent=2, ensure_ascii=False)
+    return len(protocols)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert protocol files between JSON arrays and JSON Lines')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    to_jsonl = commands.add_parser('to-jsonl', help='Write a .jsonl next to each array file')
+    to_jsonl.add_argument('files', type=Path, nargs='+')
+
+    to_array = commands.add_parser('to-array', help='Concatenate .jsonl files into one array file')
+    to_array.add_argument('files', type=Path, nargs='+')
+    to_array.add_argument('--output', type=Path,
+                          help='Array file to write (default: the single input with a .json suffix)')
+
+    count = commands.add_parser('count', help='Count the records in each file')
+    count.add_argument('files', type=Path, nargs='+')
+
+    args = parser.parse_args()
+
+    if args.command == 'to-jsonl':
+        for source in args.files:
+            dest = jsonl_path(source)
+            print(f"✓ {source.name} → {dest.name} ({array_to_jsonl(source, dest):,} protocols)")
+
+    elif args.command == 'to-array':
+        if args.output is None and len(args.files) > 1:
+            parser.error('--output is required when concatenating several files')
+        dest = args.output or args.files[0].with_suffix('.json')
+        written = jsonl_to_array(args.files, dest)
+        print(f"✓ {len(args.files)} file(s) → {dest.name} ({written:,} protocols)")
+
+    else:
+        for path in args.files:
+            print(f"{count_records(path):>8,}  {path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+MIO Protocol Parser - Protocol Record
+One compact, slotted record per protocol for the embed and insert stages,
+with conversion to and from the plain dicts the parsers and JSON files use.
+
+Fields are the mio_knowledge_chunks columns the pipeline fills, the chunk
+identity (parsers/chunk_identity.py), the link from a split chunk's parts
+to it (parsers/token_chunker.py) and the embedding metadata. Anything
+else a parser emits (pattern_name, why_rewires, kb_file_category, ...)
+rides along in `extra`, so from_dict(d).to_dict() == d, in d's key order
+(key orders are interned, one shared tuple per distinct layout), for
+every d without an embedding.
+
+The embedding is an array('f'): 1536 float32 values in one 6 KB buffer
+instead of a list of 1536 Python floats (~49 KB). pgvector stores vector
+columns as float4, so nothing the database keeps is lost, but the API's
+float64 values come back rounded: to_dict() and db_record() give each as
+the float of its shortest float32 decimal (embedding_floats), which reads
+back to the same float32 and keeps the JSON no larger than the API's
+(a float32 printed as a float64 takes 17 digits). Protocols read from an
+embedding store (embedding_store.py) keep theirs as a float32 memoryview
+into the mapped matrix, without copying it.
+
+Records are filled in place between stages (set_embedding) instead of
+copying the whole dict for every stage.
+
+Usage:
+    record = Protocol.from_dict(protocol)
+    record.set_embedding(response.data[0].embedding, EMBEDDING_MODEL)
+    write_jsonl([record.to_dict()], path)
+    client.table('mio_knowledge_chunks').insert(record.db_record())
+"""
+
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+PARSERS_DIR = Path(__file__).parent / 'parsers'
+if str(PARSERS_DIR) not in sys.path:
+    sys.path.insert(0, str(PARSERS_DIR))
+
+from token_counter import count_tokens  # noqa: E402
+
+# float32, the precision of pgvector's vector type
+EMBEDDING_TYPECODE = 'f'
+
+# Columns written to mio_knowledge_chunks, in insert order
+DB_FIELDS = (
+    'source_file',
+    'file_number',
+    'chunk_number',
+    'chunk_text',
+    'chunk_summary',
+    'embedding',
+    'category',
+    'applicable_patterns',
+    'temperament_match',
+    'time_commitment_min',
+    'time_commitment_max',
+    'difficulty_level',
+    'state_created',
+    'tokens_approx',
+)
+
+# Filled by the glossary update (glossary-extraction/update_protocols.py)
+GLOSSARY_FIELDS = (
+    'simplified_text',
+    'glossary_terms',
+    'reading_level_before',
+    'reading_level_after',
+    'language_variant',
+)
+
+FIELDS = DB_FIELDS + GLOSSARY_FIELDS + (
+    'chunk_id',
+    'content_hash',
+    'global_chunk_number',
+    'embedding_model',
+    'embedding_dimensions',
+    'is_emergency_protocol',
+    'practice_frequency',
+    'parent_chunk_id',
+    'part_number',
+    'part_count',
+)
+
+# Array columns the database defaults to '{}'
+LIST_FIELDS = ('applicable_patterns', 'temperament_match', 'state_created')
+
+
+def embedding_floats(values: Sequence[float]) -> List[float]:
+    """
+    float32 values as Python floats with the fewest significant digits (6-9)
+    that read back to the same float32, for JSON
+    """
+    result = values.tolist() if isinstance(values, (array, memoryview)) else list(values)
+    pending = range(len(result))
+    for digits in (6, 7, 8):
+        candidates = [float('%.*g' % (digits, result[i])) for i in pending]
+        unmatched = []
+        for i, candidate, rounded in zip(pending, candidates, array(EMBEDDING_TYPECODE, candidates)):
+            if rounded == result[i]:
+                result[i] = candidate
+            else:
+                unmatched.append(i)
+        pending = unmatched
+    # Nine digits always identify a float32
+    for i in pending:
+        result[i] = float('%.9g' % result[i])
+    return result
+
+
+def embedding_array(values: Optional[Iterable[float]]) -> Optional[Sequence[float]]:
+    """A float32 array of values (None, and float32 arrays and memoryviews, stay as they are)"""
+    if (values is None or isinstance(values, array) and values.typecode == EMBEDDING_TYPECODE
+            or isinstance(values, memoryview) and values.format == EMBEDDING_TYPECODE):
+        return values
+    return array(EMBEDDING_TYPECODE, values)
+
+
+class Protocol:
+    """A parsed protocol; present has a bit per set field, extra holds parser-specific ones"""
+
+    __slots__ = FIELDS + ('present', 'layout', 'extra')
+
+    def __init__(self, **fields: Any):
+        self.present = 0
+        self.layout = intern_layout(tuple(fields))
+        self.extra = None
+        for name in FIELDS:
+            setattr(self, name, None)
+        for name, value in fields.items():
+            self.store(name, value)
+
+    @classmethod
+    def from_dict(cls, protocol: Dict[str, Any]) -> 'Protocol':
+        """Record holding protocol's values (no copy of its strings or lists)"""
+        return cls(**protocol)
+
+    def __setitem__(self, name: str, value: Any) -> None:
+        if name not in self:
+            self.layout = intern_layout(self.layout + (name,))
+        self.store(name, value)
+
+    def store(self, name: str, value: Any) -> None:
+        if name in FIELD_BITS:
+            if name == 'embedding':
+                value = embedding_array(value)
+            setattr(self, name, value)
+            self.present |= FIELD_BITS[name]
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[name] = value
+
+    def __getitem__(self, name: str) -> Any:
+        if name in FIELD_BITS:
+            if not self.present & FIELD_BITS[name]:
+                raise KeyError(name)
+            return getattr(self, name)
+        if self.extra is None:
+            raise KeyError(name)
+        return self.extra[name]
+
+    def __contains__(self, name: str) -> bool:
+        if name in FIELD_BITS:
+            return bool(self.present & FIELD_BITS[name])
+        return self.extra is not None and name in self.extra
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """dict.get, so code that reads protocols works on dicts and records alike"""
+        return self[name] if name in self else default
+
+    def keys(self) -> Iterator[str]:
+        return iter(self.layout)
+
+    def set_embedding(self, values: Sequence[float], model: str) -> None:
+        """Attach an embedding and the model that produced it, in place"""
+        self['embedding'] = values
+        self['embedding_model'] = model
+        self['embedding_dimensions'] = len(self.embedding)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain, JSON-serializable dict with the keys from_dict was given (embedding as float32 values)"""
+        protocol = {name: self[name] for name in self.keys()}
+        if isinstance(protocol.get('embedding'), (array, memoryview)):
+            protocol['embedding'] = embedding_floats(protocol['embedding'])
+        return protocol
+
+    def db_record(self) -> Dict[str, Any]:
+        """mio_knowledge_chunks insert payload (tokens_approx: cl100k_base tokens of chunk_text)"""
+        record = {name: self.get(name) for name in DB_FIELDS}
+        for name in LIST_FIELDS:
+            if name not in self:
+                record[name] = []
+        chunk_text = record['chunk_text'] = self.get('chunk_text', '')
+        record['tokens_approx'] = count_tokens(chunk_text) if chunk_text else 0
+        if record['embedding'] is not None:
+            record['embedding'] = embedding_floats(record['embedding'])
+        return record
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Protocol):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return f"Protocol({self.get('chunk_id') or self.get('source_file')!r}, chunk {self.get('chunk_number')})"
+
+
+FIELD_BITS = {name: 1 << bit for bit, name in enumerate(FIELDS)}
+
+# Interned key orders
+LAYOUTS: Dict[tuple, tuple] = {}
+
+
+def intern_layout(layout: tuple) -> tuple:
+    return LAYOUTS.setdefault(layout, layout)
+
+
+def to_records(protocols: Iterable[Dict[str, Any]]) -> Iterator[Protocol]:
+    for protocol in protocols:
+        yield Protocol.from_dict(protocol)
+
+
+def to_dicts(records: Iterable[Protocol]) -> List[Dict[str, Any]]:
+    return [record.to_dict() for record in records]
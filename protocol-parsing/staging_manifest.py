@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+MIO Protocol Parser - Staging Manifest
+Tracks which sources produced which staging files, so normalize_sources.py can
+skip unchanged sources and downstream steps can ask what actually changed.
+
+Manifest layout (staging/manifest.json):
+    {
+      "normalizer_version": 1,
+      "sources": {
+        "<source path>": {"size": 27173, "mtime_ns": ..., "sha256": "..."}
+      },
+      "staging": {
+        "daily-deductible-normalized.md": {
+          "sources": ["<source path>"],
+          "source_sha256": ["..."],
+          "size": 26466,
+          "mtime_ns": ...,
+          "sha256": "...",
+          "updated_at": "2025-11-22T14:40:29"
+        }
+      },
+      "last_run": {"changed": ["daily-deductible-normalized.md"], "timestamp": "..."}
+    }
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+MANIFEST_NAME = 'manifest.json'
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def sha256_file(path: Path) -> str:
+    """SHA-256 of a file's bytes, read in blocks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def content_addressed_name(path: Path, sha256: str) -> str:
+    """Backup name for a given content, e.g. 'mio-kb-01-core-framework.3f2a9c1b0d4e.md'"""
+    return f"{path.stem}.{sha256[:12]}{path.suffix}"
+
+
+class StagingManifest:
+    """Source and staging fingerprints from the last normalization run"""
+
+    def __init__(self, path: Path, normalizer_version: int):
+        self.path = Path(path)
+        self.normalizer_version = normalizer_version
+        self.sources: Dict[str, Dict] = {}
+        self.staging: Dict[str, Dict] = {}
+        self.last_run: Dict = {'changed': [], 'timestamp': None}
+        self._changed: List[str] = []
+
+    @classmethod
+    def load(cls, path: Path, normalizer_version: int) -> 'StagingManifest':
+        """
+        Load the manifest at path. A missing or unreadable manifest, or one
+        written by a different normalizer version, starts empty so every
+        staging file is rebuilt.
+        """
+        manifest = cls(path, normalizer_version)
+
+        try:
+            with open(manifest.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return manifest
+
+        if data.get('normalizer_version') != normalizer_version:
+            return manifest
+
+        manifest.sources = data.get('sources', {})
+        manifest.staging = data.get('staging', {})
+        manifest.last_run = data.get('last_run', manifest.last_run)
+        return manifest
+
+    def fingerprint(self, source_path: Path) -> Dict:
+        """
+        Current size/mtime/SHA-256 of a source. The file is only hashed when
+        its size or mtime differ from the recorded fingerprint.
+        """
+        stat = os.stat(source_path)
+        previous = self.sources.get(str(source_path))
+
+        if previous and previous['size'] == stat.st_size and previous['mtime_ns'] == stat.st_mtime_ns:
+            sha256 = previous['sha256']
+        else:
+            sha256 = sha256_file(source_path)
+
+        fingerprint = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': sha256}
+        self.sources[str(source_path)] = fingerprint
+        return fingerprint
+
+    def is_current(self, staging_path: Path, source_paths: List[Path]) -> bool:
+        """
+        True when staging_path was built from exactly these sources with
+        their current content and has not been touched since.
+        """
+        entry = self.staging.get(staging_path.name)
+        if not entry or not staging_path.exists():
+            return False
+
+        if entry['sources'] != [str(p) for p in source_paths]:
+            return False
+
+        current = [self.fingerprint(p)['sha256'] for p in source_paths]
+        if entry['source_sha256'] != current:
+            return False
+
+        stat = os.stat(staging_path)
+        return entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns
+
+    def record(self, staging_path: Path, source_paths: List[Path], source_sha256: List[str]) -> None:
+        """
+        Record a freshly written staging file and the sources it came from.
+        source_sha256 are the hashes taken before the sources were read, so a
+        source edited mid-run no longer matches and is rebuilt next time.
+        """
+        stat = os.stat(staging_path)
+        self.staging[staging_path.name] = {
+            'sources': [str(p) for p in source_paths],
+            'source_sha256': list(source_sha256),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha256': sha256_file(staging_path),
+            'updated_at': datetime.now().isoformat(timespec='seconds')
+        }
+        self._changed.append(staging_path.name)
+
+    def save(self) -> None:
+        """Write the manifest atomically; last_run lists files rebuilt since the last save"""
+        self.last_run = {
+            'changed': list(self._changed),
+            'timestamp': datetime.now().isoformat(timespec='seconds')
+        }
+        self._changed = []
+        data = {
+            'normalizer_version': self.normalizer_version,
+            'sources': self.sources,
+            'staging': self.staging,
+            'last_run': self.last_run
+        }
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+def changed_staging_files(staging_dir: Path) -> List[Path]:
+    """Staging files rebuilt by the most recent normalize_sources.py run"""
+    try:
+        with open(Path(staging_dir) / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return []
+
+    return [Path(staging_dir) / name for name in data.get('last_run', {}).get('changed', [])]
+
+
+def staging_sha256(staging_dir: Path, name: str) -> Optional[str]:
+    """
+    Content hash recorded for a staging file, or None if unknown. Downstream
+    steps can store this with their output and compare on the next run.
+    """
+    try:
+        with open(Path(staging_dir) / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    return data.get('staging', {}).get(name, {}).get('sha256')
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+MIO Protocol Parser - Synthetic Corpus
+Builds structurally valid Daily Deductible, Neural Rewiring and research KB
+documents of any size from the test fixtures, for scaling benchmarks
+(benchmarks/bench_parser_scaling.py)
+
+Scale N repeats every fixture template N times, in an order shuffled by
+the seed, so a scale-N document always holds exactly N times the fixture's
+chunks:
+    Daily Deductible   every category section of the fixture per round,
+                       practices shuffled and renumbered 1..45N
+    Neural Rewiring    one pattern per round ("## N. SYNTHETIC ... PROTOCOLS")
+                       with the fixture pattern's four temperament sections
+    Research           every KB file of the fixture per round, renamed
+                       mio-kb-NN-synthetic-00001.md, ... (prefix kept, so
+                       KB categories still resolve)
+
+Usage:
+    python3 synthetic_corpus.py --scale 10
+    python3 synthetic_corpus.py --scale 1000 --seed 7 --output-dir /tmp/mio-corpus
+"""
+
+import argparse
+import random
+import re
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+BASE_DIR = Path(__file__).parent
+FIXTURES_DIR = BASE_DIR / 'fixtures'
+SYNTHETIC_DIR = BASE_DIR / 'synthetic'
+
+DAILY_DEDUCTIBLE_FIXTURE = FIXTURES_DIR / 'test-daily-deductible.md'
+NEURAL_REWIRING_FIXTURE = FIXTURES_DIR / 'test-neural-rewiring.txt'
+RESEARCH_FIXTURE = FIXTURES_DIR / 'test-research-protocols.md'
+
+# Same separator normalize_sources.py writes between KB files
+RESEARCH_SEPARATOR = "\n\n" + "=" * 80 + "\n\n"
+
+DD_SECTION_HEADER = re.compile(r'^### \*\*.+$', re.MULTILINE)
+DD_PRACTICE_HEADER = re.compile(r'^#### \*\*\d+\\\.', re.MULTILINE)
+NR_PATTERN_HEADER = re.compile(r'^## \d+\. ([A-Z ]+) PROTOCOLS$', re.MULTILINE)
+RP_SEPARATOR = re.compile(r'\n={80}\n')
+RP_SOURCE_FILE = re.compile(r'^# SOURCE FILE: (mio-kb-\d+)[^\n]*\n# ORIGINAL PATH:[^\n]*', re.MULTILINE)
+
+
+def split_at(content: str, starts: List[int]) -> List[str]:
+    """content cut at each offset in starts (text before the first dropped)"""
+    return [content[start:end].strip() for start, end in zip(starts, starts[1:] + [len(content)])]
+
+
+def letters(n: int) -> str:
+    """0 -> 'A', 25 -> 'Z', 26 -> 'AA': digit-free names for NR pattern headers"""
+    name = ''
+    n += 1
+    while n:
+        n, remainder = divmod(n - 1, 26)
+        name = chr(ord('A') + remainder) + name
+    return name
+
+
+# ============================================================================
+# Daily Deductible
+# ============================================================================
+
+def daily_deductible_templates(content: str) -> List[Tuple[str, List[str]]]:
+    """(section header, practice blocks) for every category section"""
+    sections = []
+    for section in split_at(content, [m.start() for m in DD_SECTION_HEADER.finditer(content)]):
+        header, _, body = section.partition('\n')
+        practices = split_at(body, [m.start() for m in DD_PRACTICE_HEADER.finditer(body)])
+        sections.append((header, practices))
+    return sections
+
+
+def build_daily_deductible(scale: int, seed: int) -> str:
+    rng = random.Random(seed)
+    templates = daily_deductible_templates(DAILY_DEDUCTIBLE_FIXTURE.read_text(encoding='utf-8'))
+    parts = ["## Daily Deductible Library - Synthetic Corpus\n"]
+    practice_id = 0
+
+    for _ in range(scale):
+        for header, practices in rng.sample(templates, len(templates)):
+            parts.append(header + "\n")
+            for practice in rng.sample(practices, len(practices)):
+                practice_id += 1
+                parts.append(DD_PRACTICE_HEADER.sub(f'#### **{practice_id}\\\\.', practice, count=1) + "\n")
+
+    return '\n'.join(parts)
+
+
+# ============================================================================
+# Neural Rewiring
+# ============================================================================
+
+def neural_rewiring_template(content: str) -> Tuple[str, str, List[str]]:
+    """(pattern name, text before the first temperament, temperament sections)"""
+    pattern_match = NR_PATTERN_HEADER.search(content)
+    pattern_name = pattern_match.group(1)
+    temperament_header = re.compile(rf'^### {re.escape(pattern_name)} \+ [A-Z]+ TEMPERAMENT$', re.MULTILINE)
+
+    starts = [m.start() for m in temperament_header.finditer(content)]
+    preamble = content[pattern_match.end():starts[0]].strip()
+    return pattern_name, preamble, split_at(content, starts)
+
+
+def build_neural_rewiring(scale: int, seed: int) -> str:
+    rng = random.Random(seed)
+    pattern_name, preamble, sections = neural_rewiring_template(NEURAL_REWIRING_FIXTURE.read_text(encoding='utf-8'))
+    parts = ["# Neural Rewiring Protocols - Synthetic Corpus\n"]
+
+    for n in range(scale):
+        name = f"SYNTHETIC {letters(n)}"
+        parts.append(f"## {n + 1}. {name} PROTOCOLS\n")
+        parts.append(preamble + "\n")
+        for section in rng.sample(sections, len(sections)):
+            parts.append(section.replace(pattern_name, name) + "\n")
+
+    return '\n'.join(parts)
+
+
+# ============================================================================
+# Research Protocols
+# ============================================================================
+
+def research_templates(content: str) -> List[str]:
+    """Every KB file section, from its '# SOURCE FILE:' header on"""
+    templates = []
+    for part in RP_SEPARATOR.split(content):
+        start = part.find('# SOURCE FILE:')
+        if start != -1:
+            templates.append(part[start:].strip())
+    return templates
+
+
+def build_research(scale: int, seed: int) -> str:
+    rng = random.Random(seed)
+    templates = research_templates(RESEARCH_FIXTURE.read_text(encoding='utf-8'))
+    sections = []
+
+    for _ in range(scale):
+        for template in rng.sample(templates, len(templates)):
+            name = RP_SOURCE_FILE.match(template).group(1) + f"-synthetic-{len(sections) + 1:05d}.md"
+            header = f"# SOURCE FILE: {name}\n# ORIGINAL PATH: synthetic/{name}"
+            sections.append(RP_SOURCE_FILE.sub(lambda _: header, template, count=1))
+
+    return RESEARCH_SEPARATOR.join(sections) + RESEARCH_SEPARATOR
+
+
+# Builders by the staging file name they stand in for (see parse_targets.PARSE_TARGETS)
+BUILDERS: Dict[str, Callable[[int, int], str]] = {
+    'daily-deductible-normalized.md': build_daily_deductible,
+    'neural-rewiring-normalized.txt': build_neural_rewiring,
+    'research-protocols-combined.md': build_research,
+}
+
+
+def write_corpus(output_dir: Path, scale: int, seed: int = 0) -> Dict[str, Path]:
+    """Write one synthetic document per staging file name into output_dir"""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    paths = {}
+    for staging_name, build in BUILDERS.items():
+        path = output_dir / staging_name
+        path.write_text(build(scale, seed), encoding='utf-8')
+        paths[staging_name] = path
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic MIO corpus from the test fixtures')
+    parser.add_argument('--scale', type=int, default=10, help='Copies of every fixture template (default: 10)')
+    parser.add_argument('--seed', type=int, default=0, help='Shuffle seed (default: 0)')
+    parser.add_argument('--output-dir', type=Path, default=SYNTHETIC_DIR,
+                        help='Where to write the staging-named documents (default: synthetic/)')
+    args = parser.parse_args()
+
+    print(f"🧪 Synthetic corpus at {args.scale}x (seed {args.seed})")
+    for staging_name, path in write_corpus(args.output_dir, args.scale, args.seed).items():
+        print(f"   ✓ {path} ({path.stat().st_size:,} bytes)")
+    print()
+    print(f"Parse it with: python3 parse_all.py --staging-dir {args.output_dir} --no-write")
+
+
+if __name__ == '__main__':
+    main()
@@ -68,13 +68,13 @@ print()
 import sys
 json_str = json.dumps([sample_with_embedding], indent=2)
 size_per_protocol = sys.getsizeof(json_str)
-estimated_total_size = size_per_protocol * 205
+estimated_total_size = size_per_protocol * 231
 
 print("=" * 70)
 print("FILE SIZE ESTIMATE")
 print("=" * 70)
 print(f"Size per protocol (with embedding): ~{size_per_protocol:,} bytes")
-print(f"Estimated total for 205 protocols: ~{estimated_total_size:,} bytes")
+print(f"Estimated total for 231 protocols: ~{estimated_total_size:,} bytes")
 print(f"Estimated total (MB): ~{estimated_total_size / 1024 / 1024:.2f} MB")
 print()
 
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Tests for DailyDeductibleParser practice blocks. Run with pytest, or
+directly: python3 test_parse_daily_deductible.py
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / 'parsers'))
+
+from parse_daily_deductible import DailyDeductibleParser  # noqa: E402
+
+LIBRARY = """### **Faith-Based Practices (Christian Focus)**
+
+#### **26\\. Gratitude Walk**
+
+**Time:** 10 minutes | **The State It Creates:** Calm, Grateful
+
+**Instructions:** Walk slowly and name what you are grateful for.
+
+#### **27\\. 
+
+**Time:** 5 minutes | **The State It Creates:** Focus
+
+**Instructions:** Body of the truncated practice.
+
+#### **28\\. Evening Review**
+
+**Time:** 15 minutes | **The State It Creates:** Clarity
+
+**Instructions:** Review the day.
+"""
+
+
+def test_truncated_header_ends_previous_practice():
+    practices = DailyDeductibleParser().iter_practices(LIBRARY)
+    by_title = {practice['chunk_summary']: practice for practice in practices}
+
+    # 27 has no readable title, so it is dropped, but 26 stops at its header
+    assert list(by_title) == ['Gratitude Walk', 'Evening Review']
+    assert 'truncated practice' not in by_title['Gratitude Walk']['chunk_text']
+    assert by_title['Gratitude Walk']['chunk_text'].endswith('grateful for.')
+    assert [p['chunk_number'] for p in by_title.values()] == [1, 2]
+
+
+if __name__ == '__main__':
+    test_truncated_header_ends_previous_practice()
+    print("✓ All Daily Deductible parser tests passed")
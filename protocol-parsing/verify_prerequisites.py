@@ -123,7 +123,7 @@ if all_checks_passed:
     print("Expected:")
     print("  - Processing time: 2-3 minutes")
     print("  - Cost: ~$0.001 (less than 1 cent)")
-    print("  - Output: 205 protocols with 1536-dim embeddings")
+    print("  - Output: 231 protocols with 1536-dim embeddings")
 else:
     print("✗ Some checks failed. Please fix the issues above before running.")
     print()